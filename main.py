@@ -1,13 +1,15 @@
 import os
 
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 from src.application.graphs.builder import build_graph
 from src.application.services.chat_service import ChatService
-from src.infrastructure.container import create_dependencies
-from src.infrastructure.memory.long_term.mem0.mem0_client import Mem0Service
-from src.infrastructure.memory.short_term.redis.redis_saver import get_redis_checkpointer
+from src.infrastructure.container import create_dependencies, create_mem0_service
+from src.infrastructure.memory.long_term.mem0.memory_writer import BackgroundMemoryWriter
+from src.infrastructure.memory.short_term.redis.redis_saver import (
+    get_async_redis_checkpointer,
+    get_redis_checkpointer,
+)
 from src.presentation.gradio_app import GradioApp
 
 DEFAULT_USER_ID = "10"
@@ -19,6 +21,7 @@ def main() -> None:
 
     redis_uri = os.getenv("REDIS_URI")
     port = int(os.getenv("PORT", os.getenv("APP_PORT", 7860)))
+    async_mode = os.getenv("GRAPH_ASYNC_MODE", "true").lower() == "true"
 
     if not redis_uri:
         raise RuntimeError("REDIS_URI is not set")
@@ -26,11 +29,14 @@ def main() -> None:
     with get_redis_checkpointer(redis_uri) as checkpointer:
         checkpointer.setup()
 
-        mem0_service = Mem0Service()
-        llm = ChatOpenAI(model="gpt-4o-mini")
-        
+        # Async execution needs an async-capable checkpointer; the sync one only
+        # creates the indices above.
+        if async_mode:
+            checkpointer = get_async_redis_checkpointer(redis_uri)
+
+        mem0_service = create_mem0_service()
+
         dependencies = create_dependencies(
-            llm=llm,
             memory_saver=checkpointer,
             mem0_service=mem0_service,
             user_id=DEFAULT_USER_ID,
@@ -38,9 +44,24 @@ def main() -> None:
         
         graph = build_graph(dependencies)
 
-        chat_service = ChatService(graph, mem0_service, DEFAULT_USER_ID)
-        app = GradioApp(chat_service)
-        app.launch(host="0.0.0.0", port=port)
+        # Write through the cached service so memory writes invalidate its index
+        mem0_service = dependencies.mem0_service
+        memory_writer = BackgroundMemoryWriter(mem0_service)
+        chat_service = ChatService(
+            graph, mem0_service, DEFAULT_USER_ID, memory_writer=memory_writer
+        )
+        app = GradioApp(chat_service, async_mode=async_mode)
+        try:
+            app.launch(host="0.0.0.0", port=port)
+        finally:
+            # Write the turns still queued before exiting
+            memory_writer.close()
+            embedding_cache = dependencies.embedding_service.cache
+            if embedding_cache is not None:
+                print(f"✓ Embedding cache: {embedding_cache.report()}")
+            print(f"✓ Web search cache: {dependencies.web_search_service.report()}")
+            if dependencies.outbound_governor is not None:
+                print(f"✓ Outbound calls: {dependencies.outbound_governor.report()}")
 
 
 if __name__ == "__main__":
@@ -1,41 +1,30 @@
-from langchain_core.messages import ToolMessage
+import asyncio
+import json
+import os
+from typing import Optional
+
+import numpy as np
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+from langchain_core.runnables.config import ContextThreadPoolExecutor
 from langchain_openai import ChatOpenAI
 
-from ..schema.lead import LeadCompleted
+from ..schema.contact import Contact
+from ..schema.lead import Lead, LeadCompleted
+from ..schema.lead_batch import lead_updates
 from ..schema.state import State
+from ..services.context_budget import ContextBudget
+from ..services.lead_field_extractor import ENRICHMENT_FIELDS, extract_lead_fields
+from ...infrastructure.clients.search_service import WebSearchService
 
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("ENRICHMENT_MAX_CONCURRENCY", "5"))
 
-def enrich_leads(
-    state: State, llm: ChatOpenAI, tools: list
-) -> dict:
-    """LLM decides if leads need enrichment using the search tool."""
-    filtered = state.filtered_leads
-
-    if not filtered:
-        return {"filtered_leads": []}
-
-    leads_needing_enrichment = [lead for lead in filtered if lead.needs_enrichment()]
-    print("-" * 100)
-    print(leads_needing_enrichment)
-    print("-" * 100)
+# Extracted values at or above this confidence are used as-is, without the LLM
+EXTRACT_MIN_CONFIDENCE = float(os.getenv("ENRICHMENT_EXTRACT_MIN_CONFIDENCE", "0.7"))
 
-    if not leads_needing_enrichment:
-        return {
-            "messages": [{"role": "assistant", "content": "All leads have been enriched!"}]
-        }
-
-    lead_to_enrich = leads_needing_enrichment[0]
-
-    last_message = state.messages[-1] if state.messages else None
-
-    if isinstance(last_message, ToolMessage):
-        print(f"✓ Tool results received for {lead_to_enrich.company}, proceeding to update...")
-        return {
-            "messages": [
-                {"role": "assistant", "content": f"Processing results for {lead_to_enrich.company}"}
-            ],
-        }
 
+def _build_enrichment_messages(lead_to_enrich: Lead) -> list:
+    """Build the tool-calling prompt for a single lead."""
     system_prompt = f"""You are enriching lead data for {lead_to_enrich.company}.
 
     Current data: {lead_to_enrich.model_dump_json()}
@@ -43,36 +32,30 @@ def enrich_leads(
     Use search_company_info to find ONLY the missing fields. Be specific in your search query.
     After getting results, extract the relevant information clearly."""
 
-    messages = state.messages + [
+    return [
         {"role": "system", "content": system_prompt},
         {"role": "user", "content": f"Find missing information for {lead_to_enrich.company}"},
     ]
 
-    llm_with_tools = llm.bind_tools(tools)
-    response = llm_with_tools.invoke(messages)
 
-    return {
-        "messages": [response],
-        "tool_caller": "enricher",  # Track caller for routing back from tools
-    }
-
-
-def update_lead(state: State, llm: ChatOpenAI) -> dict:
-    """Update lead with enriched data from search results."""
-    print("UPDATE LEAD")
-    lead_to_update = next((l for l in state.filtered_leads if l.needs_enrichment()), None)
-
-    if not lead_to_update:
-        return {}
-
-    extractor = llm.with_structured_output(LeadCompleted)
+def _build_update_prompt(
+    lead_to_update: Lead, search_results: str, prefilled: Optional[dict] = None
+) -> list:
+    """Build the structured-output prompt that merges a lead with search results."""
+    known = ""
+    if prefilled:
+        missing = [name for name in ENRICHMENT_FIELDS if name not in prefilled]
+        known = f"""
+    Already extracted from the search results (keep these values): {json.dumps(prefilled)}
+    Fields still to find: {", ".join(missing)}
+"""
 
     prompt = f"""
     Combine the existing lead and the search results, and output a full LeadCompleted object.
 
     Existing lead: {lead_to_update.model_dump_json()}
-    Search results: {state.messages[-1].content}
-
+    Search results (sections headed "### <field>: <query>" hold the results searched for that field): {search_results}
+{known}
     CRITICAL RULES FOR CONTACTS:
     1. ONLY include contacts that are EXPLICITLY mentioned in the search results with their actual names, emails, and phone numbers
     2. If the search results do NOT contain specific contact information (names + emails + phone numbers), you MUST set contacts to an empty list []
@@ -94,32 +77,261 @@ def update_lead(state: State, llm: ChatOpenAI) -> dict:
     - Phone number
     - Job title/position
     """
+    return [{"role": "user", "content": prompt}]
 
-    enriched = extractor.invoke([{"role": "user", "content": prompt}])
-    filtered = state.filtered_leads
 
-    updated = [
-        enriched.model_dump() if lead.company == enriched.company else lead.model_dump()
-        for lead in filtered
-    ]
+def _search_results(response: AIMessage, results: list[str]) -> str:
+    """Use tool outputs as search results, or the LLM answer when it called no tool."""
+    return "\n\n".join(results) if results else str(response.content)
 
-    return {"filtered_leads": updated}
 
+def _prefill(lead: Lead, search_results: str) -> tuple[dict, list[Contact]]:
+    """Fields already on the lead or extracted confidently from the search results."""
+    extraction = extract_lead_fields(lead.company, search_results)
+    prefilled = extraction.confident(EXTRACT_MIN_CONFIDENCE)
+    for name in ENRICHMENT_FIELDS:
+        if getattr(lead, name) is not None:
+            prefilled[name] = getattr(lead, name)
+    return prefilled, extraction.contacts
 
-def create_enrichment_node(llm: ChatOpenAI, tools: list):
-    """Create enrichment node with LLM and tools dependencies."""
 
-    def node(state: State) -> dict:
-        return enrich_leads(state, llm, tools)
+def _complete_without_llm(lead: Lead, prefilled: dict, contacts: list[Contact]) -> LeadCompleted:
+    """Build the completed lead when every field was found deterministically."""
+    data = {**lead.model_dump(), **prefilled}
+    data["contacts"] = data["contacts"] or contacts
+    return LeadCompleted(**data)
+
+
+def _apply_prefill(
+    completed: LeadCompleted, prefilled: dict, contacts: list[Contact]
+) -> LeadCompleted:
+    """Extracted values win over the LLM's; its contacts are kept unless it found none."""
+    update = dict(prefilled)
+    if not completed.contacts and contacts:
+        update["contacts"] = contacts
+    return completed.model_copy(update=update)
+
+
+def _run_tool_calls(response: AIMessage, tools_by_name: dict) -> list[str]:
+    """Execute the tool calls requested by the LLM, returning errors as text."""
+    results = []
+    for call in response.tool_calls:
+        try:
+            results.append(str(tools_by_name[call["name"]].invoke(call["args"])))
+        except Exception as e:
+            results.append(f"Error: {e}")
+    return results
+
+
+async def _arun_tool_calls(response: AIMessage, tools_by_name: dict) -> list[str]:
+    """Async variant of _run_tool_calls; the calls of one lead run concurrently."""
+
+    async def run(call) -> str:
+        try:
+            return str(await tools_by_name[call["name"]].ainvoke(call["args"]))
+        except Exception as e:
+            return f"Error: {e}"
+
+    return list(await asyncio.gather(*(run(call) for call in response.tool_calls)))
+
+
+def _missing_fields(lead: Lead) -> list[str]:
+    return [name for name in (*ENRICHMENT_FIELDS, "contacts") if getattr(lead, name) is None]
+
 
-    return node
+def merge_search_results(
+    lead: Lead,
+    search_results: str,
+    llm: ChatOpenAI,
+    context_budget: Optional[ContextBudget] = None,
+) -> Lead:
+    """Merge search results into a completed lead.
+
+    Fields the search results state plainly are extracted without the LLM; the
+    structured-output merge only runs when some are still missing.
+    """
+    prefilled, contacts = _prefill(lead, search_results)
+    if all(name in prefilled for name in ENRICHMENT_FIELDS):
+        return _complete_without_llm(lead, prefilled, contacts)
+
+    context_budget = context_budget or ContextBudget()
+    extractor = llm.with_structured_output(LeadCompleted)
+    completed = extractor.invoke(
+        _build_update_prompt(
+            lead, context_budget.fit_text("enricher", search_results), prefilled
+        )
+    )
+    return _apply_prefill(completed, prefilled, contacts)
+
+
+async def amerge_search_results(
+    lead: Lead,
+    search_results: str,
+    llm: ChatOpenAI,
+    context_budget: Optional[ContextBudget] = None,
+) -> Lead:
+    """Async variant of merge_search_results."""
+    prefilled, contacts = _prefill(lead, search_results)
+    if all(name in prefilled for name in ENRICHMENT_FIELDS):
+        return _complete_without_llm(lead, prefilled, contacts)
+
+    context_budget = context_budget or ContextBudget()
+    extractor = llm.with_structured_output(LeadCompleted)
+    completed = await extractor.ainvoke(
+        _build_update_prompt(
+            lead, context_budget.fit_text("enricher", search_results), prefilled
+        )
+    )
+    return _apply_prefill(completed, prefilled, contacts)
+
+
+def enrich_lead(
+    lead: Lead, llm: ChatOpenAI, tools: list, context_budget: Optional[ContextBudget] = None
+) -> Lead:
+    """Let the LLM search for a lead's missing fields, then merge the results."""
+    tools_by_name = {tool.name: tool for tool in tools}
+
+    response = llm.bind_tools(tools).invoke(_build_enrichment_messages(lead))
+    search_results = _search_results(response, _run_tool_calls(response, tools_by_name))
+    return merge_search_results(lead, search_results, llm, context_budget)
 
 
-def create_update_lead_node(llm: ChatOpenAI):
-    """Create update lead node with LLM dependency."""
+async def aenrich_lead(
+    lead: Lead, llm: ChatOpenAI, tools: list, context_budget: Optional[ContextBudget] = None
+) -> Lead:
+    """Async variant of enrich_lead."""
+    tools_by_name = {tool.name: tool for tool in tools}
+
+    response = await llm.bind_tools(tools).ainvoke(_build_enrichment_messages(lead))
+    search_results = _search_results(
+        response, await _arun_tool_calls(response, tools_by_name)
+    )
+    return await amerge_search_results(lead, search_results, llm, context_budget)
+
+
+def _pending_indexes(state: State) -> list[int]:
+    return np.flatnonzero(state.filtered_leads.needs_enrichment_mask()).tolist()
+
+
+def _merge_enriched(state: State, enriched: dict[int, Lead]) -> dict:
+    """Write only the enriched leads, keyed by position, so the merge never depends on timing."""
+    return {
+        "filtered_leads": lead_updates(enriched),
+        "messages": [
+            {
+                "role": "assistant",
+                "content": f"Enriched {len(enriched)} of {len(state.filtered_leads)} leads.",
+            }
+        ],
+    }
+
+
+def _search_requests(state: State, pending: list[int]) -> dict[int, tuple[str, list[str]]]:
+    """Batch search input: lead position -> (company, missing fields)."""
+    leads = state.filtered_leads
+    return {i: (leads[i].company, _missing_fields(leads[i])) for i in pending}
+
+
+def enrich_leads(
+    state: State,
+    llm: ChatOpenAI,
+    tools: list,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    context_budget: Optional[ContextBudget] = None,
+    search_service: Optional[WebSearchService] = None,
+) -> dict:
+    """Enrich every lead that needs it concurrently and merge the results.
+
+    With a search service, the searches of all pending leads run as one batch of
+    deterministic queries; otherwise the LLM writes each lead's queries.
+    """
+    pending = _pending_indexes(state)
+    if not pending:
+        return {}
+
+    search_results = (
+        search_service.search_batch(_search_requests(state, pending))
+        if search_service is not None
+        else None
+    )
+
+    def run(i: int) -> tuple[int, Lead | None]:
+        lead = state.filtered_leads[i]
+        try:
+            if search_results is not None:
+                return i, merge_search_results(lead, search_results[i], llm, context_budget)
+            return i, enrich_lead(lead, llm, tools, context_budget)
+        except Exception as e:
+            print(f"⚠ Could not enrich {lead.company}: {e}")
+            return i, None
+
+    # Copies the run context into the workers, so their LLM calls report to this node
+    workers = max(1, min(max_concurrency, len(pending)))
+    with ContextThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run, pending))
+
+    return _merge_enriched(state, {i: lead for i, lead in results if lead is not None})
+
+
+async def aenrich_leads(
+    state: State,
+    llm: ChatOpenAI,
+    tools: list,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    context_budget: Optional[ContextBudget] = None,
+    search_service: Optional[WebSearchService] = None,
+) -> dict:
+    """Async variant of enrich_leads, bounded by a semaphore."""
+    pending = _pending_indexes(state)
+    if not pending:
+        return {}
+
+    search_results = (
+        await search_service.asearch_batch(_search_requests(state, pending))
+        if search_service is not None
+        else None
+    )
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def run(i: int) -> tuple[int, Lead | None]:
+        lead = state.filtered_leads[i]
+        async with semaphore:
+            try:
+                if search_results is not None:
+                    return i, await amerge_search_results(
+                        lead, search_results[i], llm, context_budget
+                    )
+                return i, await aenrich_lead(lead, llm, tools, context_budget)
+            except Exception as e:
+                print(f"⚠ Could not enrich {lead.company}: {e}")
+                return i, None
+
+    results = await asyncio.gather(*(run(i) for i in pending))
+
+    return _merge_enriched(state, {i: lead for i, lead in results if lead is not None})
+
+
+def create_enrichment_node(
+    llm: ChatOpenAI,
+    tools: list,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    context_budget: Optional[ContextBudget] = None,
+    search_service: Optional[WebSearchService] = None,
+):
+    """Create enrichment node with LLM and tools dependencies.
+
+    search_service enables batch searching; without it the LLM calls the tools per lead.
+    """
+    context_budget = context_budget or ContextBudget()
 
     def node(state: State) -> dict:
-        return update_lead(state, llm)
+        return enrich_leads(
+            state, llm, tools, max_concurrency, context_budget, search_service
+        )
 
-    return node
+    async def anode(state: State) -> dict:
+        return await aenrich_leads(
+            state, llm, tools, max_concurrency, context_budget, search_service
+        )
 
+    return RunnableLambda(node, afunc=anode)
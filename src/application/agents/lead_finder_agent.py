@@ -1,87 +1,128 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 from langchain_core.messages import SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 
 from ..schema.lead import Lead
+from ..schema.lead_batch import LeadBatch
 from ..schema.state import State
+from ..services.context_budget import ContextBudget
 
 
-def create_lead_finder_node(llm: ChatOpenAI, tools):
-    """
-    Returns an agent node function that uses LLM with tools to find leads matching the user's ICP.
+class LeadList(BaseModel):
+    """List of leads extracted from tool response."""
+
+    leads: list[Lead]
+
+
+def _build_system_prompt(state: State) -> str:
+    """Build the lead finder system prompt from the ICP in state."""
+    # Get ICP from state
+    icp = state.icp if hasattr(state, "icp") else None
+
+    if icp:
+        icp_info = f"\nUser's Ideal Customer Profile (ICP):\n{icp.model_dump_json()}\n"
+    else:
+        icp_info = "\nNo Ideal Customer Profile (ICP) available. Please retrieve it first.\n"
+
+    return (
+        f"""You are a lead-finding agent.
+        Use the following ICP to find matching leads:
+        {icp_info}
+
+        # Instructions
+        - Use the available tools to find leads that match the ICP criteria
+        - Find exactly 3 leads that match: industries, employee range, and regions from the ICP
+        - Each lead must have: company name, industry, employee_count, and revenue_musd
+        - Include the region (country of headquarters) when the search results mention it
+        - Call tools to search for leads matching the ICP
+        - Always look for contacts in the search results. If no contacts are found, leave the contacts field empty.
+        """
+    )
+
+
+def _build_extraction_prompt(tool_content: str) -> list:
+    """Build the structured-output prompt that turns a tool response into leads."""
+    prompt = f"""
+    Extract leads from the following tool response.
+    Convert the information into Lead objects with: company, industry, employee_count, revenue_musd,
+    and region (country of headquarters) when it is mentioned.
+
+    Tool Response:
+    {tool_content}
+
+    Extract exactly 3 leads that match the ICP criteria.
     """
+    return [{"role": "user", "content": prompt}]
 
-    def node(state: State) -> dict:
-        # Get ICP from state
-        icp = state.icp if hasattr(state, "icp") else None
-
-        if icp:
-            icp_info = f"\nUser's Ideal Customer Profile (ICP):\n{icp.model_dump_json()}\n"
-        else:
-            icp_info = "\nNo Ideal Customer Profile (ICP) available. Please retrieve it first.\n"
-
-        system_prompt = (
-            f"""You are a lead-finding agent.
-            Use the following ICP to find matching leads:
-            {icp_info}
-
-            # Instructions
-            - Use the available tools to find leads that match the ICP criteria
-            - Find exactly 3 leads that match: industries, employee range, and regions from the ICP
-            - Each lead must have: company name, industry, employee_count, and revenue_musd
-            - Call tools to search for leads matching the ICP
-            - Always look for contacts in the search results. If no contacts are found, leave the contacts field empty.
-            """
-        )
-
-        messages = list(state.messages) if state.messages else []
-        last_message = messages[-1] if messages else None
 
-        # If tool just executed, extract leads from tool response using structured output
-        if isinstance(last_message, ToolMessage):
-            # Tool response received - parse it into Lead objects
-            tool_content = str(last_message.content)
+def _leads_update(response) -> dict:
+    """Convert the parsed LeadList into a state update."""
+    leads = response.leads if hasattr(response, "leads") else []
 
-            # Use structured output to parse tool response into leads
-            class LeadList(BaseModel):
-                """List of leads extracted from tool response."""
+    return {
+        "leads": LeadBatch.from_leads(leads).to_compact(),
+        "messages": [
+            {"role": "assistant", "content": f"Found {len(leads)} leads from tool results"}
+        ],
+    }
 
-                leads: list[Lead]
 
-            # Parse tool response into structured leads
-            parser = llm.with_structured_output(LeadList)
-            prompt = f"""
-            Extract leads from the following tool response.
-            Convert the information into Lead objects with: company, industry, employee_count, revenue_musd.
+def _build_agent_messages(state: State, context_budget: ContextBudget) -> list:
+    """Prepend the system prompt to the conversation unless it is already there."""
+    messages = list(state.messages) if state.messages else []
+    if not messages or not isinstance(messages[0], SystemMessage):
+        messages = [SystemMessage(content=_build_system_prompt(state))] + messages
+    return context_budget.fit("lead_finder", messages)
 
-            Tool Response:
-            {tool_content}
 
-            Extract exactly 3 leads that match the ICP criteria.
-            """
+def create_lead_finder_node(
+    llm: ChatOpenAI, tools, context_budget: Optional[ContextBudget] = None
+):
+    """
+    Returns an agent node function that uses LLM with tools to find leads matching the user's ICP.
+    """
+    context_budget = context_budget or ContextBudget()
 
-            response = parser.invoke([{"role": "user", "content": prompt}])
-            leads = response.leads if hasattr(response, "leads") else []
+    def extraction_prompt(last_message: ToolMessage) -> list:
+        tool_content = context_budget.fit_text("lead_finder", str(last_message.content))
+        return _build_extraction_prompt(tool_content)
 
-            return {
-                "leads": [lead.model_dump() for lead in leads],
-                "messages": [
-                    {"role": "assistant", "content": f"Found {len(leads)} leads from tool results"}
-                ],
-            }
+    def node(state: State) -> dict:
+        last_message = state.messages[-1] if state.messages else None
 
-        # First call or continuing - add system message and bind tools
-        if not messages or not isinstance(messages[0], SystemMessage):
-            messages = [SystemMessage(content=system_prompt)] + messages
+        # If tool just executed, extract leads from tool response using structured output
+        if isinstance(last_message, ToolMessage):
+            parser = llm.with_structured_output(LeadList)
+            response = parser.invoke(extraction_prompt(last_message))
+            return _leads_update(response)
 
         # Bind tools so LLM can call them
         llm_with_tools = llm.bind_tools(tools)
-        response = llm_with_tools.invoke(messages)
+        response = llm_with_tools.invoke(_build_agent_messages(state, context_budget))
 
         return {
             "messages": [response],
             "tool_caller": "lead_finder",  # Track caller for routing back from tools
         }
 
-    return node
\ No newline at end of file
+    async def anode(state: State) -> dict:
+        last_message = state.messages[-1] if state.messages else None
+
+        if isinstance(last_message, ToolMessage):
+            parser = llm.with_structured_output(LeadList)
+            response = await parser.ainvoke(extraction_prompt(last_message))
+            return _leads_update(response)
+
+        llm_with_tools = llm.bind_tools(tools)
+        response = await llm_with_tools.ainvoke(_build_agent_messages(state, context_budget))
+
+        return {
+            "messages": [response],
+            "tool_caller": "lead_finder",
+        }
+
+    return RunnableLambda(node, afunc=anode)
@@ -0,0 +1,84 @@
+import asyncio
+import os
+from typing import Optional
+
+import numpy as np
+from langchain_core.runnables import RunnableLambda
+
+from ..schema.icp import IdealCustomerProfile
+from ..schema.state import State
+from ...infrastructure.knowledge_base.vectordb.embedding_service import LeadEmbeddingService
+from ...infrastructure.knowledge_base.vectordb.lead_storage import QDrantLeadStorage
+from ...infrastructure.knowledge_base.vectordb.similarity import rank_and_deduplicate
+
+DEFAULT_DUPLICATE_THRESHOLD = float(os.getenv("LEAD_DUPLICATE_THRESHOLD", "0.97"))
+
+
+def icp_to_text(icp: IdealCustomerProfile) -> str:
+    """Describe the ICP in the same register as the lead embedding text."""
+    text_parts = []
+    if icp.industries_allowed:
+        text_parts.append(f"Industry: {', '.join(icp.industries_allowed)}")
+    if icp.employee_min is not None or icp.employee_max is not None:
+        text_parts.append(f"Employees: {icp.employee_min or 0}-{icp.employee_max or 'any'}")
+    if icp.regions_allowed:
+        text_parts.append(f"Regions: {', '.join(icp.regions_allowed)}")
+    if icp.technologies_required:
+        text_parts.append(f"Technologies: {', '.join(icp.technologies_required)}")
+    return " | ".join(text_parts)
+
+
+async def rank_leads(
+    state: State,
+    embedding_service: LeadEmbeddingService,
+    lead_storage: QDrantLeadStorage,
+    threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+) -> dict:
+    """Drop near-duplicate candidates and order the rest by similarity to the ICP."""
+    leads = state.leads
+    if not leads:
+        return {}
+
+    icp_text = icp_to_text(state.icp) if state.icp else ""
+    try:
+        lead_vectors = await embedding_service.get_lead_embeddings(leads)
+        icp_vector: Optional[np.ndarray] = (
+            await embedding_service.get_text_embedding(icp_text) if icp_text else None
+        )
+        existing = await lead_storage.get_neighbor_vectors(lead_vectors)
+    except Exception as e:
+        # Ranking is an optimization; never lose the candidates because of it
+        print(f"⚠ Could not rank leads, keeping them as found: {e}")
+        return {}
+
+    kept, scores = rank_and_deduplicate(lead_vectors, icp_vector, existing, threshold)
+    dropped = len(leads) - len(kept)
+    print(f"Ranked {len(kept)} leads, dropped {dropped} near-duplicates")
+
+    return {
+        "leads": leads.take(kept).to_compact(),
+        "messages": [
+            {
+                "role": "assistant",
+                "content": f"Ranked {len(kept)} leads by ICP fit and dropped {dropped} near-duplicates.",
+            }
+        ],
+    }
+
+
+def create_lead_ranker_node(
+    embedding_service: LeadEmbeddingService,
+    lead_storage: QDrantLeadStorage,
+    async_lead_storage: Optional[QDrantLeadStorage] = None,
+    threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+):
+    """Create the node that deduplicates and ranks candidate leads between lead_finder and screener."""
+    async_storage = async_lead_storage or lead_storage
+
+    def node(state: State) -> dict:
+        return asyncio.run(rank_leads(state, embedding_service, lead_storage, threshold))
+
+    async def anode(state: State) -> dict:
+        return await rank_leads(state, embedding_service, async_storage, threshold)
+
+    return RunnableLambda(node, afunc=anode)
@@ -1,34 +1,41 @@
 from ..schema.state import State
+from ...domain.rules.icp_screener import ICPScreener
 
 
 def triage(state: State) -> dict:
-    """Filter leads based on qualification criteria."""
+    """Filter leads against the ICP rules in a single vectorized pass."""
     print("TRIAGE")
-    leads = state.leads if hasattr(state, "leads") else []
+    leads = state.leads
 
-    filtered = []
-    for lead in leads:
-        if (
-            lead.employee_count >= 0
-            and lead.revenue_musd >= 0
-            and lead.industry != "logistics"
-        ):
-            filtered.append(lead)
+    screener = ICPScreener.from_icp(state.icp)
+    result = screener.evaluate(leads)
+
+    filtered = leads.take(result.passed)
+    rejected = [
+        f"{lead.company}: {', '.join(reasons)}"
+        for lead, reasons in zip(leads, result.reasons)
+        if reasons
+    ]
 
     print("=== FILTERED LEADS ===")
     for lead in filtered:
         print(lead)
+    for rejection in rejected:
+        print(f"Rejected {rejection}")
+
+    content = f"Filtered to {len(filtered)} qualified leads: {filtered}"
+    if rejected:
+        content += "\nRejected leads:\n" + "\n".join(f"- {rejection}" for rejection in rejected)
 
     return {
-        "filtered_leads": [lead.model_dump() for lead in filtered],
+        "filtered_leads": filtered.to_compact(),
         "messages": [
             {
                 "role": "assistant",
-                "content": f"Filtered to {len(filtered)} qualified leads: {filtered}",
+                "content": content,
             }
         ],
     }
 
 
 lead_screener_node = triage
-
@@ -1,32 +1,51 @@
 import asyncio
+from typing import Optional
+
+from langchain_core.runnables import RunnableLambda
+
+from ..schema.lead import Lead
 from ..schema.state import State
 from ...infrastructure.knowledge_base.vectordb.lead_storage import QDrantLeadStorage
 
 
-def create_lead_storage_node(lead_storage: QDrantLeadStorage):
-    """Returns a sync node that runs async Qdrant operations."""
+def _leads_to_store(state: State) -> list[Lead]:
+    """Every found lead, with the enriched version of those that passed screening.
+
+    store_leads keeps the last occurrence of a company, so enriched leads win.
+    """
+    return state.leads.to_leads() + state.filtered_leads.to_leads()
+
+
+def create_lead_storage_node(
+    lead_storage: QDrantLeadStorage, async_lead_storage: Optional[QDrantLeadStorage] = None
+):
+    """Returns a node that stores leads, awaiting Qdrant directly when run async.
+
+    The async path uses async_lead_storage when given, so vector DB I/O doesn't
+    block the event loop.
+    """
+    async_storage = async_lead_storage or lead_storage
 
     def node(state: State) -> dict:
         """Process leads and store them in vector database."""
-        
-        async def store_leads_async():
-            leads = state.leads
-            for lead in leads:
-                print(f"Storing lead: {lead}")
-                await lead_storage.store_lead(lead)
-        
-        # Run async code in sync context
-        try:
-            print("Storing leads in vector database...")
-            asyncio.run(store_leads_async())
-        except RuntimeError:
-            # If event loop already running (e.g., in Gradio)
-            print("RuntimeError: Event loop already running. Applying nest_asyncio.")
-            import nest_asyncio
-            nest_asyncio.apply()
-            asyncio.run(store_leads_async())
-        
+        leads = _leads_to_store(state)
+        if not leads:
+            return {}
+
+        # Sync graph execution runs on a worker thread without a running loop
+        print(f"Storing {len(state.leads)} leads in vector database...")
+        asyncio.run(lead_storage.store_leads(leads))
+        print("Leads stored in vector database.")
+        return {}
+
+    async def anode(state: State) -> dict:
+        leads = _leads_to_store(state)
+        if not leads:
+            return {}
+
+        print(f"Storing {len(state.leads)} leads in vector database...")
+        await async_storage.store_leads(leads)
         print("Leads stored in vector database.")
         return {}
 
-    return node
\ No newline at end of file
+    return RunnableLambda(node, afunc=anode)
@@ -1,14 +1,69 @@
 import json
+from typing import Optional
 
 from langchain_core.messages import SystemMessage, ToolMessage
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 
 from ..schema.icp import IdealCustomerProfile
 from ..schema.state import State
+from ..services.context_budget import ContextBudget
+from ..services.icp_loader import ICPLoader
 
 
-def orchestrator_node(old_state: State, llm: ChatOpenAI, tools) -> dict:
-    """Analyze user intent and route to appropriate workflow."""
+def _icp_update(icp: IdealCustomerProfile) -> dict:
+    """Store the ICP and route to lead finding."""
+    return {
+        "icp": icp,
+        "messages": [
+            {"role": "assistant", "content": "ICP retrieved and stored successfully!"}
+        ],
+        "next_action": "lead_finder",
+    }
+
+
+def _sheet_text(old_state: State, icp_loader: Optional[ICPLoader]) -> Optional[str]:
+    """Text of a read_sheet_values result that just arrived, when it can be parsed as an ICP."""
+    if icp_loader is None or not old_state.messages:
+        return None
+    last_message = old_state.messages[-1]
+    if isinstance(last_message, ToolMessage) and last_message.name == "read_sheet_values":
+        return last_message.text
+    return None
+
+
+def _sheet_icp_update(old_state: State, icp_loader: Optional[ICPLoader]) -> Optional[dict]:
+    """Parse an ICP sheet read through Google Workspace without an LLM round-trip."""
+    text = _sheet_text(old_state, icp_loader)
+    if text is None:
+        return None
+    try:
+        icp = icp_loader.from_sheet_text(text)
+    except Exception as e:
+        print(f"⚠ Could not parse ICP from sheet: {e}")
+        return None
+    return _icp_update(icp) if icp else None
+
+
+async def _asheet_icp_update(old_state: State, icp_loader: Optional[ICPLoader]) -> Optional[dict]:
+    """Async variant of _sheet_icp_update; a malformed sheet is parsed with ainvoke."""
+    text = _sheet_text(old_state, icp_loader)
+    if text is None:
+        return None
+    try:
+        icp = await icp_loader.afrom_sheet_text(text)
+    except Exception as e:
+        print(f"⚠ Could not parse ICP from sheet: {e}")
+        return None
+    return _icp_update(icp) if icp else None
+
+
+def _prepare_routing(
+    old_state: State,
+    tools,
+    context_budget: Optional[ContextBudget] = None,
+) -> tuple[Optional[dict], list]:
+    """Build the routing prompt, or return the final update when the ICP just arrived."""
 
     system_prompt = f"""
     You are a router agent that will route the user to the appropriate next step based on the user's intent.
@@ -71,25 +126,39 @@ def orchestrator_node(old_state: State, llm: ChatOpenAI, tools) -> dict:
 
                 # Store ICP if we got it
                 if icp:
-                    return {
-                        "icp": icp,
-                        "messages": [
-                            {"role": "assistant", "content": "ICP retrieved and stored successfully!"}
-                        ],
-                        "next_action": "lead_finder",
-                    }
+                    return _icp_update(icp), []
             except (json.JSONDecodeError, ValueError) as e:
                 # If parsing fails, continue normal flow
                 pass
 
-    # Filter the last 5 messages to not make the LLM confused
-    if isinstance(last_message, ToolMessage):
-        routing_messages = [SystemMessage(content=system_prompt)] + messages
-    else:
-        recent_messages = messages[-5:] if len(messages) > 5 else messages
-        routing_messages = [SystemMessage(content=system_prompt)] + recent_messages
+    # Keep the last 5 messages to not make the LLM confused; after a tool call the
+    # whole tool turn is needed. Older turns are summarized within the token budget.
+    context_budget = context_budget or ContextBudget()
+    routing_messages = context_budget.fit(
+        "chatbot",
+        [SystemMessage(content=system_prompt)] + messages,
+        max_messages=None if isinstance(last_message, ToolMessage) else 5,
+    )
+
+    return None, routing_messages
+
+
+def orchestrator_node(
+    old_state: State,
+    llm: ChatOpenAI,
+    tools,
+    icp_loader: Optional[ICPLoader] = None,
+    context_budget: Optional[ContextBudget] = None,
+) -> dict:
+    """Analyze user intent and route to appropriate workflow."""
+    update = _sheet_icp_update(old_state, icp_loader)
+    if update is not None:
+        return update
+
+    result, routing_messages = _prepare_routing(old_state, tools, context_budget)
+    if result is not None:
+        return result
 
-    # Normal LLM invocation (messages is always defined at this point)
     llm_with_tools = llm.bind_tools(tools)
     response = llm_with_tools.invoke(routing_messages)
 
@@ -97,11 +166,54 @@ def orchestrator_node(old_state: State, llm: ChatOpenAI, tools) -> dict:
         "messages": [response],
     }
 
-def create_orchestrator_node(llm: ChatOpenAI, tools):
-    """Create orchestrator node with LLM dependency."""
+
+async def aorchestrator_node(
+    old_state: State,
+    llm: ChatOpenAI,
+    tools,
+    icp_loader: Optional[ICPLoader] = None,
+    context_budget: Optional[ContextBudget] = None,
+) -> dict:
+    """Async variant of orchestrator_node."""
+    update = await _asheet_icp_update(old_state, icp_loader)
+    if update is not None:
+        return update
+
+    result, routing_messages = _prepare_routing(old_state, tools, context_budget)
+    if result is not None:
+        return result
+
+    llm_with_tools = llm.bind_tools(tools)
+    response = await llm_with_tools.ainvoke(routing_messages)
+
+    return {
+        "messages": [response],
+    }
+
+
+def create_orchestrator_node(
+    llm: ChatOpenAI,
+    tools,
+    icp_loader: Optional[ICPLoader] = None,
+    context_budget: Optional[ContextBudget] = None,
+):
+    """Create orchestrator node with LLM dependency.
+
+    tools may be a list or a callable returning the current list, so tools discovered
+    after startup are bound on the next turn.
+    """
+    icp_loader = icp_loader or ICPLoader(llm)
+    context_budget = context_budget or ContextBudget()
+
+    def current_tools() -> list:
+        return tools() if callable(tools) else tools
 
     def node(state: State) -> dict:
-        return orchestrator_node(state, llm, tools)
+        return orchestrator_node(state, llm, current_tools(), icp_loader, context_budget)
 
-    return node
+    async def anode(state: State) -> dict:
+        return await aorchestrator_node(
+            state, llm, current_tools(), icp_loader, context_budget
+        )
 
+    return RunnableLambda(node, afunc=anode)
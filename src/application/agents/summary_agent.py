@@ -1,9 +1,14 @@
+from typing import Optional
+
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 from ..schema.state import State
+from ..services.context_budget import ContextBudget
 
-def generate_summary(state: State, llm: ChatOpenAI) -> dict:
-    """Generate natural language summary of results."""
-    filtered = state.filtered_leads if hasattr(state, "filtered_leads") else []
+
+def _build_summary_messages(state: State, context_budget: ContextBudget) -> list:
+    """Build the summary prompt from the filtered leads and conversation."""
+    filtered = state.filtered_leads.to_leads()
 
     system_msg = {
         "role": "system",
@@ -16,19 +21,42 @@ def generate_summary(state: State, llm: ChatOpenAI) -> dict:
         """,
     }
 
-    messages = [system_msg] + state.messages
-    response = llm.invoke(messages)
+    return context_budget.fit("summary", [system_msg] + state.messages)
+
+
+def generate_summary(
+    state: State, llm: ChatOpenAI, context_budget: Optional[ContextBudget] = None
+) -> dict:
+    """Generate natural language summary of results."""
+    response = llm.invoke(_build_summary_messages(state, context_budget or ContextBudget()))
 
     return {
         "messages": [{"role": "assistant", "content": response.content}]
     }
 
 
-def create_summary_node(llm: ChatOpenAI):
+async def agenerate_summary(
+    state: State, llm: ChatOpenAI, context_budget: Optional[ContextBudget] = None
+) -> dict:
+    """Async variant of generate_summary."""
+    response = await llm.ainvoke(
+        _build_summary_messages(state, context_budget or ContextBudget())
+    )
+
+    return {
+        "messages": [{"role": "assistant", "content": response.content}]
+    }
+
+
+def create_summary_node(llm: ChatOpenAI, context_budget: Optional[ContextBudget] = None):
     """Create summary node with LLM dependency."""
+    context_budget = context_budget or ContextBudget()
 
     def node(state: State) -> dict:
-        return generate_summary(state, llm)
+        return generate_summary(state, llm, context_budget)
+
+    async def anode(state: State) -> dict:
+        return await agenerate_summary(state, llm, context_budget)
 
-    return node
+    return RunnableLambda(node, afunc=anode)
 
@@ -2,7 +2,7 @@ from langgraph.graph import StateGraph
 
 from ..tools.search_tool import create_search_tool
 from ..tools.search_leads_tool import create_search_leads_tool
-from ..tools.google_workspace_tools import get_google_workspace_tools_sync
+from ..tools.google_workspace_tools import GoogleWorkspaceToolRegistry
 from ..schema.state import State
 from ..graphs.nodes import register_nodes
 from ..graphs.edges import register_edges
@@ -31,15 +31,20 @@ def build_graph(dependencies: AppDependencies) -> StateGraph:
         dependencies.user_id
     )
     search_leads_tool = create_search_leads_tool(
-        dependencies.qdrant_client,
+        dependencies.qdrant_client_provider,
         dependencies.vector_db_settings,
         dependencies.embedding_service,
     )
 
-    orchestrator_tools = [search_memories_tool, search_tool, search_leads_tool]
-    
-    # Load Google Workspace tools (Sheets, Drive) for orchestrator
-    orchestrator_tools.extend(get_google_workspace_tools_sync())
+    base_orchestrator_tools = [search_memories_tool, search_tool, search_leads_tool]
+
+    # Google Workspace tools (Sheets, Drive) come from the disk cache now and from
+    # the MCP server once background discovery succeeds; startup never waits on it
+    workspace_tools = GoogleWorkspaceToolRegistry()
+    workspace_tools.refresh_in_background()
+
+    def orchestrator_tools() -> list:
+        return base_orchestrator_tools + workspace_tools.tools()
     
     search_tools = [search_tool]
 
@@ -51,6 +56,9 @@ def build_graph(dependencies: AppDependencies) -> StateGraph:
         orchestrator_tools,
         search_tools,
         dependencies.lead_storage,
+        dependencies.embedding_service,
+        dependencies.async_lead_storage,
+        dependencies.web_search_service,
     )
     register_edges(graph_builder)
 
@@ -1,7 +1,6 @@
 from langgraph.graph import END, START, StateGraph
 from langgraph.prebuilt import tools_condition
 
-from ...domain.conditions.enrichment_checker import should_continue
 from ...domain.conditions.routing import chatbot_router, search_tools_router
 
 
@@ -11,7 +10,9 @@ def register_edges(graph: StateGraph) -> None:
     # Static edges
     graph.add_edge(START, "chatbot")
     graph.add_edge("orchestrator_tools", "chatbot")
+    graph.add_edge("lead_ranker", "screener")
     graph.add_edge("screener", "enricher")
+    graph.add_edge("enricher", "summary")
     graph.add_edge("enricher", "lead_storage")
     graph.add_edge("summary", END)
     graph.add_edge("lead_storage", END)
@@ -27,23 +28,13 @@ def register_edges(graph: StateGraph) -> None:
         },
     )
 
-    # Lead finder -> search_tools or screener
+    # Lead finder -> search_tools or lead_ranker
     graph.add_conditional_edges(
         "lead_finder",
         tools_condition,
         {
             "tools": "search_tools",
-            "__end__": "screener",
-        },
-    )
-
-    # Enricher -> search_tools or update_lead
-    graph.add_conditional_edges(
-        "enricher",
-        tools_condition,
-        {
-            "tools": "search_tools",
-            "__end__": "update_lead",
+            "__end__": "lead_ranker",
         },
     )
 
@@ -53,16 +44,6 @@ def register_edges(graph: StateGraph) -> None:
         search_tools_router,
         {
             "lead_finder": "lead_finder",
-            "enricher": "enricher",
         },
     )
 
-    # Update lead continues enriching or moves to summary
-    graph.add_conditional_edges(
-        "update_lead",
-        should_continue,
-        {
-            "enricher": "enricher",
-            END: "summary",
-        },
-    )
\ No newline at end of file
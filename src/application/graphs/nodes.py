@@ -1,40 +1,101 @@
+from typing import Callable
+
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph
 from langgraph.prebuilt import ToolNode
 from ..agents.orchestrator_agent import create_orchestrator_node
 from ..agents.lead_finder_agent import create_lead_finder_node
+from ..agents.lead_ranker_agent import create_lead_ranker_node
 from ..agents.lead_screener_agent import lead_screener_node
-from ..agents.data_enrichment_agent import create_enrichment_node, create_update_lead_node
+from ..agents.data_enrichment_agent import create_enrichment_node
 from ..agents.summary_agent import create_summary_node
 from ..agents.lead_storage_agent import create_lead_storage_node
+from ..services.context_budget import ContextBudget
+from ...infrastructure.clients.search_service import WebSearchService
+from ...infrastructure.knowledge_base.vectordb.embedding_service import LeadEmbeddingService
 from ...infrastructure.knowledge_base.vectordb.lead_storage import QDrantLeadStorage
 
+def create_dynamic_tool_node(get_tools: Callable[[], list]) -> RunnableLambda:
+    """ToolNode over a tool list that can change after the graph is compiled.
+
+    A ToolNode is rebuilt only when the list returned by get_tools changes.
+    """
+    cache: dict = {}
+
+    def tool_node() -> ToolNode:
+        tools = get_tools()
+        key = tuple(id(tool) for tool in tools)
+        if cache.get("key") != key:
+            # Return errors as messages so LLM can handle auth flows
+            cache["node"] = ToolNode(tools=tools, handle_tool_errors=True)
+            cache["key"] = key
+        return cache["node"]
+
+    def node(state, config: RunnableConfig) -> dict:
+        return tool_node().invoke(state, config)
+
+    async def anode(state, config: RunnableConfig) -> dict:
+        return await tool_node().ainvoke(state, config)
+
+    return RunnableLambda(node, afunc=anode)
+
+
 def register_nodes(
     graph: StateGraph,
     llm: ChatOpenAI,
-    orchestrator_tools: list,
+    orchestrator_tools: list | Callable[[], list],
     search_tools: list,
     lead_storage: QDrantLeadStorage,
+    embedding_service: LeadEmbeddingService,
+    async_lead_storage: QDrantLeadStorage | None = None,
+    web_search_service: WebSearchService | None = None,
 ) -> None:
     """Register the nodes for the graph.
 
     Args:
         graph: The state graph to register nodes on
         llm: Language model for agent nodes
-        orchestrator_tools: Tools for the orchestrator (icp, memories)
+        orchestrator_tools: Tools for the orchestrator (icp, memories), or a callable
+            returning them when the list can grow at runtime
         search_tools: Tools for search operations (company search)
         lead_storage: Shared lead storage instance
+        embedding_service: Embedding service used to rank candidate leads
+        async_lead_storage: Non-blocking lead storage used when the graph runs async
+        web_search_service: Lets the enricher search all pending leads in one batch
     """
+    # Shared token ceilings for every prompt built from history or tool output
+    context_budget = ContextBudget()
+
     # Agent nodes
-    graph.add_node("chatbot", create_orchestrator_node(llm, orchestrator_tools))
-    graph.add_node("lead_finder", create_lead_finder_node(llm, search_tools))
+    graph.add_node(
+        "chatbot",
+        create_orchestrator_node(llm, orchestrator_tools, context_budget=context_budget),
+    )
+    graph.add_node(
+        "lead_finder", create_lead_finder_node(llm, search_tools, context_budget)
+    )
+    graph.add_node(
+        "lead_ranker",
+        create_lead_ranker_node(embedding_service, lead_storage, async_lead_storage),
+    )
     graph.add_node("screener", lead_screener_node)
-    graph.add_node("enricher", create_enrichment_node(llm, search_tools))
-    graph.add_node("update_lead", create_update_lead_node(llm))
-    graph.add_node("summary", create_summary_node(llm))
+    graph.add_node(
+        "enricher",
+        create_enrichment_node(
+            llm,
+            search_tools,
+            context_budget=context_budget,
+            search_service=web_search_service,
+        ),
+    )
+    graph.add_node("summary", create_summary_node(llm, context_budget))
 
     # Tool nodes - scoped by responsibility
     # Return errors as messages so LLM can handle auth flows
-    graph.add_node("orchestrator_tools", ToolNode(tools=orchestrator_tools, handle_tool_errors=True))
+    if callable(orchestrator_tools):
+        graph.add_node("orchestrator_tools", create_dynamic_tool_node(orchestrator_tools))
+    else:
+        graph.add_node("orchestrator_tools", ToolNode(tools=orchestrator_tools, handle_tool_errors=True))
     graph.add_node("search_tools", ToolNode(tools=search_tools, handle_tool_errors=True))
-    graph.add_node("lead_storage", create_lead_storage_node(lead_storage))
\ No newline at end of file
+    graph.add_node("lead_storage", create_lead_storage_node(lead_storage, async_lead_storage))
\ No newline at end of file
@@ -1,4 +1,5 @@
-from typing import Optional
+import math
+from typing import Any, Optional
 
 from pydantic import BaseModel
 
@@ -23,3 +24,37 @@ class IdealCustomerProfile(BaseModel):
             return []
         return [item.strip() for item in value.split(";") if item.strip()]
 
+
+    @classmethod
+    def parse_int(cls, value: Any) -> Optional[int]:
+        """Parse an integer cell; empty cells are None. Raises ValueError when malformed."""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        text = str(value).strip().replace(",", "").replace("_", "")
+        if not text:
+            return None
+        number = float(text)
+        if not number.is_integer():
+            raise ValueError(f"Not an integer: {value!r}")
+        return int(number)
+
+    @classmethod
+    def from_parameters(cls, parameters: dict[str, Any]) -> "IdealCustomerProfile":
+        """Build an ICP from Parameter -> Value rows without an LLM.
+
+        Keys are matched case-insensitively to the field names; list fields are
+        semicolon-separated. Raises ValueError when a value is malformed.
+        """
+        rows = {
+            str(key).strip().lower().replace(" ", "_"): value
+            for key, value in parameters.items()
+        }
+        values: dict[str, Any] = {}
+        for name in cls.model_fields:
+            if name not in rows:
+                continue
+            if name in ("employee_min", "employee_max"):
+                values[name] = cls.parse_int(rows[name])
+            else:
+                values[name] = cls.parse_semicolon_list(rows[name]) or None
+        return cls(**values)
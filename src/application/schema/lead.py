@@ -9,6 +9,7 @@ class Lead(BaseModel):
     industry: str
     employee_count: int
     revenue_musd: float
+    region: Optional[str] = None
 
     # Enrichment fields - initially None
     website: Optional[str] = None
@@ -35,6 +36,9 @@ class LeadCompleted(BaseModel):
     industry: str = Field(..., description="Industry sector of the company")
     employee_count: int = Field(..., description="Number of employees at the company")
     revenue_musd: float = Field(..., description="Annual revenue in millions of USD")
+    region: Optional[str] = Field(
+        default=None, description="Country or region where the company is headquartered"
+    )
     website: str = Field(..., description="Official website URL of the company")
     last_year_profit: float = Field(
         ..., description="Company's profit for the last fiscal year in millions of USD"
@@ -0,0 +1,344 @@
+"""Columnar, dictionary-encoded batch of leads for the graph State.
+
+Numeric fields live in NumPy arrays (None is stored as NaN), strings are interned in a
+table shared by all string columns and referenced by int32 codes, and individual
+leads are exposed as lightweight LeadView objects that read from the columns without
+building pydantic models.
+
+Nodes write batches back to state with to_compact(), a plain dict of bytes and lists
+that the checkpointer stores as-is and from_compact() reads back without copying the
+numeric buffers. Nodes that only change a few leads write lead_updates() instead, and
+the merge_leads reducer applies them to the stored batch by position.
+"""
+
+import json
+import sys
+from typing import Any, Iterable, Iterator, Optional
+
+import numpy as np
+
+from .contact import Contact
+from .lead import Lead, LeadCompleted
+
+COMPACT_FORMAT = "lead-batch/v1"
+UPDATES_FORMAT = "lead-updates/v1"
+
+STRING_FIELDS = ("company", "industry", "region", "website")
+FLOAT_FIELDS = (
+    "revenue_musd",
+    "last_year_profit",
+    "last_quarter_ebitda",
+    "stock_variation_3m",
+)
+ENRICHMENT_FLOAT_FIELDS = FLOAT_FIELDS[1:]
+FIELDS = ("company", "industry", "employee_count", "revenue_musd", "region", "website",
+          *ENRICHMENT_FLOAT_FIELDS, "contacts")
+
+
+class LeadView:
+    """Read-only view of one lead inside a LeadBatch.
+
+    Exposes the same attributes and helpers as Lead, so code written against Lead
+    (prompt building, embedding text, storage payloads) works unchanged.
+    """
+
+    __slots__ = ("_batch", "_index")
+
+    def __init__(self, batch: "LeadBatch", index: int):
+        self._batch = batch
+        self._index = index
+
+    def __getattr__(self, name: str) -> Any:
+        if name in FIELDS:
+            return self._batch._value(name, self._index)
+        raise AttributeError(name)
+
+    def needs_enrichment(self) -> bool:
+        """Check if lead still needs enrichment."""
+        return bool(self._batch.needs_enrichment_mask()[self._index])
+
+    def to_lead(self) -> Lead:
+        """Materialize the view as a Lead model."""
+        return Lead(**self.model_dump())
+
+    def model_dump(self) -> dict:
+        data = {name: self._batch._value(name, self._index) for name in FIELDS}
+        if data["contacts"] is not None:
+            data["contacts"] = [contact.model_dump() for contact in data["contacts"]]
+        return data
+
+    def model_dump_json(self) -> str:
+        # Same compact layout as pydantic, so prompts built from views are unchanged
+        return json.dumps(self.model_dump(), separators=(",", ":"), ensure_ascii=False)
+
+    def __repr__(self) -> str:
+        return repr(self.to_lead())
+
+
+class LeadBatch:
+    """Columnar batch of leads."""
+
+    __slots__ = ("_table", "_codes", "_employee_count", "_floats", "_contacts", "_pending")
+
+    def __init__(
+        self,
+        table: Optional[list[str]] = None,
+        codes: Optional[dict[str, np.ndarray]] = None,
+        employee_count: Optional[np.ndarray] = None,
+        floats: Optional[dict[str, np.ndarray]] = None,
+        contacts: Optional[list[Optional[list[Contact]]]] = None,
+    ):
+        self._table = table if table is not None else []
+        self._codes = codes or {name: np.empty(0, dtype=np.int32) for name in STRING_FIELDS}
+        self._employee_count = (
+            employee_count if employee_count is not None else np.empty(0, dtype=np.int64)
+        )
+        self._floats = floats or {name: np.empty(0, dtype=np.float64) for name in FLOAT_FIELDS}
+        self._contacts = contacts if contacts is not None else []
+        self._pending: Optional[np.ndarray] = None
+
+    # ---- construction -------------------------------------------------------------
+
+    @classmethod
+    def from_leads(cls, leads: Iterable[Lead | LeadCompleted | LeadView | dict]) -> "LeadBatch":
+        """Build a batch from Lead models, views or lead dicts."""
+        rows = [lead if isinstance(lead, dict) else lead.model_dump() for lead in leads]
+
+        table: list[str] = []
+        lookup: dict[str, int] = {}
+
+        def encode(value: Optional[str]) -> int:
+            if value is None:
+                return -1
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(table)
+                table.append(sys.intern(value))
+            return code
+
+        codes = {
+            name: np.array([encode(row.get(name)) for row in rows], dtype=np.int32)
+            for name in STRING_FIELDS
+        }
+        floats = {
+            name: np.array(
+                [np.nan if row.get(name) is None else row[name] for row in rows],
+                dtype=np.float64,
+            )
+            for name in FLOAT_FIELDS
+        }
+        employee_count = np.array([row["employee_count"] for row in rows], dtype=np.int64)
+        contacts = [
+            None
+            if row.get("contacts") is None
+            else [c if isinstance(c, Contact) else Contact(**c) for c in row["contacts"]]
+            for row in rows
+        ]
+        return cls(table, codes, employee_count, floats, contacts)
+
+    @classmethod
+    def coerce(cls, value: Any) -> "LeadBatch":
+        """Accept a batch, its compact form, or a list of leads/dicts (older checkpoints)."""
+        if isinstance(value, LeadBatch):
+            return value
+        if not value:
+            return cls()
+        if isinstance(value, dict) and value.get("format") == COMPACT_FORMAT:
+            return cls.from_compact(value)
+        return cls.from_leads(value)
+
+    # ---- compact serialization ----------------------------------------------------
+
+    def to_compact(self) -> dict:
+        """Serialize to plain types: raw column buffers plus the shared string table."""
+        return {
+            "format": COMPACT_FORMAT,
+            "size": len(self),
+            "strings": list(self._table),
+            "codes": {name: self._codes[name].tobytes() for name in STRING_FIELDS},
+            "employee_count": self._employee_count.tobytes(),
+            "floats": {name: self._floats[name].tobytes() for name in FLOAT_FIELDS},
+            "contacts": [
+                None if contacts is None else [c.model_dump() for c in contacts]
+                for contacts in self._contacts
+            ],
+            "pending": self.needs_enrichment_mask().tobytes(),
+        }
+
+    @classmethod
+    def from_compact(cls, data: dict) -> "LeadBatch":
+        """Rebuild a batch; numeric columns are read-only views over the stored buffers."""
+        batch = cls(
+            table=[sys.intern(s) for s in data["strings"]],
+            codes={
+                name: np.frombuffer(data["codes"][name], dtype=np.int32)
+                for name in STRING_FIELDS
+            },
+            employee_count=np.frombuffer(data["employee_count"], dtype=np.int64),
+            floats={
+                name: np.frombuffer(data["floats"][name], dtype=np.float64)
+                for name in FLOAT_FIELDS
+            },
+            contacts=[
+                None if contacts is None else [Contact(**c) for c in contacts]
+                for contacts in data["contacts"]
+            ],
+        )
+        if "pending" in data:
+            batch._pending = np.frombuffer(data["pending"], dtype=bool)
+        return batch
+
+    # ---- access -------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._employee_count)
+
+    def __iter__(self) -> Iterator[LeadView]:
+        return (LeadView(self, i) for i in range(len(self)))
+
+    def __getitem__(self, index: int) -> LeadView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return LeadView(self, index)
+
+    def __repr__(self) -> str:
+        return repr(self.to_leads())
+
+    def _value(self, name: str, index: int) -> Any:
+        if name in self._codes:
+            code = self._codes[name][index]
+            return None if code < 0 else self._table[code]
+        if name == "employee_count":
+            return int(self._employee_count[index])
+        if name in self._floats:
+            value = self._floats[name][index]
+            return None if np.isnan(value) else float(value)
+        if name == "contacts":
+            return self._contacts[index]
+        raise KeyError(name)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a column. Numeric columns are returned without copying."""
+        if name == "employee_count":
+            return self._employee_count
+        if name in self._floats:
+            return self._floats[name]
+        if name in self._codes:
+            # Index -1 (None) resolves to the trailing None
+            return np.array(self._table + [None], dtype=object)[self._codes[name]]
+        raise KeyError(name)
+
+    def categories(self, name: str) -> tuple[np.ndarray, list[str]]:
+        """Return the codes of a string column and the shared string table (-1 is None).
+
+        String operations can run once per distinct value and be broadcast with the
+        codes, instead of once per lead.
+        """
+        return self._codes[name], self._table
+
+    def needs_enrichment_mask(self) -> np.ndarray:
+        """Vectorized Lead.needs_enrichment over the whole batch.
+
+        Computed once per batch; take() and with_updates() carry it over instead of
+        rescanning, and it is stored in the compact form.
+        """
+        if self._pending is None:
+            missing = self._codes["website"] < 0
+            for name in ENRICHMENT_FLOAT_FIELDS:
+                missing = missing | np.isnan(self._floats[name])
+            missing = missing | np.array([c is None for c in self._contacts], dtype=bool)
+            self._pending = missing
+        return self._pending
+
+    def to_leads(self) -> list[Lead]:
+        """Materialize every lead as a Lead model."""
+        return [view.to_lead() for view in self]
+
+    # ---- derivation ---------------------------------------------------------------
+
+    def take(self, indices: Iterable[int] | np.ndarray) -> "LeadBatch":
+        """Select leads by position (or boolean mask); the string table is shared."""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        indices = indices.astype(np.intp)
+        batch = LeadBatch(
+            table=self._table,
+            codes={name: codes[indices] for name, codes in self._codes.items()},
+            employee_count=self._employee_count[indices],
+            floats={name: values[indices] for name, values in self._floats.items()},
+            contacts=[self._contacts[i] for i in indices],
+        )
+        if self._pending is not None:
+            batch._pending = self._pending[indices]
+        return batch
+
+    def with_updates(
+        self, updates: dict[int, Lead | LeadCompleted | LeadView | dict]
+    ) -> "LeadBatch":
+        """Return a copy with the leads at the given positions replaced."""
+        if not updates:
+            return self
+
+        replacement = LeadBatch.from_leads(updates.values())
+        positions = np.fromiter(updates.keys(), dtype=np.intp, count=len(updates))
+
+        # Re-code the replacement strings into this batch's table
+        table = list(self._table)
+        lookup = {value: code for code, value in enumerate(table)}
+        remap = np.empty(len(replacement._table) + 1, dtype=np.int32)
+        remap[-1] = -1
+        for code, value in enumerate(replacement._table):
+            if value not in lookup:
+                lookup[value] = len(table)
+                table.append(value)
+            remap[code] = lookup[value]
+
+        codes = {}
+        for name in STRING_FIELDS:
+            column = self._codes[name].copy()
+            column[positions] = remap[replacement._codes[name]]
+            codes[name] = column
+
+        employee_count = self._employee_count.copy()
+        employee_count[positions] = replacement._employee_count
+
+        floats = {}
+        for name in FLOAT_FIELDS:
+            column = self._floats[name].copy()
+            column[positions] = replacement._floats[name]
+            floats[name] = column
+
+        contacts = list(self._contacts)
+        for position, value in zip(positions, replacement._contacts):
+            contacts[position] = value
+
+        batch = LeadBatch(table, codes, employee_count, floats, contacts)
+        # Only the replaced rows are re-checked
+        pending = self.needs_enrichment_mask().copy()
+        pending[positions] = replacement.needs_enrichment_mask()
+        batch._pending = pending
+        return batch
+
+
+def lead_updates(updates: dict[int, Lead | LeadCompleted | LeadView]) -> dict:
+    """Build a state write that replaces only the given leads, keyed by position."""
+    return {
+        "format": UPDATES_FORMAT,
+        "updates": {str(position): lead.model_dump() for position, lead in updates.items()},
+    }
+
+
+def merge_leads(current: Any, update: Any) -> dict:
+    """Reducer for lead channels.
+
+    A lead_updates() write is applied to the current batch; anything else (a batch,
+    its compact form, or a list of leads) replaces it. The merged batch is kept in
+    compact form so checkpoints stay plain data.
+    """
+    if isinstance(update, dict) and update.get("format") == UPDATES_FORMAT:
+        updates = {int(position): lead for position, lead in update["updates"].items()}
+        return LeadBatch.coerce(current).with_updates(updates).to_compact()
+    return LeadBatch.coerce(update).to_compact()
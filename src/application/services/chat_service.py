@@ -1,6 +1,45 @@
+import asyncio
 import uuid
+from dataclasses import dataclass
+from typing import AsyncIterator, Literal, Optional
+
+from langchain_core.messages import AIMessageChunk
 from langgraph.graph.state import CompiledStateGraph
 from src.infrastructure.memory.long_term.mem0.mem0_client import Mem0Service
+from src.infrastructure.memory.long_term.mem0.memory_cache import CachedMem0Service
+from src.infrastructure.memory.long_term.mem0.memory_writer import BackgroundMemoryWriter
+
+from .context_budget import TokenCounter, TokenUsageTracker
+
+# Nodes whose LLM output is the user-facing answer; other nodes' tokens are
+# structured output or tool calls and are reported as progress only
+STREAMED_NODES = ("chatbot", "summary")
+
+NODE_PROGRESS = {
+    "chatbot": "Understanding your request",
+    "orchestrator_tools": "Looking up your profile and memories",
+    "lead_finder": "Searching for leads",
+    "search_tools": "Running web searches",
+    "lead_ranker": "Ranking leads against the ICP",
+    "screener": "Screening leads",
+    "enricher": "Enriching leads",
+    "summary": "Writing the summary",
+    "lead_storage": "Saving leads",
+}
+
+
+@dataclass
+class ChatEvent:
+    """An event emitted while a chat turn runs.
+
+    kind is "progress" when a node finishes, "token" for a piece of the answer and
+    "final" once with the complete response.
+    """
+
+    kind: Literal["progress", "token", "final"]
+    content: str
+    node: str | None = None
+
 
 class ChatService:
     """Service for handling chat interactions with the B2B agent."""
@@ -10,6 +49,7 @@ class ChatService:
         graph: CompiledStateGraph,
         mem0_service: Mem0Service,
         default_user_id: str,
+        memory_writer: Optional[BackgroundMemoryWriter] = None,
     ) -> None:
         """
         Initialize the chat service.
@@ -18,10 +58,64 @@ class ChatService:
             graph: Compiled LangGraph state graph
             mem0_service: Long-term memory service
             default_user_id: Default user ID for memory operations
+            memory_writer: Background writer for long-term memory. Without it turns
+                are saved to mem0 before the response is returned.
         """
         self.graph = graph
         self.mem0_service = mem0_service
         self.default_user_id = default_user_id
+        self.memory_writer = memory_writer
+        self.token_counter = TokenCounter()
+
+    def _build_config(
+        self, thread_id: str | None, usage: Optional[TokenUsageTracker] = None
+    ) -> dict:
+        """Build the graph config for a conversation thread."""
+        current_thread = thread_id if thread_id else str(uuid.uuid4())
+
+        config = {
+            "configurable": {
+                "thread_id": current_thread,
+                "user_id": self.default_user_id,
+            }
+        }
+        if usage is not None:
+            config["callbacks"] = [usage]
+        return config
+
+    @staticmethod
+    def _report_usage(usage: TokenUsageTracker) -> None:
+        """Log the tokens each node used in the turn."""
+        if usage.usage:
+            print(f"✓ Token usage: {usage.report()}")
+
+    def _turn_messages(self, message: str, response_content: str) -> list[dict]:
+        """Build the user/assistant pair saved to long-term memory."""
+        return [
+            {"role": "user", "content": message},
+            {"role": "assistant", "content": response_content},
+        ]
+
+    def _save_turn(self, message: str, response_content: str) -> None:
+        """Save a turn to long-term memory."""
+        messages = self._turn_messages(message, response_content)
+        if self.memory_writer is not None:
+            self.memory_writer.submit(messages, self.default_user_id)
+            return
+        self.mem0_service.add_memory(messages=messages, user_id=self.default_user_id)
+
+    def _prefetch_memories(self) -> None:
+        """Warm the local memory index while the graph starts (async callers only)."""
+        if isinstance(self.mem0_service, CachedMem0Service):
+            self.mem0_service.schedule_prefetch(self.default_user_id)
+
+    async def _asave_turn(self, message: str, response_content: str) -> None:
+        """Async variant of _save_turn."""
+        if self.memory_writer is not None:
+            self._save_turn(message, response_content)
+            return
+        # mem0's client is sync, so keep it off the event loop
+        await asyncio.to_thread(self._save_turn, message, response_content)
 
     def chat(self, message: str, thread_id: str | None = None) -> str:
         """
@@ -34,27 +128,86 @@ class ChatService:
         Returns:
             Assistant response content
         """
-        current_thread = thread_id if thread_id else str(uuid.uuid4())
-
-        config = {
-            "configurable": {
-                "thread_id": current_thread,
-                "user_id": self.default_user_id,
-            }
-        }
-
+        usage = TokenUsageTracker(self.token_counter)
+        config = self._build_config(thread_id, usage)
         state = {"messages": [{"role": "user", "content": message}]}
 
         result = self.graph.invoke(state, config=config)
         response_content = result["messages"][-1].content
+        self._report_usage(usage)
 
         # Save to long-term memory
-        self.mem0_service.add_memory(
-            messages=[
-                {"role": "user", "content": message},
-                {"role": "assistant", "content": response_content},
-            ],
-            user_id=self.default_user_id,
-        )
+        self._save_turn(message, response_content)
 
         return response_content
+
+    async def achat(self, message: str, thread_id: str | None = None) -> str:
+        """
+        Process a chat message on the running event loop and return the response.
+
+        Requires the graph to be compiled with an async-capable checkpointer.
+
+        Args:
+            message: User message to process
+            thread_id: Optional thread ID for conversation tracking
+
+        Returns:
+            Assistant response content
+        """
+        usage = TokenUsageTracker(self.token_counter)
+        config = self._build_config(thread_id, usage)
+        state = {"messages": [{"role": "user", "content": message}]}
+        self._prefetch_memories()
+
+        result = await self.graph.ainvoke(state, config=config)
+        response_content = result["messages"][-1].content
+        self._report_usage(usage)
+
+        await self._asave_turn(message, response_content)
+
+        return response_content
+
+    async def stream(
+        self, message: str, thread_id: str | None = None
+    ) -> AsyncIterator[ChatEvent]:
+        """
+        Process a chat message, yielding node progress and answer tokens as they happen.
+
+        Requires the graph to be compiled with an async-capable checkpointer.
+
+        Args:
+            message: User message to process
+            thread_id: Optional thread ID for conversation tracking
+
+        Yields:
+            ChatEvent: progress and token events, then one final event
+        """
+        usage = TokenUsageTracker(self.token_counter)
+        config = self._build_config(thread_id, usage)
+        state = {"messages": [{"role": "user", "content": message}]}
+        self._prefetch_memories()
+
+        async for mode, chunk in self.graph.astream(
+            state, config=config, stream_mode=["messages", "updates"]
+        ):
+            if mode == "messages":
+                message_chunk, metadata = chunk
+                node = metadata.get("langgraph_node")
+                if (
+                    node in STREAMED_NODES
+                    and isinstance(message_chunk, AIMessageChunk)
+                    and isinstance(message_chunk.content, str)
+                    and message_chunk.content
+                ):
+                    yield ChatEvent("token", message_chunk.content, node)
+            else:
+                for node in chunk:
+                    yield ChatEvent("progress", NODE_PROGRESS.get(node, node), node)
+
+        snapshot = await self.graph.aget_state(config)
+        response_content = snapshot.values["messages"][-1].content
+        self._report_usage(usage)
+
+        await self._asave_turn(message, response_content)
+
+        yield ChatEvent("final", response_content)
@@ -0,0 +1,312 @@
+"""
+Token budgets for the prompts the agent nodes send.
+
+Every node that builds a prompt from conversation history or tool output goes through
+ContextBudget. It counts tokens with the model's tokenizer and keeps each prompt
+under the node's ceiling:
+- Tool outputs are cut to a fixed size, keeping the start and the end.
+- History is selected newest-first. An assistant tool call always stays together
+  with its tool results.
+- Older turns that no longer fit are folded into a short extractive summary.
+
+TokenUsageTracker is a callback handler that sums the tokens the model actually
+reports for each node, so a turn can show where its budget went.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import (
+    AIMessage,
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    ToolMessage,
+    convert_to_messages,
+)
+from langchain_core.outputs import LLMResult
+
+# Tokens OpenAI adds around every chat message, and once to prime the reply
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_REPLY = 3
+
+# Rough ratio used when the tokenizer files can't be loaded (e.g. offline)
+_CHARS_PER_TOKEN = 4
+
+
+@dataclass
+class ContextBudgetSettings:
+    """Per-node prompt ceilings, in tokens."""
+
+    tokenizer_model: str = os.getenv("CONTEXT_TOKENIZER_MODEL", "gpt-4o-mini")
+
+    # Conversation history sent by message-based nodes (system prompt included)
+    chatbot_max_tokens: int = int(os.getenv("CONTEXT_BUDGET_CHATBOT", "6000"))
+    lead_finder_max_tokens: int = int(os.getenv("CONTEXT_BUDGET_LEAD_FINDER", "6000"))
+    summary_max_tokens: int = int(os.getenv("CONTEXT_BUDGET_SUMMARY", "4000"))
+
+    # Search results inlined into the enrichment merge prompt
+    enricher_max_tokens: int = int(os.getenv("CONTEXT_BUDGET_ENRICHER", "3000"))
+
+    # Any single tool output kept in a prompt
+    tool_output_max_tokens: int = int(os.getenv("CONTEXT_TOOL_OUTPUT_TOKENS", "2000"))
+
+    # Summary of the turns that were trimmed from history
+    history_summary_max_tokens: int = int(os.getenv("CONTEXT_HISTORY_SUMMARY_TOKENS", "300"))
+
+    @classmethod
+    def from_env(cls) -> "ContextBudgetSettings":
+        """Create settings from environment variables."""
+        return cls()
+
+    def limit(self, node: str) -> int:
+        """Ceiling for a node; unknown nodes get the chatbot ceiling."""
+        return getattr(self, f"{node}_max_tokens", self.chatbot_max_tokens)
+
+
+@lru_cache(maxsize=8)
+def _encoding(model: str):
+    """tiktoken encoding for a model, or None (warned once) when it can't be loaded."""
+    import tiktoken
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"⚠ Tokenizer for {model} unavailable ({type(e).__name__}), estimating tokens from length")
+        return None
+
+
+class TokenCounter:
+    """Counts tokens the way the OpenAI chat API bills them."""
+
+    def __init__(self, model: str = "gpt-4o-mini"):
+        self.encoding = _encoding(model)
+
+    def count_text(self, text: str) -> int:
+        if not text:
+            return 0
+        if self.encoding is None:
+            return -(-len(text) // _CHARS_PER_TOKEN)
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text to max_tokens, keeping the head and the tail."""
+        total = self.count_text(text)
+        if total <= max_tokens:
+            return text
+
+        head_tokens = max_tokens * 2 // 3
+        tail_tokens = max(0, max_tokens - head_tokens)
+        marker = f"\n…[{total - max_tokens} tokens truncated]…\n"
+        if self.encoding is None:
+            head = text[: head_tokens * _CHARS_PER_TOKEN]
+            tail = text[len(text) - tail_tokens * _CHARS_PER_TOKEN:] if tail_tokens else ""
+            return head + marker + tail
+
+        tokens = self.encoding.encode(text, disallowed_special=())
+        head = self.encoding.decode(tokens[:head_tokens])
+        tail = self.encoding.decode(tokens[-tail_tokens:]) if tail_tokens else ""
+        return head + marker + tail
+
+    def count_message(self, message: BaseMessage) -> int:
+        tokens = TOKENS_PER_MESSAGE + self.count_text(_content_text(message))
+        if message.name:
+            tokens += self.count_text(message.name) + 1
+        if isinstance(message, AIMessage):
+            for call in message.tool_calls:
+                tokens += self.count_text(call["name"]) + self.count_text(json.dumps(call["args"]))
+        return tokens
+
+    def count_messages(self, messages: Sequence[BaseMessage]) -> int:
+        return TOKENS_PER_REPLY + sum(self.count_message(m) for m in messages)
+
+
+def _content_text(message: BaseMessage) -> str:
+    if isinstance(message.content, str):
+        return message.content
+    return message.text
+
+
+def _with_content(message: BaseMessage, content: str) -> BaseMessage:
+    return message.model_copy(update={"content": content})
+
+
+def _group_turns(messages: list[BaseMessage]) -> list[list[BaseMessage]]:
+    """Group an assistant tool call with its tool results; OpenAI rejects one without the other."""
+    groups: list[list[BaseMessage]] = []
+    for message in messages:
+        if (
+            isinstance(message, ToolMessage)
+            and groups
+            and isinstance(groups[-1][0], AIMessage)
+            and groups[-1][0].tool_calls
+        ):
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    return groups
+
+
+class ContextBudget:
+    """Fits node prompts under their token ceilings."""
+
+    def __init__(self, settings: Optional[ContextBudgetSettings] = None):
+        self.settings = settings or ContextBudgetSettings.from_env()
+        self.counter = TokenCounter(self.settings.tokenizer_model)
+
+    def limit(self, node: str) -> int:
+        return self.settings.limit(node)
+
+    def fit_text(self, node: str, text: str) -> str:
+        """Truncate text inlined into a node's prompt to the node's ceiling."""
+        return self.counter.truncate(text, self.limit(node))
+
+    def _summarize(self, dropped: list[BaseMessage]) -> Optional[SystemMessage]:
+        """Fold trimmed turns into one system message, keeping the most recent lines."""
+        lines = []
+        for message in dropped:
+            if isinstance(message, HumanMessage):
+                role = "User"
+            elif isinstance(message, AIMessage) and _content_text(message):
+                role = "Assistant"
+            else:
+                # Tool calls and tool output are not useful without their full content
+                continue
+            line = self.counter.truncate(" ".join(_content_text(message).split()), 60)
+            line = line.replace("\n", " ")
+            lines.append(f"- {role}: {line}")
+
+        header = "Summary of earlier conversation (older turns were trimmed):"
+        budget = self.settings.history_summary_max_tokens - self.counter.count_text(header)
+        kept: list[str] = []
+        for line in reversed(lines):
+            budget -= self.counter.count_text(line) + 1
+            if budget < 0:
+                break
+            kept.append(line)
+        if not kept:
+            return None
+        return SystemMessage(content="\n".join([header, *reversed(kept)]))
+
+    def fit(
+        self, node: str, messages: Sequence, max_messages: Optional[int] = None
+    ) -> list[BaseMessage]:
+        """Select the history a node sends, within its ceiling.
+
+        Leading system messages are always kept. The rest is taken newest-first, whole
+        tool-call turns at a time, and what no longer fits is summarized.
+
+        Args:
+            node: Node name whose ceiling applies
+            messages: Prompt messages (dicts or LangChain messages)
+            max_messages: Optional cap on the number of history messages kept
+
+        Returns:
+            list[BaseMessage]: The messages to send
+        """
+        messages = [
+            _with_content(m, self.counter.truncate(m.content, self.settings.tool_output_max_tokens))
+            if isinstance(m, ToolMessage) and isinstance(m.content, str)
+            else m
+            for m in convert_to_messages(messages)
+        ]
+
+        pinned_count = 0
+        while pinned_count < len(messages) and isinstance(messages[pinned_count], SystemMessage):
+            pinned_count += 1
+        pinned, history = messages[:pinned_count], messages[pinned_count:]
+
+        limit = self.limit(node)
+        available = limit - self.counter.count_messages(pinned)
+        if self.counter.count_messages(history) > available:
+            # Something will be trimmed; leave room for its summary
+            available -= self.settings.history_summary_max_tokens
+        groups = _group_turns(history)
+
+        kept: list[list[BaseMessage]] = []
+        kept_messages = 0
+        for group in reversed(groups):
+            cost = sum(self.counter.count_message(m) for m in group)
+            over_budget = cost > available
+            over_count = max_messages is not None and kept_messages + len(group) > max_messages
+            # The newest turn is always sent, even when it alone exceeds the budget
+            if kept and (over_budget or over_count):
+                break
+            kept.append(group)
+            kept_messages += len(group)
+            available -= cost
+
+        dropped = [m for group in groups[: len(groups) - len(kept)] for m in group]
+        selected = [m for group in reversed(kept) for m in group]
+        if not dropped:
+            return pinned + selected
+
+        summary = self._summarize(dropped)
+        fitted = pinned + ([summary] if summary else []) + selected
+        if summary is not None and self.counter.count_messages(fitted) > limit:
+            fitted.remove(summary)
+        return fitted
+
+
+class TokenUsageTracker(BaseCallbackHandler):
+    """Sums prompt and completion tokens per graph node for one run."""
+
+    def __init__(self, counter: Optional[TokenCounter] = None):
+        self.counter = counter
+        self.usage: dict[str, dict[str, int]] = {}
+        self._runs: dict[UUID, tuple[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[BaseMessage]],
+        *,
+        run_id: UUID,
+        metadata: Optional[dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node", "other")
+        # Estimate in case the response carries no usage (e.g. streams without it)
+        estimate = self.counter.count_messages(messages[0]) if self.counter and messages else 0
+        with self._lock:
+            self._runs[run_id] = (node, estimate)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            node, estimate = self._runs.pop(run_id, ("other", 0))
+
+        usage = None
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None) or usage
+        prompt_tokens = usage["input_tokens"] if usage else estimate
+        completion_tokens = usage["output_tokens"] if usage else 0
+
+        with self._lock:
+            totals = self.usage.setdefault(node, {"calls": 0, "prompt": 0, "completion": 0})
+            totals["calls"] += 1
+            totals["prompt"] += prompt_tokens
+            totals["completion"] += completion_tokens
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    def report(self) -> str:
+        """One line with each node's calls and tokens, largest prompt first."""
+        with self._lock:
+            rows = sorted(self.usage.items(), key=lambda item: -item[1]["prompt"])
+        return ", ".join(
+            f"{node} {totals['prompt']:,} in / {totals['completion']:,} out ({totals['calls']} calls)"
+            for node, totals in rows
+        )
@@ -0,0 +1,151 @@
+"""Loads the Ideal Customer Profile from ICP.csv or Google Sheets content, with caching."""
+
+import ast
+import csv
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from langchain_openai import ChatOpenAI
+
+from ..schema.icp import IdealCustomerProfile
+from ...infrastructure.cache.lru_cache import LRUCache
+
+ICP_CACHE_SIZE = int(os.getenv("ICP_CACHE_SIZE", "16"))
+
+# "Row  2: ['industries_allowed', 'SaaS B2B; Fintech']" lines of read_sheet_values
+_SHEET_ROW = re.compile(r"^\s*Row\s*\d+\s*:\s*(\[.*\])\s*$")
+
+
+def parse_parameter_rows(text: str) -> dict[str, str]:
+    """Extract Parameter -> Value pairs from sheet output or CSV text."""
+    parameters: dict[str, str] = {}
+    lines = text.splitlines()
+
+    sheet_rows = [m.group(1) for m in map(_SHEET_ROW.match, lines) if m]
+    if sheet_rows:
+        rows = []
+        for row in sheet_rows:
+            try:
+                rows.append(ast.literal_eval(row))
+            except (ValueError, SyntaxError):
+                continue
+    else:
+        rows = list(csv.reader(lines))
+
+    for row in rows:
+        if len(row) < 2 or str(row[0]).strip().lower() == "parameter":
+            continue
+        parameters[str(row[0]).strip()] = str(row[1])
+    return parameters
+
+
+def is_icp_table(parameters: dict[str, str]) -> bool:
+    """True when at least one parameter names an ICP field."""
+    fields = IdealCustomerProfile.model_fields
+    return any(key.strip().lower().replace(" ", "_") in fields for key in parameters)
+
+
+class ICPLoader:
+    """Parses the ICP deterministically and caches it by a fingerprint of its source.
+
+    The file source is keyed by path, mtime and size, and sheet content by its hash,
+    so an unchanged ICP is never parsed twice. The LLM is only used when the table is
+    not well-formed.
+    """
+
+    def __init__(self, llm: Optional[ChatOpenAI] = None, cache_size: int = ICP_CACHE_SIZE):
+        self.llm = llm
+        self.cache: LRUCache[IdealCustomerProfile] = LRUCache(max_size=cache_size)
+
+    @staticmethod
+    def _llm_prompt(parameters: dict[str, str]) -> list[dict]:
+        data_str = "\n".join([f"{k}: {v}" for k, v in parameters.items()])
+        prompt = f"""
+        Parse the following Ideal Customer Profile (ICP) data into structured format.
+
+        Raw Data:
+        {data_str}
+
+        Extract and structure:
+        - Industries (allowed/blocked) - split semicolon-separated values into lists
+        - Employee count range (min/max) - convert to integers
+        - Regions (allowed/blocked) - split semicolon-separated values into lists
+        - Technologies required - split semicolon-separated values into lists
+        - Buyer personas - split semicolon-separated values into lists
+        - Excluded personas - split semicolon-separated values into lists
+        """
+        return [{"role": "user", "content": prompt}]
+
+    def _parse_with_llm(self, parameters: dict[str, str]) -> IdealCustomerProfile:
+        parser = self.llm.with_structured_output(IdealCustomerProfile)
+        return parser.invoke(self._llm_prompt(parameters))
+
+    async def _aparse_with_llm(self, parameters: dict[str, str]) -> IdealCustomerProfile:
+        parser = self.llm.with_structured_output(IdealCustomerProfile)
+        return await parser.ainvoke(self._llm_prompt(parameters))
+
+    def parse(self, parameters: dict[str, str]) -> IdealCustomerProfile:
+        """Parse Parameter -> Value rows, falling back to the LLM for malformed values."""
+        try:
+            return IdealCustomerProfile.from_parameters(parameters)
+        except ValueError as e:
+            if self.llm is None:
+                raise
+            print(f"⚠ ICP table is not well-formed ({e}), parsing it with the LLM")
+            return self._parse_with_llm(parameters)
+
+    async def aparse(self, parameters: dict[str, str]) -> IdealCustomerProfile:
+        """Async variant of parse; the LLM fallback doesn't block the event loop."""
+        try:
+            return IdealCustomerProfile.from_parameters(parameters)
+        except ValueError as e:
+            if self.llm is None:
+                raise
+            print(f"⚠ ICP table is not well-formed ({e}), parsing it with the LLM")
+            return await self._aparse_with_llm(parameters)
+
+    def from_file(self, csv_path: Path) -> IdealCustomerProfile:
+        """Load the ICP from a Parameter,Value CSV file."""
+        stat = csv_path.stat()
+        key = ("file", str(csv_path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+        icp = self.cache.get(key)
+        if icp is None:
+            df = pd.read_csv(csv_path)
+            icp = self.parse(dict(zip(df["Parameter"], df["Value"])))
+            self.cache.set(key, icp)
+        return icp
+
+    @staticmethod
+    def _sheet_key(text: str) -> tuple:
+        return ("sheet", hashlib.sha256(text.encode("utf-8")).hexdigest())
+
+    def from_sheet_text(self, text: str) -> Optional[IdealCustomerProfile]:
+        """Load the ICP from read_sheet_values output; None when it isn't an ICP table."""
+        key = self._sheet_key(text)
+
+        icp = self.cache.get(key)
+        if icp is None:
+            parameters = parse_parameter_rows(text)
+            if not is_icp_table(parameters):
+                return None
+            icp = self.parse(parameters)
+            self.cache.set(key, icp)
+        return icp
+
+    async def afrom_sheet_text(self, text: str) -> Optional[IdealCustomerProfile]:
+        """Async variant of from_sheet_text."""
+        key = self._sheet_key(text)
+
+        icp = self.cache.get(key)
+        if icp is None:
+            parameters = parse_parameter_rows(text)
+            if not is_icp_table(parameters):
+                return None
+            icp = await self.aparse(parameters)
+            self.cache.set(key, icp)
+        return icp
@@ -0,0 +1,375 @@
+"""
+Deterministic extraction of enrichment fields from web search text.
+
+Serper results are snippets joined into one string. Before the LeadCompleted merge
+asks the LLM, regex and heuristic parsers pull out what the text states plainly:
+- URLs and bare domains that match the company name (website)
+- Dollar amounts attributed to their nearest metric keyword (profit, EBITDA)
+- Percentages next to stock and three-month cues (stock variation)
+- Emails and phone numbers, kept as contacts only with a name and a title nearby
+
+Every value carries a confidence score, and the caller decides which are good
+enough to skip the LLM. Financial figures and stock moves score lower when their
+sentence does not name the company or names a year before the last fiscal year, since
+snippets often quote competitors or old filings. Batch search results are split into one section per field
+query, and each field is read only from its own section (or from unlabeled text).
+"""
+import re
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Any, Optional
+
+from ..schema.contact import Contact
+
+ENRICHMENT_FIELDS = ("website", "last_year_profit", "last_quarter_ebitda", "stock_variation_3m")
+
+# ---- patterns -------------------------------------------------------------------
+
+# "### <field>: <query>" headers written by WebSearchService.search_batch
+_SECTION_HEADER = re.compile(r"^### (?P<field>\w+): .*$", re.MULTILINE)
+
+# Fields each parser fills, so it only reads the sections searched for them
+_WEBSITE_FIELDS = {"website"}
+_FINANCIAL_FIELDS = {"last_year_profit", "last_quarter_ebitda"}
+_STOCK_FIELDS = {"stock_variation_3m"}
+_CONTACT_FIELDS = {"contacts"}
+
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9$])")
+
+_URL = re.compile(
+    r"(?<![@\w.])(?:https?://)?(?:www\.)?"
+    r"((?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,24})(?![\w@-])(?:/[^\s,;)\"']*)?",
+    re.IGNORECASE,
+)
+
+# Hosts that talk about companies rather than belong to them
+_THIRD_PARTY_HOSTS = {
+    "linkedin.com", "wikipedia.org", "crunchbase.com", "bloomberg.com", "reuters.com",
+    "yahoo.com", "facebook.com", "twitter.com", "x.com", "instagram.com", "youtube.com",
+    "glassdoor.com", "zoominfo.com", "google.com", "forbes.com", "cnbc.com", "wsj.com",
+    "marketwatch.com", "macrotrends.net", "statista.com", "sec.gov", "pitchbook.com",
+    "owler.com", "dnb.com", "indeed.com", "github.com", "medium.com", "apple.com",
+}
+
+_MONEY = re.compile(
+    r"(?P<sign>[-−])?\s*(?:US\$|USD\s?|\$)\s?(?P<num>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+    r"(?:\s?(?P<unit>trillion|billion|million|thousand|tn|bn|mn|mm|[tbmk])\b)?"
+    r"|(?P<num2>\d+(?:\.\d+)?)\s?(?P<unit2>trillion|billion|million)\s(?:US\s)?(?:dollars|USD)\b",
+    re.IGNORECASE,
+)
+
+_UNIT_IN_MILLIONS = {
+    "trillion": 1e6, "tn": 1e6, "t": 1e6,
+    "billion": 1e3, "bn": 1e3, "b": 1e3,
+    "million": 1.0, "mn": 1.0, "mm": 1.0, "m": 1.0,
+    "thousand": 1e-3, "k": 1e-3,
+}
+
+_PERCENT = re.compile(r"(?P<sign>[-+−])?\s?(?P<num>\d+(?:\.\d+)?)\s?(?:%|percent\b)", re.IGNORECASE)
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)*\.[a-z]{2,}", re.IGNORECASE)
+_PHONE = re.compile(r"\+?\(?\d[\d\s().-]{7,}\d")
+
+_NAME = r"[A-Z][a-z]+(?:\s[A-Z]\.)?(?:\s[A-Z][a-z'-]+)+"
+_TITLE = (
+    r"(?:CEO|CFO|CTO|COO|CMO|CRO|CIO|Chief [A-Z][a-z]+ Officer|President|Co-Founder|Founder"
+    r"|(?:Senior |Executive )?Vice President[^,;.()]*|VP[^,;.()]*|Head of [^,;.()]+"
+    r"|(?:Managing )?Director[^,;.()]*|Partner|Owner)"
+)
+_PERSON = re.compile(
+    rf"(?P<name>{_NAME}),?\s(?:the\s|is\s(?:the\s)?|as\s)?(?P<title>{_TITLE})"
+    rf"|(?P<title2>{_TITLE}),?\s(?P<name2>{_NAME})"
+)
+_PLACEHOLDER_NAMES = {"john doe", "jane doe", "john smith", "jane smith"}
+# Capitalized words that start a sentence before a name ("Contact Jane Miller, CFO")
+_NAME_PREFIXES = {"contact", "meet", "email", "call", "reach", "our", "dear", "mr", "ms", "mrs", "dr"}
+
+# Metric keywords; an amount belongs to the keyword nearest to it in its sentence
+_METRICS = {
+    "profit": re.compile(r"net (?:income|profit|earnings|loss)|profits?|earnings|net loss", re.I),
+    "ebitda": re.compile(r"(?:adjusted\s)?ebitda", re.I),
+    "revenue": re.compile(r"revenues?|sales|turnover", re.I),
+    "other": re.compile(r"market cap(?:italization)?|valuation|funding|raised|debt|assets", re.I),
+}
+_LOSS = re.compile(r"\bloss\b", re.I)
+_QUARTER = re.compile(r"\bQ[1-4]\b|\bquarter(?:ly)?\b|three months ended", re.I)
+
+_YEAR = re.compile(r"\b(?:FY\s?)?((?:19|20)\d\d)\b")
+# Confidence lost by a figure whose sentence doesn't name the company or is from an older year
+_OTHER_COMPANY_PENALTY = 0.25
+_STALE_YEAR_PENALTY = 0.4
+
+_STOCK = re.compile(r"\b(?:stock|shares?|share price|ticker)\b", re.I)
+_THREE_MONTHS = re.compile(
+    r"\b(?:3|three)[- ]months?\b|\b90[- ]days?\b|\bpast quarter\b|\blast quarter\b", re.I
+)
+_UP = re.compile(r"\b(?:up|rose|risen|gained|climbed|jumped|increased|surged)\b", re.I)
+_DOWN = re.compile(r"\b(?:down|fell|fallen|declined?|dropped|lost|decrease[ds]?|slid|plunged)\b", re.I)
+
+_LEGAL_SUFFIXES = {
+    "inc", "corp", "corporation", "ltd", "llc", "gmbh", "sa", "ag", "plc", "co",
+    "company", "group", "holdings", "technologies", "the",
+}
+
+
+@dataclass
+class ExtractedField:
+    """A value found in the search text."""
+
+    value: Any
+    confidence: float
+    evidence: str
+
+
+@dataclass
+class LeadExtraction:
+    """Everything the deterministic pass found for one lead."""
+
+    fields: dict[str, ExtractedField] = field(default_factory=dict)
+    contacts: list[Contact] = field(default_factory=list)
+
+    def propose(self, name: str, value: Any, confidence: float, evidence: str) -> None:
+        """Keep the most confident value per field."""
+        current = self.fields.get(name)
+        if current is None or confidence > current.confidence:
+            self.fields[name] = ExtractedField(value, round(confidence, 2), evidence.strip())
+
+    def confident(self, min_confidence: float) -> dict[str, Any]:
+        """Field values at or above min_confidence."""
+        return {
+            name: found.value
+            for name, found in self.fields.items()
+            if found.confidence >= min_confidence
+        }
+
+
+# ---- parsers --------------------------------------------------------------------
+
+def _sections(text: str) -> list[tuple[Optional[str], str]]:
+    """Split text into (field, body) sections; text outside any section has field None."""
+    headers = list(_SECTION_HEADER.finditer(text))
+    if not headers:
+        return [(None, text)]
+    sections: list[tuple[Optional[str], str]] = []
+    if text[: headers[0].start()].strip():
+        sections.append((None, text[: headers[0].start()]))
+    for header, following in zip(headers, headers[1:] + [None]):
+        end = following.start() if following is not None else len(text)
+        sections.append((header.group("field"), text[header.end():end]))
+    return sections
+
+
+def _sentences(text: str) -> list[str]:
+    return [s for s in _SENTENCE_END.split(" ".join(text.split())) if s]
+
+
+def _company_tokens(company: str) -> list[str]:
+    words = re.findall(r"[a-z0-9]+", company.lower())
+    return [w for w in words if w not in _LEGAL_SUFFIXES]
+
+
+def _mentions_company(sentence: str, tokens: list[str]) -> bool:
+    """True when the sentence names the company by one of its distinctive tokens."""
+    lowered = sentence.lower()
+    return any(
+        re.search(rf"(?<![a-z0-9]){re.escape(token)}(?![a-z0-9])", lowered)
+        for token in tokens
+        if len(token) >= 3 or token == tokens[0]
+    )
+
+
+def _relevance_penalty(sentence: str, tokens: list[str], last_fiscal_year: int) -> float:
+    """Confidence to drop for a figure that may belong to another company or year."""
+    penalty = 0.0
+    if tokens and not _mentions_company(sentence, tokens):
+        penalty += _OTHER_COMPANY_PENALTY
+    years = [int(year) for year in _YEAR.findall(sentence)]
+    if years and max(years) < last_fiscal_year:
+        penalty += _STALE_YEAR_PENALTY
+    return penalty
+
+
+def _registrable_label(host: str) -> str:
+    """'www.shop.acme.co.uk' -> 'acme'"""
+    labels = host.lower().split(".")
+    if len(labels) >= 3 and len(labels[-2]) <= 3 and len(labels[-1]) == 2:
+        return labels[-3]
+    return labels[-2] if len(labels) >= 2 else labels[0]
+
+
+def _extract_website(company: str, sentences: list[str], result: LeadExtraction) -> None:
+    tokens = _company_tokens(company)
+    if not tokens:
+        return
+    slug = "".join(tokens)
+
+    for sentence in sentences:
+        for match in _URL.finditer(sentence):
+            host = match.group(1).lower()
+            if host.startswith("www."):
+                host = host[4:]
+            if any(host == h or host.endswith("." + h) for h in _THIRD_PARTY_HOSTS):
+                continue
+
+            label = _registrable_label(host)
+            if label == slug or (label == tokens[0] and len(label) >= 4):
+                confidence = 0.9
+            elif len(label) >= 4 and slug.startswith(label):
+                confidence = 0.8
+            elif any(len(t) >= 4 and t in label for t in tokens):
+                confidence = 0.65
+            else:
+                continue
+            if re.search(r"website|official site", sentence, re.I):
+                confidence += 0.05
+
+            result.propose("website", f"https://{host}", min(confidence, 0.95), sentence)
+
+
+def _money_in_millions(match: re.Match) -> Optional[float]:
+    raw = match.group("num") or match.group("num2")
+    unit = (match.group("unit") or match.group("unit2") or "").lower()
+    amount = float(raw.replace(",", ""))
+    if unit:
+        amount *= _UNIT_IN_MILLIONS[unit]
+    elif amount >= 100_000:
+        amount /= 1e6  # A plain dollar figure
+    else:
+        return None  # "$45" without a unit says nothing about company financials
+    if match.group("sign"):
+        amount = -amount
+    return amount
+
+
+def _nearest_metric(sentence: str, start: int, end: int) -> tuple[Optional[str], int, Optional[re.Match]]:
+    best: tuple[Optional[str], int, Optional[re.Match]] = (None, 10**6, None)
+    for metric, pattern in _METRICS.items():
+        for keyword in pattern.finditer(sentence):
+            if keyword.end() <= start:
+                distance = start - keyword.end()
+            elif keyword.start() >= end:
+                # Keywords after the amount ("$3M in profit") read slightly less reliably
+                distance = keyword.start() - end + 10
+            else:
+                continue
+            if distance < best[1]:
+                best = (metric, distance, keyword)
+    return best
+
+
+def _extract_financials(
+    tokens: list[str], sentences: list[str], last_fiscal_year: int, result: LeadExtraction
+) -> None:
+    for sentence in sentences:
+        quarterly = bool(_QUARTER.search(sentence))
+        penalty = _relevance_penalty(sentence, tokens, last_fiscal_year)
+
+        for match in _MONEY.finditer(sentence):
+            amount = _money_in_millions(match)
+            if amount is None:
+                continue
+            metric, distance, keyword = _nearest_metric(sentence, match.start(), match.end())
+            if metric not in ("profit", "ebitda") or distance > 100:
+                continue
+
+            confidence = (0.9 if distance <= 40 else 0.75) - penalty
+            if metric == "profit":
+                if _LOSS.search(keyword.group(0)) and amount > 0:
+                    amount = -amount
+                # A quarterly cue wins over a year or "annual" mention in the same
+                # sentence ("Q3 2024 net income"); the LLM decides those
+                if quarterly:
+                    confidence -= 0.35
+                result.propose("last_year_profit", round(amount, 3), confidence, sentence)
+            else:
+                if not quarterly:
+                    confidence -= 0.3  # Likely an annual figure
+                result.propose("last_quarter_ebitda", round(amount, 3), confidence, sentence)
+
+
+def _extract_stock_variation(
+    tokens: list[str], sentences: list[str], last_fiscal_year: int, result: LeadExtraction
+) -> None:
+    for sentence in sentences:
+        if not (_STOCK.search(sentence) and _THREE_MONTHS.search(sentence)):
+            continue
+        penalty = _relevance_penalty(sentence, tokens, last_fiscal_year)
+        for match in _PERCENT.finditer(sentence):
+            value = float(match.group("num"))
+            sign = match.group("sign")
+            before = sentence[max(0, match.start() - 40):match.start()]
+            if sign in ("-", "−") or (sign is None and _DOWN.search(before)):
+                value = -value
+            # An explicit sign or movement verb makes the direction unambiguous
+            confidence = 0.85 if sign or _UP.search(before) or _DOWN.search(before) else 0.7
+            confidence -= penalty
+            result.propose("stock_variation_3m", value, confidence, sentence)
+            break
+
+
+def _extract_contacts(text: str, result: LeadExtraction) -> None:
+    """Contacts need a name, title, email and phone within one passage, like the LLM rules."""
+    flat = " ".join(text.split())
+    # One contact per email and per person; a generic inbox nearby is not a second contact
+    seen: set[str] = set()
+    for email in _EMAIL.finditer(flat):
+        window_start = max(0, email.start() - 200)
+        window = flat[window_start:email.end() + 200]
+
+        phone = next(
+            (p.group(0).strip() for p in _PHONE.finditer(window)
+             if sum(c.isdigit() for c in p.group(0)) >= 9),
+            None,
+        )
+        person = min(
+            _PERSON.finditer(window),
+            key=lambda m: abs(window_start + m.start() - email.start()),
+            default=None,
+        )
+        if phone is None or person is None:
+            continue
+
+        words = (person.group("name") or person.group("name2")).split()
+        while words and words[0].lower().rstrip(".") in _NAME_PREFIXES:
+            words.pop(0)
+        name = " ".join(words)
+        title = (person.group("title") or person.group("title2")).strip()
+        if (
+            len(words) < 2
+            or name.lower() in _PLACEHOLDER_NAMES
+            or email.group(0).lower() in seen
+            or name.lower() in seen
+        ):
+            continue
+        seen.update((email.group(0).lower(), name.lower()))
+        result.contacts.append(
+            Contact(name=name, email=email.group(0), phone=phone, position=title)
+        )
+
+
+def extract_lead_fields(
+    company: str, text: str, current_year: Optional[int] = None
+) -> LeadExtraction:
+    """Extract enrichment fields for a company from search result text.
+
+    Args:
+        company: Company the text was searched for
+        text: Search result text
+        current_year: Year the figures are judged against (defaults to today's)
+    """
+    result = LeadExtraction()
+    if not text:
+        return result
+    tokens = _company_tokens(company)
+    last_fiscal_year = (current_year or date.today().year) - 1
+    for section, body in _sections(text):
+        sentences = _sentences(body)
+        if section is None or section in _WEBSITE_FIELDS:
+            _extract_website(company, sentences, result)
+        if section is None or section in _FINANCIAL_FIELDS:
+            _extract_financials(tokens, sentences, last_fiscal_year, result)
+        if section is None or section in _STOCK_FIELDS:
+            _extract_stock_variation(tokens, sentences, last_fiscal_year, result)
+        if section is None or section in _CONTACT_FIELDS:
+            _extract_contacts(body, result)
+    return result
@@ -1,82 +1,183 @@
-import asyncio
-from typing import Any, List
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
 
-from langchain_core.tools import BaseTool, StructuredTool
+from langchain_core.tools import BaseTool
+from mcp.types import Tool
 
-from src.infrastructure.mcp_clients.client import get_mcp_client
+from src.infrastructure.mcp_clients.session_manager import (
+    MCPSessionManager,
+    get_mcp_session_manager,
+)
 
+GOOGLE_WORKSPACE_SERVER = "google_workspace"
 
-def wrap_async_tool_for_sync(async_tool: BaseTool) -> StructuredTool:
-    """Wrap an async-only MCP tool to support synchronous invocation.
-    
-    MCP tools from langchain-mcp-adapters only implement _arun (async).
-    This wrapper adds sync support by running the async method in a new event loop.
-    
-    Args:
-        async_tool: Async-only tool from MCP client
-        
-    Returns:
-        StructuredTool with both sync and async support
+# Filter to only specific tools needed for spreadsheet and drive operations
+ALLOWED_TOOLS = {
+    'list_spreadsheets',
+    'read_sheet_values',
+    'get_drive_file_content',
+    'list_drive_items',
+    'search_drive_files'
+}
+
+# Bump when the cache file layout changes
+TOOL_CACHE_FORMAT = 1
+
+
+class GoogleWorkspaceToolRegistry:
+    """Google Workspace tools discovered lazily, without blocking startup.
+
+    Tool schemas are served from a disk cache right away and refreshed from the MCP
+    server on a background thread. Consumers call tools() each time they need the
+    list, so tools appear as soon as discovery succeeds.
     """
-    async def async_func(*args: Any, **kwargs: Any) -> Any:
-        """Async version - delegates to original tool."""
-        # Extract config from kwargs (required by LangChain tools)
-        config = kwargs.pop('config', None)
-        if config is None:
-            from langchain_core.runnables import RunnableConfig
-            config = RunnableConfig()
-        return await async_tool._arun(*args, config=config, **kwargs)
-    
-    def sync_func(*args: Any, **kwargs: Any) -> Any:
-        """Sync version - runs async in new event loop."""
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+
+    def __init__(
+        self,
+        manager: Optional[MCPSessionManager] = None,
+        cache_path: Optional[str] = None,
+        refresh_interval_seconds: Optional[float] = None,
+        retry_interval_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            manager: MCP session manager the tools call through
+            cache_path: Schema cache file (MCP_TOOL_CACHE_PATH)
+            refresh_interval_seconds: Time between successful refreshes (MCP_TOOLS_REFRESH_INTERVAL)
+            retry_interval_seconds: Time between failed discovery attempts (MCP_TOOLS_RETRY_INTERVAL)
+        """
+        self.manager = manager or get_mcp_session_manager()
+        self.cache_path = Path(
+            cache_path or os.getenv("MCP_TOOL_CACHE_PATH", ".cache/mcp_tools.json")
+        )
+        self.refresh_interval_seconds = refresh_interval_seconds or float(
+            os.getenv("MCP_TOOLS_REFRESH_INTERVAL", "600")
+        )
+        self.retry_interval_seconds = retry_interval_seconds or float(
+            os.getenv("MCP_TOOLS_RETRY_INTERVAL", "30")
+        )
+
+        self._definitions: list[dict] = []
+        self._server_version: Optional[str] = None
+        self._tools: List[BaseTool] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self._load_cache()
+
+    def tools(self) -> List[BaseTool]:
+        """Currently available Google Workspace tools (possibly empty)."""
+        with self._lock:
+            return list(self._tools)
+
+    def _server_url(self) -> str:
+        return self.manager.client.connections[GOOGLE_WORKSPACE_SERVER]["url"]
+
+    def _set_definitions(self, definitions: list[dict]) -> None:
+        tools = [
+            self.manager.as_langchain_tool(GOOGLE_WORKSPACE_SERVER, Tool.model_validate(d))
+            for d in definitions
+        ]
+        with self._lock:
+            self._definitions = definitions
+            self._tools = tools
+
+    def _load_cache(self) -> None:
+        """Use cached schemas written for the same cache format and server URL."""
         try:
-            return loop.run_until_complete(async_func(*args, **kwargs))
-        finally:
-            loop.close()
-    
-    return StructuredTool(
-        name=async_tool.name,
-        description=async_tool.description,
-        func=sync_func,  # Sync execution
-        coroutine=async_func,  # Async execution
-        args_schema=async_tool.args_schema,
-    )
-
-
-def get_google_workspace_tools_sync() -> List[BaseTool]:
-    """Fetch Google Workspace tools from MCP server with graceful fallback.
-    
-    Returns:
-        List of filtered Google Workspace tools (Sheets, Drive) wrapped for sync support,
-        or empty list if unavailable.
-    """
-    async def _fetch_tools() -> List[BaseTool]:
-        client = await get_mcp_client()
-        mcp_tools = await client.get_tools()
-        
-        # Filter to only specific tools needed for spreadsheet and drive operations
-        allowed_tools = {
-            'list_spreadsheets',
-            'read_sheet_values',
-            'get_drive_file_content',
-            'list_drive_items',
-            'search_drive_files'
-        }
-        
-        filtered_tools = [
-            tool for tool in mcp_tools 
-            if tool.name in allowed_tools
+            cached = json.loads(self.cache_path.read_text())
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print(f"⚠ Ignoring unreadable MCP tool cache {self.cache_path}: {e}")
+            return
+
+        if cached.get("format") != TOOL_CACHE_FORMAT or cached.get("url") != self._server_url():
+            return
+        try:
+            self._set_definitions(cached["tools"])
+        except Exception as e:
+            print(f"⚠ Ignoring invalid MCP tool cache {self.cache_path}: {e}")
+            return
+        self._server_version = cached.get("server_version")
+        print(f"✓ Loaded {len(self._tools)} Google Workspace tools from cache")
+
+    def _save_cache(self) -> None:
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.cache_path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {
+                    "format": TOOL_CACHE_FORMAT,
+                    "url": self._server_url(),
+                    "server_version": self._server_version,
+                    "saved_at": time.time(),
+                    "tools": self._definitions,
+                }
+            )
+        )
+        # Atomic replace, so a crash never leaves a half-written cache
+        tmp_path.replace(self.cache_path)
+
+    def refresh(self) -> bool:
+        """Fetch the tool schemas from the server.
+
+        Returns:
+            bool: True if the tools or the server version changed
+        """
+        mcp_tools = self.manager.list_tools(GOOGLE_WORKSPACE_SERVER)
+        definitions = [
+            tool.model_dump(mode="json", exclude_none=True)
+            for tool in mcp_tools
+            if tool.name in ALLOWED_TOOLS
         ]
-        
-        # Wrap filtered MCP tools to support sync invocation
-        return [wrap_async_tool_for_sync(tool) for tool in filtered_tools]
-    
-    try:
-        tools = asyncio.run(_fetch_tools())
-        print(f"✓ Loaded {len(tools)} Google Workspace tools (filtered and wrapped for sync support)")
-        return tools
-    except Exception as e:
-        print(f"⚠ Could not load Google Workspace tools: {e}")
-        return []
\ No newline at end of file
+        server_version = self.manager.server_version(GOOGLE_WORKSPACE_SERVER)
+
+        with self._lock:
+            changed = (
+                definitions != self._definitions or server_version != self._server_version
+            )
+        if not changed:
+            return False
+
+        self._set_definitions(definitions)
+        self._server_version = server_version
+        try:
+            self._save_cache()
+        except OSError as e:
+            print(f"⚠ Could not write MCP tool cache {self.cache_path}: {e}")
+        print(f"✓ Discovered {len(definitions)} Google Workspace tools ({server_version})")
+        return True
+
+    def _refresh_loop(self) -> None:
+        failing = False
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+                failing = False
+                wait = self.refresh_interval_seconds
+            except Exception as e:
+                # Warn once per outage, not on every retry
+                if not failing:
+                    print(f"⚠ Could not load Google Workspace tools, retrying in background: {e}")
+                failing = True
+                wait = self.retry_interval_seconds
+            self._stop.wait(wait)
+
+    def refresh_in_background(self) -> None:
+        """Start discovering and periodically refreshing tools on a daemon thread."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._refresh_loop, name="mcp-tool-discovery", daemon=True
+        )
+        self._thread.start()
+
+    def close(self) -> None:
+        """Stop background refreshes."""
+        self._stop.set()
@@ -1,64 +1,116 @@
 import json
 import asyncio
-from langchain_core.tools import Tool
-from qdrant_client import QdrantClient
+from typing import Optional
 
+from langchain_core.tools import StructuredTool
+from pydantic import BaseModel, Field
+
+from src.infrastructure.knowledge_base.vectordb.client_provider import QdrantClientProvider
 from src.infrastructure.knowledge_base.vectordb.config import VectorDBSettings
 from src.infrastructure.knowledge_base.vectordb.embedding_service import LeadEmbeddingService
+from src.infrastructure.knowledge_base.vectordb.lead_storage import (
+    DERIVED_PAYLOAD_FIELDS,
+    build_lead_filter,
+)
+
+
+class SearchLeadsInput(BaseModel):
+    """Arguments for the search_leads tool."""
+
+    query: str = Field(..., description="Text query, e.g. 'software companies with high revenue'")
+    industries: Optional[list[str]] = Field(
+        default=None, description="Only return leads in these industries (case-insensitive)"
+    )
+    min_employees: Optional[int] = Field(default=None, description="Minimum employee count")
+    max_employees: Optional[int] = Field(default=None, description="Maximum employee count")
+    min_revenue_musd: Optional[float] = Field(
+        default=None, description="Minimum annual revenue in millions of USD"
+    )
+    limit: Optional[int] = Field(default=None, description="Maximum number of leads to return")
+    offset: int = Field(default=0, description="Number of results to skip, for pagination")
+
+
+def _format_results(search_result) -> str:
+    """Serialize Qdrant query results into the tool response."""
+    if not search_result.points:
+        return json.dumps({
+            "status": "success",
+            "message": "No leads found.",
+            "results": []
+        })
+
+    results = [
+        {key: value for key, value in point.payload.items() if key not in DERIVED_PAYLOAD_FIELDS}
+        for point in search_result.points
+    ]
+
+    return json.dumps({
+        "status": "success",
+        "message": f"Found {len(results)} lead(s).",
+        "results": results
+    }, indent=2)
+
+
+def _format_error(error: Exception) -> str:
+    return json.dumps({
+        "status": "error",
+        "message": f"Error searching leads: {str(error)}"
+    })
 
 
 def create_search_leads_tool(
-    client: QdrantClient,
+    client_provider: QdrantClientProvider,
     settings: VectorDBSettings,
     embedding_service: LeadEmbeddingService,
-) -> Tool:
-    
-    def search_leads(query: str) -> str:
+) -> StructuredTool:
+
+    def query_kwargs(query_vector: list[float], args: SearchLeadsInput) -> dict:
+        """Combine the query vector with payload filters, pagination and score threshold."""
+        return {
+            "collection_name": settings.collection_name,
+            "query": query_vector,
+            "query_filter": build_lead_filter(
+                industries=args.industries,
+                min_employees=args.min_employees,
+                max_employees=args.max_employees,
+                min_revenue_musd=args.min_revenue_musd,
+            ),
+            "score_threshold": settings.score_threshold,
+            "with_payload": True,
+            "limit": args.limit or settings.search_limit,
+            "offset": args.offset,
+        }
+
+    def search_leads(**kwargs) -> str:
+        try:
+            args = SearchLeadsInput(**kwargs)
+            query_vector = asyncio.run(embedding_service.get_text_embedding(args.query)).tolist()
+            search_result = client_provider.client.query_points(**query_kwargs(query_vector, args))
+            return _format_results(search_result)
+        except Exception as e:
+            return _format_error(e)
+
+    async def asearch_leads(**kwargs) -> str:
         try:
-            async def get_embedding():
-                response = await embedding_service.client.embeddings.create(
-                    input=[query],
-                    model=embedding_service.model,
-                    dimensions=embedding_service.dimensions,
-                )
-                return response.data[0].embedding
-            
-            query_vector = asyncio.run(get_embedding())
-            
-            search_result = client.query_points(
-                collection_name=settings.collection_name,
-                query=query_vector,
-                with_payload=True,
-                limit=10,
+            args = SearchLeadsInput(**kwargs)
+            query_vector = (await embedding_service.get_text_embedding(args.query)).tolist()
+            search_result = await client_provider.async_client.query_points(
+                **query_kwargs(query_vector, args)
             )
-            
-            if not search_result.points:
-                return json.dumps({
-                    "status": "success",
-                    "message": "No leads found.",
-                    "results": []
-                })
-            
-            results = [point.payload for point in search_result.points]
-            
-            return json.dumps({
-                "status": "success",
-                "message": f"Found {len(results)} lead(s).",
-                "results": results
-            }, indent=2)
-            
+            return _format_results(search_result)
         except Exception as e:
-            return json.dumps({
-                "status": "error",
-                "message": f"Error searching leads: {str(e)}"
-            })
-    
-    return Tool(
+            return _format_error(e)
+
+    return StructuredTool.from_function(
+        func=search_leads,
+        coroutine=asearch_leads,
         name="search_leads",
         description=(
             "Search for leads in the vector database using semantic search. "
-            "Just provide a text query like 'Fintech companies' or 'software companies with high revenue'. "
+            "Provide a text query like 'Fintech companies' or 'software companies with high revenue', "
+            "and optionally narrow it with industries, an employee range or a minimum revenue. "
+            "Use offset to page through more results. "
             "Returns similar companies based on the query."
         ),
-        func=search_leads,
+        args_schema=SearchLeadsInput,
     )
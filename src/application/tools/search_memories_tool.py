@@ -5,6 +5,20 @@ import json
 def create_search_memories_tool(mem0_service: Mem0Service, user_id: str) -> Tool:
     """Create search memories tool for long-term memory retrieval."""
     
+    def format_memories(memories: list[dict]) -> str:
+        if not memories:
+            return "No relevant memories found."
+        
+        filtered_results = [
+            {
+                "id": memory.get("id"),
+                "memory": memory.get("memory")
+            }
+            for memory in memories
+        ]
+
+        return json.dumps(filtered_results, indent=2)
+
     def search_memories(query: str) -> str:
         """
         Search long-term memory for relevant past interactions, user preferences,
@@ -17,19 +31,15 @@ def create_search_memories_tool(mem0_service: Mem0Service, user_id: str) -> Tool
         user_id=user_id,
         limit=5
          )
-        
-        if not memories:
-            return "No relevant memories found."
-        
-        filtered_results = [
-            {
-                "id": memory.get("id"),
-                "memory": memory.get("memory")
-            }
-            for memory in memories
-        ]
+        return format_memories(memories)
 
-        return json.dumps(filtered_results, indent=2)
+    async def asearch_memories(query: str) -> str:
+        memories = await mem0_service.asearch_memories(
+            query=query,
+            user_id=user_id,
+            limit=5,
+        )
+        return format_memories(memories)
     
     return Tool(
         name="search_memories",
@@ -39,4 +49,5 @@ def create_search_memories_tool(mem0_service: Mem0Service, user_id: str) -> Tool
             "previous conversations."
         ),
         func=search_memories,
+        coroutine=asearch_memories,
     )
\ No newline at end of file
@@ -13,5 +13,6 @@ def create_search_tool(search_service: WebSearchService) -> Tool:
             "Use this when you need more context about a lead company."
         ),
         func=search_service.search,
+        coroutine=search_service.asearch,
     )
 
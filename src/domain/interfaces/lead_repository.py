@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from src.application.schema.lead import Lead, LeadCompleted
 
@@ -74,4 +74,72 @@ class LeadRepository(ABC):
         Returns:
             bool: True if the lead was deleted successfully, False otherwise
         """
-        pass
\ No newline at end of file
+        pass
+
+    @abstractmethod
+    async def store_leads(self, leads: List[Lead | LeadCompleted]) -> List[str]:
+        """
+        Store many leads in the repository.
+
+        Args:
+            leads: The leads to store
+
+        Returns:
+            List[str]: The IDs of the stored leads, in input order
+        """
+        pass
+
+    @abstractmethod
+    async def get_leads(self, lead_ids: List[str]) -> Dict[str, Lead | LeadCompleted]:
+        """
+        Retrieve many leads by their IDs.
+
+        Args:
+            lead_ids: The IDs of the leads to retrieve
+
+        Returns:
+            Dict[str, Lead | LeadCompleted]: Found leads by ID; missing IDs are omitted
+        """
+        pass
+
+    @abstractmethod
+    async def upsert_leads(self, leads: Dict[str, Lead | LeadCompleted]) -> bool:
+        """
+        Insert or replace many leads under the given IDs.
+
+        Args:
+            leads: Leads keyed by the ID to store them under
+
+        Returns:
+            bool: True if all leads were written successfully, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    async def delete_leads(self, lead_ids: List[str]) -> bool:
+        """
+        Delete many leads from the repository.
+
+        Args:
+            lead_ids: The IDs of the leads to delete
+
+        Returns:
+            bool: True if the leads were deleted successfully, False otherwise
+        """
+        pass
+
+    @abstractmethod
+    def iter_leads(
+        self, filter: Optional[Dict[str, Any]] = None, page_size: int = 100
+    ) -> AsyncIterator[tuple[str, Lead | LeadCompleted]]:
+        """
+        Iterate over stored leads page by page.
+
+        Args:
+            filter: Optional exact-match conditions on lead fields, e.g. {"industry": "fintech"}
+            page_size: Number of leads fetched per round-trip
+
+        Returns:
+            AsyncIterator[tuple[str, Lead | LeadCompleted]]: (lead ID, lead) pairs
+        """
+        pass
@@ -0,0 +1,205 @@
+"""
+Rule-based ICP screening evaluated over columnar lead batches.
+
+An IdealCustomerProfile is compiled once into a list of predicates. Each predicate
+evaluates the columns of a whole LeadBatch at once and returns a boolean mask, so
+screening hundreds of candidates is a handful of NumPy operations rather than a
+Python loop per lead.
+"""
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from src.application.schema.icp import IdealCustomerProfile
+from src.application.schema.lead_batch import LeadBatch
+
+
+def _normalized_column(batch: LeadBatch, name: str) -> np.ndarray:
+    """Lowercase a dictionary-encoded column once per distinct value ("" when unknown)."""
+    codes, table = batch.categories(name)
+    normalized = np.array([value.strip().lower() for value in table] + [""], dtype=str)
+    # Code -1 (None) indexes the trailing ""
+    return normalized[codes]
+
+
+@dataclass
+class ScreeningColumns:
+    """Columnar view of the fields the screener needs."""
+
+    industry: np.ndarray  # lowercased str
+    employee_count: np.ndarray  # int64
+    revenue_musd: np.ndarray  # float64
+    region: np.ndarray  # lowercased str, "" when unknown
+
+    @classmethod
+    def from_batch(cls, batch: LeadBatch) -> "ScreeningColumns":
+        return cls(
+            industry=_normalized_column(batch, "industry"),
+            employee_count=batch.column("employee_count"),
+            revenue_musd=batch.column("revenue_musd"),
+            region=_normalized_column(batch, "region"),
+        )
+
+    def __len__(self) -> int:
+        return len(self.industry)
+
+
+@dataclass(frozen=True)
+class Predicate:
+    """A named rule; evaluate returns True for the leads that pass."""
+
+    reason: str
+    evaluate: Callable[[ScreeningColumns], np.ndarray]
+
+
+@dataclass
+class ScreeningResult:
+    """Outcome of screening a batch."""
+
+    passed: np.ndarray  # bool mask
+    reasons: List[List[str]]  # rejection reasons per lead, empty when passed
+
+
+# Words that carry no meaning on their own when matching industries and regions
+_STOPWORDS = frozenset({"a", "an", "and", "&", "of", "the", "for", "in", "or", "to"})
+# Generic words that only count when a value has nothing more specific,
+# so "IT Services" does not match "Professional Services"
+_QUALIFIERS = frozenset({
+    "b2b", "b2c", "services", "service", "solutions", "technology", "technologies",
+    "tech", "industry", "industries", "company", "companies", "group",
+    "north", "south", "east", "west", "central", "united", "new", "republic",
+})
+# Multi-word and dotted spellings folded into one token before splitting
+_PHRASE_ALIASES = [
+    (re.compile(r"(?<!\w)(?:united states of america|united states|u\.s\.a\.?|u\.s\.?)(?!\w)"),
+     "united_states"),
+    (re.compile(r"(?<!\w)(?:united kingdom|great britain)(?!\w)"), "united_kingdom"),
+    (re.compile(r"(?<!\w)supply chain(?!\w)"), "logistics"),
+]
+# Single-word synonyms mapped to one canonical token
+_TOKEN_ALIASES = {
+    "usa": "united_states",
+    "us": "united_states",
+    "uk": "united_kingdom",
+    "saas": "software",
+    "fintech": "finance",
+    "financial": "finance",
+    "healthtech": "healthcare",
+    "health": "healthcare",
+    "medtech": "healthcare",
+    "e-commerce": "ecommerce",
+    "utility": "utilities",
+}
+_TOKEN = re.compile(r"[\w+#]+(?:[-.'][\w+#]+)*")
+
+
+def _tokens(text: str) -> frozenset:
+    """Normalized significant tokens of an industry or region value."""
+    text = text.lower()
+    for pattern, canonical in _PHRASE_ALIASES:
+        text = pattern.sub(canonical, text)
+    words = {
+        _TOKEN_ALIASES.get(word, word)
+        for word in _TOKEN.findall(text)
+        if word not in _STOPWORDS
+    }
+    significant = words - _QUALIFIERS
+    return frozenset(significant or words)
+
+
+def _term_tokens(terms: List[str]) -> frozenset:
+    """Union of the tokens of every ICP term (empty when there are no terms)."""
+    return frozenset().union(*(_tokens(term) for term in terms))
+
+
+def _matches_any(values: np.ndarray, tokens: frozenset) -> np.ndarray:
+    """True where a lowercased value shares a significant token with the ICP terms.
+
+    Matching is symmetric and synonym-aware: "B2B SaaS" matches "SaaS B2B", "Logistics"
+    matches "Logistics & Supply Chain" and "USA" matches "United States", while "AI"
+    does not match "Retail". Each distinct value is tokenized once.
+    """
+    if not tokens or len(values) == 0:
+        return np.zeros(len(values), dtype=bool)
+    distinct, inverse = np.unique(values, return_inverse=True)
+    matched = np.array([not tokens.isdisjoint(_tokens(value)) for value in distinct], dtype=bool)
+    return matched[inverse]
+
+
+class ICPScreener:
+    """Compiled set of ICP predicates."""
+
+    def __init__(self, predicates: List[Predicate]):
+        self.predicates = predicates
+
+    @classmethod
+    def from_icp(cls, icp: Optional[IdealCustomerProfile]) -> "ICPScreener":
+        """Compile an ICP into predicates. Without an ICP only sanity checks apply."""
+        predicates = [
+            Predicate("negative employee count", lambda b: b.employee_count >= 0),
+            Predicate("negative revenue", lambda b: b.revenue_musd >= 0),
+        ]
+        if icp is None:
+            return cls(predicates)
+
+        if icp.industries_allowed:
+            allowed = _term_tokens(icp.industries_allowed)
+            predicates.append(
+                Predicate("industry not in ICP", lambda b: _matches_any(b.industry, allowed))
+            )
+        if icp.industries_blocked:
+            blocked = _term_tokens(icp.industries_blocked)
+            predicates.append(
+                Predicate("industry blocked by ICP", lambda b: ~_matches_any(b.industry, blocked))
+            )
+        if icp.employee_min is not None:
+            employee_min = icp.employee_min
+            predicates.append(
+                Predicate(
+                    f"fewer than {employee_min} employees",
+                    lambda b: b.employee_count >= employee_min,
+                )
+            )
+        if icp.employee_max is not None:
+            employee_max = icp.employee_max
+            predicates.append(
+                Predicate(
+                    f"more than {employee_max} employees",
+                    lambda b: b.employee_count <= employee_max,
+                )
+            )
+        # Leads with an unknown region are not rejected on region rules
+        if icp.regions_allowed:
+            regions = _term_tokens(icp.regions_allowed)
+            predicates.append(
+                Predicate(
+                    "region not in ICP",
+                    lambda b: (np.char.str_len(b.region) == 0) | _matches_any(b.region, regions),
+                )
+            )
+        if icp.regions_blocked:
+            regions_blocked = _term_tokens(icp.regions_blocked)
+            predicates.append(
+                Predicate("region blocked by ICP", lambda b: ~_matches_any(b.region, regions_blocked))
+            )
+
+        return cls(predicates)
+
+    def evaluate(self, batch: LeadBatch) -> ScreeningResult:
+        """Evaluate every predicate over the batch."""
+        columns = ScreeningColumns.from_batch(batch)
+        n = len(columns)
+        if n == 0 or not self.predicates:
+            return ScreeningResult(passed=np.ones(n, dtype=bool), reasons=[[] for _ in range(n)])
+
+        # (predicates, leads) matrix of passes
+        masks = np.stack([predicate.evaluate(columns) for predicate in self.predicates])
+        passed = masks.all(axis=0)
+
+        reasons: List[List[str]] = [[] for _ in range(n)]
+        for predicate_index, lead_index in zip(*np.nonzero(~masks)):
+            reasons[lead_index].append(self.predicates[predicate_index].reason)
+
+        return ScreeningResult(passed=passed, reasons=reasons)
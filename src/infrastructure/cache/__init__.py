@@ -0,0 +1,3 @@
+"""
+In-process caching primitives shared by infrastructure services.
+"""
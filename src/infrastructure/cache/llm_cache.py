@@ -0,0 +1,457 @@
+"""
+Response cache for deterministic structured-output LLM calls.
+
+Passed to ChatOpenAI(cache=...), it is consulted by LangChain before every request.
+Only calls that produce structured output (with_structured_output, or tools with a
+forced tool_choice) are cached; free-form chat and agent tool-calling turns always
+reach the model. Entries are keyed by the model parameters, a hash of the output
+schema and a hash of the prompt, and live in SQLite, Redis or process memory with a
+TTL. An optional semantic tier serves near-identical prompts for the same model and
+schema above a cosine similarity threshold.
+"""
+import asyncio
+import contextlib
+import contextvars
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+from pydantic import BaseModel
+
+from src.infrastructure.cache.lru_cache import CacheStats, LRUCache
+
+# Markers LangChain puts in llm_string when the call must return a fixed schema
+_STRUCTURED_MARKERS = ("('response_format',", "('tool_choice',")
+
+# "<class 'src.application.schema.icp.IdealCustomerProfile'>" inside llm_string
+_CLASS_REPR = re.compile(r"<class '([\w.]+)'>")
+
+_bypass: contextvars.ContextVar[bool] = contextvars.ContextVar("llm_cache_bypass", default=False)
+
+
+@contextlib.contextmanager
+def bypass_llm_cache() -> Iterator[None]:
+    """Skip cache lookups for LLM calls made inside this block.
+
+    Responses are still written, so the fresh answer replaces the cached one.
+    """
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+@dataclass
+class LLMCacheSettings:
+    """Configuration for the LLM response cache."""
+
+    # "sqlite", "redis", "memory" or "none"
+    backend: str = os.getenv("LLM_CACHE_BACKEND", "sqlite")
+    ttl_seconds: float = float(os.getenv("LLM_CACHE_TTL", "604800"))  # 0 disables expiry
+    max_entries: int = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+    sqlite_path: str = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+    redis_uri: Optional[str] = os.getenv("LLM_CACHE_REDIS_URI", os.getenv("REDIS_URI"))
+
+    # Cosine similarity above which a different prompt may reuse a response.
+    # 0 disables the semantic tier: prompts differing only in a company name embed
+    # very closely, so only enable it with a threshold near 1.
+    semantic_threshold: float = float(os.getenv("LLM_CACHE_SEMANTIC_THRESHOLD", "0"))
+
+    @classmethod
+    def from_env(cls) -> "LLMCacheSettings":
+        """Create settings from environment variables."""
+        return cls()
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _schema_fingerprint(match: re.Match) -> str:
+    """Replace a schema class repr with a hash of its JSON schema.
+
+    The class name alone would keep serving stale entries after a field is added.
+    """
+    path = match.group(1)
+    module_name, _, name = path.rpartition(".")
+    schema_cls = getattr(sys.modules.get(module_name), name, None)
+    if isinstance(schema_cls, type) and issubclass(schema_cls, BaseModel):
+        schema = json.dumps(schema_cls.model_json_schema(), sort_keys=True)
+        return f"<schema {path}:{_sha256(schema)[:16]}>"
+    return match.group(0)
+
+
+def _encode(return_val: RETURN_VAL_TYPE) -> str:
+    """Serialize generations, storing parsed structured output as plain dicts."""
+    generations = []
+    for generation in return_val:
+        parsed = None
+        if isinstance(generation, ChatGeneration):
+            parsed = generation.message.additional_kwargs.get("parsed")
+        if isinstance(parsed, BaseModel):
+            # ChatOpenAI rebuilds the schema object from a dict on the way out
+            message = generation.message.model_copy(
+                update={
+                    "additional_kwargs": {
+                        **generation.message.additional_kwargs,
+                        "parsed": parsed.model_dump(mode="json"),
+                    }
+                }
+            )
+            generation = ChatGeneration(
+                message=message, generation_info=generation.generation_info
+            )
+        generations.append(generation)
+    return dumps(generations)
+
+
+def _decode(raw: str | bytes) -> RETURN_VAL_TYPE:
+    # Only revive model outputs; a shared Redis entry must not construct anything else
+    return loads(
+        raw.decode("utf-8") if isinstance(raw, bytes) else raw,
+        allowed_objects=[ChatGeneration, AIMessage],
+    )
+
+
+class LLMCacheStore(ABC):
+    """Key/value storage for serialized LLM responses."""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored response, or None when missing or expired."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Store a response by key."""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every stored response."""
+        pass
+
+
+class InMemoryLLMCacheStore(LLMCacheStore):
+    """Process-local store, bounded by LRU eviction."""
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self._cache: LRUCache[str] = LRUCache(max_size=max_entries, ttl_seconds=ttl_seconds)
+
+    def get(self, key: str) -> Optional[str]:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self._cache.set(key, value)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class SQLiteLLMCacheStore(LLMCacheStore):
+    """Local SQLite store; evicts the least recently used rows above max_entries."""
+
+    def __init__(self, path: str, max_entries: int, ttl_seconds: Optional[float] = None):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL, last_used REAL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used)"
+            )
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        oldest = now - self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ? AND created_at > ?", (key, oldest)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_used = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if self.ttl_seconds:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE created_at <= ?", (now - self.ttl_seconds,)
+                )
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()
+            if count > self.max_entries:
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_used LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM llm_cache")
+
+
+class RedisLLMCacheStore(LLMCacheStore):
+    """Shared Redis store; entries expire after the TTL and Redis' maxmemory policy evicts."""
+
+    def __init__(self, redis_uri: str, ttl_seconds: Optional[float] = None):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_uri)
+        self.ttl_seconds = int(ttl_seconds) if ttl_seconds and ttl_seconds > 0 else None
+
+    def get(self, key: str) -> Optional[str]:
+        return self.client.get(key)
+
+    def set(self, key: str, value: str) -> None:
+        self.client.set(key, value, ex=self.ttl_seconds)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter("llm:*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class _SemanticIndex:
+    """Prompt embeddings of one model+schema scope, pointing at exact-match keys."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.keys: list[str] = []
+        self.vectors: list[np.ndarray] = []
+
+    def add(self, key: str, vector: np.ndarray) -> None:
+        if key in self.keys:
+            return
+        self.keys.append(key)
+        self.vectors.append(vector)
+        if len(self.keys) > self.max_entries:
+            del self.keys[0], self.vectors[0]
+
+    def nearest(self, vector: np.ndarray) -> tuple[Optional[str], float]:
+        if not self.keys:
+            return None, 0.0
+        scores = np.stack(self.vectors) @ vector
+        best = int(np.argmax(scores))
+        return self.keys[best], float(scores[best])
+
+
+class LLMResponseCache(BaseCache):
+    """LangChain cache for structured-output calls, with an optional semantic tier."""
+
+    def __init__(
+        self,
+        store: LLMCacheStore,
+        embedding_service=None,
+        semantic_threshold: float = 0.0,
+        max_semantic_entries: int = 1000,
+    ):
+        """
+        Args:
+            store: Exact-match storage backend
+            embedding_service: LeadEmbeddingService used by the semantic tier
+            semantic_threshold: Minimum cosine similarity for a semantic hit; 0 disables it
+            max_semantic_entries: Prompt embeddings kept per model+schema scope
+        """
+        self.store = store
+        self.embedding_service = embedding_service
+        self.semantic_threshold = semantic_threshold if embedding_service is not None else 0.0
+        self.max_semantic_entries = max_semantic_entries
+        self.stats = CacheStats()
+        self.semantic_hits = 0
+        self._scopes: dict[str, str] = {}
+        self._semantic: dict[str, _SemanticIndex] = {}
+        self._lock = threading.Lock()
+
+    # ---- keys -----------------------------------------------------------------
+
+    @staticmethod
+    def is_cacheable(llm_string: str) -> bool:
+        """True for calls whose output is constrained to a schema."""
+        return any(marker in llm_string for marker in _STRUCTURED_MARKERS)
+
+    def _scope(self, llm_string: str) -> str:
+        """Hash of the model parameters and output schema."""
+        scope = self._scopes.get(llm_string)
+        if scope is None:
+            scope = _sha256(_CLASS_REPR.sub(_schema_fingerprint, llm_string))[:16]
+            self._scopes[llm_string] = scope
+        return scope
+
+    def _key(self, prompt: str, llm_string: str) -> str:
+        return f"llm:{self._scope(llm_string)}:{_sha256(prompt)}"
+
+    # ---- semantic tier --------------------------------------------------------
+
+    async def _aembed(self, prompt: str) -> Optional[np.ndarray]:
+        try:
+            vector = np.asarray(
+                await self.embedding_service.get_text_embedding(prompt), dtype=np.float32
+            )
+        except Exception as e:
+            print(f"⚠ Could not embed prompt for the semantic LLM cache: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _embed(self, prompt: str) -> Optional[np.ndarray]:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._aembed(prompt))
+        # Sync lookup on a thread that runs a loop; can't block it to embed
+        return None
+
+    def _semantic_key(self, llm_string: str, vector: Optional[np.ndarray]) -> Optional[str]:
+        if vector is None:
+            return None
+        with self._lock:
+            index = self._semantic.get(self._scope(llm_string))
+            if index is None:
+                return None
+            key, score = index.nearest(vector)
+        return key if score >= self.semantic_threshold else None
+
+    def _remember(self, key: str, llm_string: str, vector: Optional[np.ndarray]) -> None:
+        if vector is None:
+            return
+        with self._lock:
+            scope = self._scope(llm_string)
+            index = self._semantic.setdefault(scope, _SemanticIndex(self.max_semantic_entries))
+            index.add(key, vector)
+
+    # ---- BaseCache ------------------------------------------------------------
+
+    def _get(self, key: str) -> Optional[RETURN_VAL_TYPE]:
+        try:
+            raw = self.store.get(key)
+            return _decode(raw) if raw is not None else None
+        except Exception as e:
+            print(f"⚠ LLM cache read failed: {e}")
+            return None
+
+    def _set(self, key: str, return_val: RETURN_VAL_TYPE) -> bool:
+        try:
+            self.store.set(key, _encode(return_val))
+            return True
+        except Exception as e:
+            print(f"⚠ LLM cache write failed: {e}")
+            return False
+
+    def _record(self, value: Optional[RETURN_VAL_TYPE], semantic: bool = False) -> None:
+        if value is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+            self.semantic_hits += semantic
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations for this prompt and model, if any."""
+        if _bypass.get() or not self.is_cacheable(llm_string):
+            return None
+
+        value = self._get(self._key(prompt, llm_string))
+        if value is None and self.semantic_threshold > 0:
+            key = self._semantic_key(llm_string, self._embed(prompt))
+            value = self._get(key) if key is not None else None
+            self._record(value, semantic=True)
+            return value
+        self._record(value)
+        return value
+
+    async def alookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Async lookup; the stores are local or fast, so they run in a worker thread."""
+        if _bypass.get() or not self.is_cacheable(llm_string):
+            return None
+
+        value = await asyncio.to_thread(self._get, self._key(prompt, llm_string))
+        if value is None and self.semantic_threshold > 0:
+            key = self._semantic_key(llm_string, await self._aembed(prompt))
+            value = await asyncio.to_thread(self._get, key) if key is not None else None
+            self._record(value, semantic=True)
+            return value
+        self._record(value)
+        return value
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations of a structured-output call."""
+        if not self.is_cacheable(llm_string):
+            return
+        key = self._key(prompt, llm_string)
+        if self._set(key, return_val) and self.semantic_threshold > 0:
+            self._remember(key, llm_string, self._embed(prompt))
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        """Async variant of update."""
+        if not self.is_cacheable(llm_string):
+            return
+        key = self._key(prompt, llm_string)
+        stored = await asyncio.to_thread(self._set, key, return_val)
+        if stored and self.semantic_threshold > 0:
+            self._remember(key, llm_string, await self._aembed(prompt))
+
+    def clear(self, **kwargs) -> None:
+        """Drop every cached response."""
+        self.store.clear()
+        with self._lock:
+            self._semantic.clear()
+
+    def stats_dict(self) -> dict:
+        """Return hit/miss counters, including hits served by the semantic tier."""
+        return {**self.stats.as_dict(), "semantic_hits": self.semantic_hits}
+
+
+def create_llm_cache(
+    settings: LLMCacheSettings, embedding_service=None
+) -> Optional[LLMResponseCache]:
+    """Build the LLM cache described by settings, or None when disabled."""
+    backend = settings.backend.lower()
+    ttl = settings.ttl_seconds
+
+    store: Optional[LLMCacheStore] = None
+    try:
+        if backend == "sqlite":
+            store = SQLiteLLMCacheStore(settings.sqlite_path, settings.max_entries, ttl)
+        elif backend == "redis" and settings.redis_uri:
+            store = RedisLLMCacheStore(settings.redis_uri, ttl)
+        elif backend == "memory":
+            store = InMemoryLLMCacheStore(settings.max_entries, ttl)
+    except Exception as e:
+        print(f"⚠ Could not initialize LLM cache ({backend}): {e}")
+
+    if store is None:
+        return None
+    return LLMResponseCache(
+        store,
+        embedding_service=embedding_service,
+        semantic_threshold=settings.semantic_threshold,
+    )
@@ -0,0 +1,92 @@
+"""
+Thread-safe LRU cache with per-entry TTL and hit/miss counters.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Dict, Generic, Hashable, Optional, TypeVar
+import time
+
+V = TypeVar("V")
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a plain dict (for logging/metrics)."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hit_rate, 4),
+        }
+
+
+class LRUCache(Generic[V]):
+    """Bounded LRU cache whose entries also expire after a TTL."""
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept before evicting the least recently used
+            ttl_seconds: Entry lifetime in seconds. None or <= 0 disables expiry.
+        """
+        self.max_size = max(1, max_size)
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Insert or refresh an entry, evicting the oldest ones if full."""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
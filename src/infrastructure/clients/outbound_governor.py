@@ -0,0 +1,670 @@
+"""
+Shared rate control for every outbound API call.
+
+OpenAI chat, OpenAI embeddings, Serper and mem0 each get a ProviderGovernor, and all
+callers in the process share it. Before each attempt, a call:
+- takes a request from the provider's requests/min bucket, and its estimated tokens
+  from the tokens/min bucket. Buckets run into debt instead of refusing, so callers
+  are queued in arrival order.
+- takes a slot from an AIMD concurrency limit. The limit grows by about one per
+  limit's worth of successes. It halves on a 429, and shrinks by 10% when latency
+  exceeds the provider's target.
+
+429s, 5xx responses and connection errors are retried with full-jitter exponential
+backoff, never shorter than the server's Retry-After. A 429 also pauses the
+provider's request bucket for that delay, so every other caller backs off with it
+instead of retrying in a storm. Each provider keeps counters for stats() and report().
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import httpx
+import openai
+import requests
+from aiohttp import ClientConnectionError, ServerTimeoutError
+from mem0.exceptions import NetworkError as Mem0NetworkError
+from mem0.exceptions import RateLimitError as Mem0RateLimitError
+
+T = TypeVar("T")
+
+OPENAI_CHAT = "openai_chat"
+OPENAI_EMBEDDINGS = "openai_embeddings"
+SERPER = "serper"
+MEM0 = "mem0"
+
+RATE_LIMITED_STATUS = 429
+RETRYABLE_STATUS = {408, 409, RATE_LIMITED_STATUS, 500, 502, 503, 504}
+
+_TRANSIENT_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    httpx.TransportError,
+    openai.APIConnectionError,
+    requests.ConnectionError,
+    requests.Timeout,
+    ClientConnectionError,
+    ServerTimeoutError,
+    Mem0NetworkError,
+)
+
+# Rough ratio used to estimate request tokens before the provider reports usage
+_CHARS_PER_TOKEN = 4
+
+# Completion tokens reserved for a chat request that sets no max_tokens
+_DEFAULT_COMPLETION_TOKENS = 512
+
+# How often async callers re-check for a free concurrency slot
+_POLL_SECONDS = 0.01
+
+
+@dataclass
+class ProviderLimits:
+    """Rate and concurrency limits for one provider. 0 disables a rate limit."""
+
+    requests_per_minute: float = 0.0
+    tokens_per_minute: float = 0.0
+    max_concurrency: int = 8
+    min_concurrency: int = 1
+    # Latency above which the concurrency limit shrinks. 0 ignores latency.
+    latency_target_seconds: float = 0.0
+
+
+def _provider_limits(
+    name: str, rpm: float, tpm: float, concurrency: int, latency_target: float
+) -> ProviderLimits:
+    """Limits for a provider, overridable with GOVERNOR_<NAME>_* variables."""
+    prefix = f"GOVERNOR_{name.upper()}"
+    return ProviderLimits(
+        requests_per_minute=float(os.getenv(f"{prefix}_RPM", str(rpm))),
+        tokens_per_minute=float(os.getenv(f"{prefix}_TPM", str(tpm))),
+        max_concurrency=int(os.getenv(f"{prefix}_CONCURRENCY", str(concurrency))),
+        latency_target_seconds=float(os.getenv(f"{prefix}_LATENCY_TARGET", str(latency_target))),
+    )
+
+
+def _default_providers() -> dict[str, ProviderLimits]:
+    return {
+        OPENAI_CHAT: _provider_limits(OPENAI_CHAT, 500, 200_000, 16, 30.0),
+        OPENAI_EMBEDDINGS: _provider_limits(OPENAI_EMBEDDINGS, 3000, 1_000_000, 8, 10.0),
+        SERPER: _provider_limits(SERPER, 300, 0, 8, 10.0),
+        MEM0: _provider_limits(MEM0, 120, 0, 4, 10.0),
+    }
+
+
+@dataclass
+class GovernorSettings:
+    """Outbound call governor configuration."""
+
+    enabled: bool = os.getenv("GOVERNOR_ENABLED", "true").lower() == "true"
+    max_retries: int = int(os.getenv("GOVERNOR_MAX_RETRIES", "4"))
+    backoff_base_seconds: float = float(os.getenv("GOVERNOR_BACKOFF_BASE", "0.5"))
+    backoff_max_seconds: float = float(os.getenv("GOVERNOR_BACKOFF_MAX", "30"))
+    # Seconds of rate a bucket can accumulate and spend as a burst
+    burst_seconds: float = float(os.getenv("GOVERNOR_BURST_SECONDS", "1"))
+    # Longest a call waits for a concurrency slot before failing with TimeoutError
+    acquire_timeout_seconds: float = float(os.getenv("GOVERNOR_ACQUIRE_TIMEOUT", "120"))
+    providers: dict[str, ProviderLimits] = field(default_factory=_default_providers)
+
+    @classmethod
+    def from_env(cls) -> "GovernorSettings":
+        """Create settings from environment variables."""
+        return cls()
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out delays instead of blocking.
+
+    A reservation is always granted. The caller gets back how long to wait before
+    using it. Because the balance can go negative, later callers wait behind earlier
+    ones, and one request larger than the bucket is delayed rather than refused.
+    """
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount from the bucket and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self._tokens -= amount
+            deficit_wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(deficit_wait, self._paused_until - now)
+
+    def adjust(self, amount: float) -> None:
+        """Return (positive) or charge (negative) tokens once the real cost is known."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self.capacity, self._tokens + amount)
+
+    def pause(self, seconds: float) -> None:
+        """Make every reservation wait at least this long from now."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+class AdaptiveConcurrencyLimit:
+    """AIMD concurrency limit shared by sync and async callers."""
+
+    def __init__(
+        self,
+        maximum: int,
+        minimum: int = 1,
+        latency_target_seconds: float = 0.0,
+        decrease_factor: float = 0.5,
+        latency_decrease_factor: float = 0.9,
+        cooldown_seconds: float = 1.0,
+    ):
+        """
+        Args:
+            maximum: Upper bound, and the starting limit
+            minimum: Lower bound the limit never shrinks below
+            latency_target_seconds: Latency above which the limit shrinks. 0 ignores latency.
+            decrease_factor: Multiplier applied on overload (429)
+            latency_decrease_factor: Multiplier applied on slow responses
+            cooldown_seconds: Minimum time between two decreases. Calls already in
+                flight when the provider pushes back then count as one signal.
+        """
+        self.maximum = max(1, maximum)
+        self.minimum = max(1, min(minimum, self.maximum))
+        self.latency_target_seconds = latency_target_seconds
+        self.decrease_factor = decrease_factor
+        self.latency_decrease_factor = latency_decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+
+        self.limit = float(self.maximum)
+        self.in_flight = 0
+        self._last_decrease = float("-inf")
+        self._condition = threading.Condition()
+
+    def try_acquire(self) -> bool:
+        with self._condition:
+            if self.in_flight < int(self.limit):
+                self.in_flight += 1
+                return True
+            return False
+
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """Take a slot, raising TimeoutError if none frees up within timeout seconds."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No concurrency slot free after {timeout}s")
+                self._condition.wait(remaining)
+            self.in_flight += 1
+
+    async def aacquire(self, timeout: Optional[float] = None) -> None:
+        """Async variant of acquire."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        # Polling keeps one limit usable from threads and from any event loop
+        while not self.try_acquire():
+            if deadline is not None and time.monotonic() >= deadline:
+                raise TimeoutError(f"No concurrency slot free after {timeout}s")
+            await asyncio.sleep(_POLL_SECONDS)
+
+    def _decrease(self, factor: float) -> None:
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown_seconds:
+            return
+        self._last_decrease = now
+        self.limit = max(float(self.minimum), self.limit * factor)
+
+    def release(self, latency: float, overloaded: bool = False) -> None:
+        """Free a slot and adapt the limit to the call's outcome."""
+        with self._condition:
+            self.in_flight -= 1
+            if overloaded:
+                self._decrease(self.decrease_factor)
+            elif self.latency_target_seconds and latency > self.latency_target_seconds:
+                self._decrease(self.latency_decrease_factor)
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            self._condition.notify_all()
+
+    def abandon(self) -> None:
+        """Free a slot whose call was cancelled, without adapting the limit."""
+        with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+
+@dataclass
+class ProviderMetrics:
+    """Outbound call counters for one provider."""
+
+    attempts: int = 0
+    successes: int = 0
+    failures: int = 0
+    rate_limited: int = 0
+    retries: int = 0
+    cancelled: int = 0
+    tokens: int = 0
+    wait_seconds: float = 0.0
+    latency_seconds: float = 0.0
+    max_latency_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a plain dict (for logging/metrics)."""
+        completed = self.successes + self.failures
+        return {
+            "attempts": self.attempts,
+            "successes": self.successes,
+            "failures": self.failures,
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "cancelled": self.cancelled,
+            "tokens": self.tokens,
+            "wait_seconds": round(self.wait_seconds, 3),
+            "avg_latency_seconds": round(self.latency_seconds / completed, 3) if completed else 0.0,
+            "max_latency_seconds": round(self.max_latency_seconds, 3),
+        }
+
+
+class RetryableResponse(Exception):
+    """An HTTP response the governor should retry, raised by the governed transports."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+def _status(error: BaseException) -> Optional[int]:
+    if isinstance(error, Mem0RateLimitError):
+        return RATE_LIMITED_STATUS
+    for candidate in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "status"):
+            value = getattr(candidate, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    """Server-requested delay, from Retry-After headers or mem0's debug info."""
+    debug_info = getattr(error, "debug_info", None)
+    if isinstance(debug_info, dict) and debug_info.get("retry_after") is not None:
+        try:
+            return float(debug_info["retry_after"])
+        except (TypeError, ValueError):
+            return None
+
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(
+        error, "headers", None
+    )
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        # HTTP-date form; fall back to our own backoff
+        return None
+    return None
+
+
+class ProviderGovernor:
+    """Rate buckets, concurrency limit, retries and metrics for one provider."""
+
+    def __init__(self, name: str, limits: ProviderLimits, settings: GovernorSettings):
+        self.name = name
+        self.limits = limits
+        self.settings = settings
+
+        self.requests = self._bucket(limits.requests_per_minute)
+        self.tokens = self._bucket(limits.tokens_per_minute)
+        self.concurrency = AdaptiveConcurrencyLimit(
+            maximum=limits.max_concurrency,
+            minimum=limits.min_concurrency,
+            latency_target_seconds=limits.latency_target_seconds,
+        )
+        self.metrics = ProviderMetrics()
+        self._lock = threading.Lock()
+
+    def _bucket(self, per_minute: float) -> Optional[TokenBucket]:
+        if per_minute <= 0:
+            return None
+        rate = per_minute / 60
+        return TokenBucket(rate, rate * self.settings.burst_seconds)
+
+    def _reserve(self, tokens: int) -> float:
+        wait = self.requests.reserve(1) if self.requests is not None else 0.0
+        if self.tokens is not None and tokens:
+            wait = max(wait, self.tokens.reserve(tokens))
+        with self._lock:
+            self.metrics.attempts += 1
+            self.metrics.wait_seconds += wait
+        return wait
+
+    def _should_retry(self, error: BaseException, attempt: int) -> tuple[bool, bool]:
+        """(retry, rate limited) for a failed attempt."""
+        status = _status(error)
+        rate_limited = status == RATE_LIMITED_STATUS
+        retryable = (status in RETRYABLE_STATUS) or (
+            status is None and isinstance(error, _TRANSIENT_ERRORS)
+        )
+        return retryable and attempt < self.settings.max_retries, rate_limited
+
+    def _backoff(self, error: BaseException, attempt: int, rate_limited: bool) -> float:
+        ceiling = min(
+            self.settings.backoff_max_seconds, self.settings.backoff_base_seconds * 2**attempt
+        )
+        delay = random.uniform(0, ceiling)
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.settings.backoff_max_seconds))
+        if rate_limited and self.requests is not None:
+            self.requests.pause(delay)
+        return delay
+
+    def _record(self, latency: float, error: Optional[BaseException], rate_limited: bool, retried: bool) -> None:
+        with self._lock:
+            self.metrics.latency_seconds += latency
+            self.metrics.max_latency_seconds = max(self.metrics.max_latency_seconds, latency)
+            if rate_limited:
+                self.metrics.rate_limited += 1
+            if retried:
+                self.metrics.retries += 1
+            elif error is not None:
+                self.metrics.failures += 1
+            else:
+                self.metrics.successes += 1
+
+    def _abandon(self) -> None:
+        """Free the slot of a cancelled or interrupted call."""
+        self.concurrency.abandon()
+        with self._lock:
+            self.metrics.cancelled += 1
+
+    def _settle_tokens(self, estimate: int, actual: Optional[int]) -> None:
+        used = actual if actual is not None else estimate
+        with self._lock:
+            self.metrics.tokens += used
+        if self.tokens is not None and actual is not None:
+            self.tokens.adjust(estimate - actual)
+
+    def call(
+        self,
+        func: Callable[..., T],
+        *args: Any,
+        tokens: int = 0,
+        usage: Optional[Callable[[T], Optional[int]]] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Run func under this provider's limits, retrying transient failures.
+
+        Args:
+            func: The upstream call
+            tokens: Estimated tokens the call consumes (for the tokens/min bucket)
+            usage: Reads the actual token count from the result, if the provider reports it
+        """
+        attempt = 0
+        while True:
+            wait = self._reserve(tokens)
+            if wait:
+                time.sleep(wait)
+            self.concurrency.acquire(self.settings.acquire_timeout_seconds)
+            start = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                error = e
+            except BaseException:
+                self._abandon()
+                raise
+            else:
+                error = None
+            latency = time.monotonic() - start
+
+            if error is None:
+                self.concurrency.release(latency)
+                self._record(latency, None, False, False)
+                self._settle_tokens(tokens, usage(result) if usage else None)
+                return result
+
+            retry, rate_limited = self._should_retry(error, attempt)
+            self.concurrency.release(latency, overloaded=rate_limited)
+            self._record(latency, error, rate_limited, retry)
+            if not retry:
+                raise error
+            delay = self._backoff(error, attempt, rate_limited)
+            if isinstance(error, RetryableResponse):
+                error.response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    async def acall(
+        self,
+        func: Callable[..., Awaitable[T]],
+        *args: Any,
+        tokens: int = 0,
+        usage: Optional[Callable[[T], Optional[int]]] = None,
+        **kwargs: Any,
+    ) -> T:
+        """Async variant of call; func returns an awaitable."""
+        attempt = 0
+        while True:
+            wait = self._reserve(tokens)
+            if wait:
+                await asyncio.sleep(wait)
+            await self.concurrency.aacquire(self.settings.acquire_timeout_seconds)
+            start = time.monotonic()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                error = e
+            except BaseException:
+                self._abandon()
+                raise
+            else:
+                error = None
+            latency = time.monotonic() - start
+
+            if error is None:
+                self.concurrency.release(latency)
+                self._record(latency, None, False, False)
+                self._settle_tokens(tokens, usage(result) if usage else None)
+                return result
+
+            retry, rate_limited = self._should_retry(error, attempt)
+            self.concurrency.release(latency, overloaded=rate_limited)
+            self._record(latency, error, rate_limited, retry)
+            if not retry:
+                raise error
+            delay = self._backoff(error, attempt, rate_limited)
+            if isinstance(error, RetryableResponse):
+                await error.response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            metrics = self.metrics.as_dict()
+        return {
+            **metrics,
+            "concurrency_limit": round(self.concurrency.limit, 2),
+            "in_flight": self.concurrency.in_flight,
+        }
+
+
+def estimate_text_tokens(*texts: str) -> int:
+    """Cheap token estimate used to reserve tokens/min budget before a call."""
+    return sum(-(-len(text) // _CHARS_PER_TOKEN) for text in texts if text)
+
+
+def _estimate_request_tokens(request: httpx.Request) -> int:
+    """Prompt estimate plus the completion budget an OpenAI request asks for."""
+    try:
+        body = json.loads(request.content)
+    except (ValueError, httpx.RequestNotRead):
+        return 0
+    if not isinstance(body, dict):
+        return 0
+    completion = (
+        body.get("max_completion_tokens") or body.get("max_tokens") or _DEFAULT_COMPLETION_TOKENS
+    )
+    return len(request.content) // _CHARS_PER_TOKEN + completion
+
+
+def _is_stream(request: httpx.Request) -> bool:
+    return b'"stream":true' in request.content.replace(b" ", b"")
+
+
+def _response_usage(response: httpx.Response) -> Optional[int]:
+    try:
+        return json.loads(response.content)["usage"]["total_tokens"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class GovernedTransport(httpx.BaseTransport):
+    """httpx transport that sends every request through a ProviderGovernor.
+
+    Retryable status codes are retried here. The last response is returned as-is,
+    so the client library still raises its usual errors. Give the client max_retries=0
+    so it does not retry on top of the governor.
+    """
+
+    def __init__(self, governor: ProviderGovernor, transport: Optional[httpx.BaseTransport] = None):
+        self.governor = governor
+        self.transport = transport or httpx.HTTPTransport()
+
+    def _send(self, request: httpx.Request) -> httpx.Response:
+        response = self.transport.handle_request(request)
+        if response.status_code in RETRYABLE_STATUS:
+            raise RetryableResponse(response)
+        # Read non-streamed bodies here so their token usage can settle the bucket
+        if not _is_stream(request):
+            response.read()
+        return response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            return self.governor.call(
+                self._send,
+                request,
+                tokens=_estimate_request_tokens(request),
+                usage=_response_usage,
+            )
+        except RetryableResponse as e:
+            return e.response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class AsyncGovernedTransport(httpx.AsyncBaseTransport):
+    """Async variant of GovernedTransport."""
+
+    def __init__(
+        self, governor: ProviderGovernor, transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.governor = governor
+        self.transport = transport or httpx.AsyncHTTPTransport()
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        response = await self.transport.handle_async_request(request)
+        if response.status_code in RETRYABLE_STATUS:
+            raise RetryableResponse(response)
+        if not _is_stream(request):
+            await response.aread()
+        return response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        try:
+            return await self.governor.acall(
+                self._send,
+                request,
+                tokens=_estimate_request_tokens(request),
+                usage=_response_usage,
+            )
+        except RetryableResponse as e:
+            return e.response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+class OutboundGovernor:
+    """Process-wide registry of provider governors."""
+
+    def __init__(self, settings: Optional[GovernorSettings] = None):
+        self.settings = settings or GovernorSettings.from_env()
+        self._providers: dict[str, ProviderGovernor] = {}
+        self._lock = threading.Lock()
+
+    def provider(self, name: str) -> ProviderGovernor:
+        """Governor for a provider; unknown providers get default limits."""
+        with self._lock:
+            governor = self._providers.get(name)
+            if governor is None:
+                limits = self.settings.providers.get(name) or ProviderLimits()
+                governor = ProviderGovernor(name, limits, self.settings)
+                self._providers[name] = governor
+            return governor
+
+    def call(self, provider: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a sync upstream call under a provider's limits. See ProviderGovernor.call."""
+        return self.provider(provider).call(func, *args, **kwargs)
+
+    async def acall(
+        self, provider: str, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> T:
+        """Run an async upstream call under a provider's limits."""
+        return await self.provider(provider).acall(func, *args, **kwargs)
+
+    def http_client(self, provider: str) -> httpx.Client:
+        """httpx client whose requests go through a provider's governor."""
+        return httpx.Client(transport=GovernedTransport(self.provider(provider)))
+
+    def http_async_client(self, provider: str) -> httpx.AsyncClient:
+        """Async httpx client whose requests go through a provider's governor."""
+        return httpx.AsyncClient(transport=AsyncGovernedTransport(self.provider(provider)))
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-provider counters and current concurrency limits."""
+        with self._lock:
+            providers = dict(self._providers)
+        return {name: governor.stats() for name, governor in providers.items()}
+
+    def report(self) -> str:
+        """One line per provider with the counters that matter when tuning limits."""
+        return ", ".join(
+            f"{name} {s['successes']} ok / {s['failures']} failed, {s['rate_limited']} rate limited, "
+            f"{s['retries']} retries, {s['wait_seconds']}s throttled, limit {s['concurrency_limit']}"
+            for name, s in self.stats().items()
+        )
+
+
+_governor: Optional[OutboundGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_outbound_governor() -> Optional[OutboundGovernor]:
+    """Return the process-wide governor, or None when GOVERNOR_ENABLED=false."""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            settings = GovernorSettings.from_env()
+            if not settings.enabled:
+                return None
+            _governor = OutboundGovernor(settings)
+        return _governor
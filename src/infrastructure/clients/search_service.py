@@ -1,13 +1,235 @@
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Hashable, Mapping, Optional, Sequence, TypeVar
+
 from langchain_community.utilities import GoogleSerperAPIWrapper
 
+from ..cache.lru_cache import LRUCache
+from .outbound_governor import SERPER, OutboundGovernor
+
+K = TypeVar("K", bound=Hashable)
+
+# One targeted query per missing lead field, in this order
+FIELD_QUERIES = {
+    "website": "{company} official website",
+    "last_year_profit": "{company} net income last fiscal year",
+    "last_quarter_ebitda": "{company} EBITDA last quarter",
+    "stock_variation_3m": "{company} stock price change last 3 months",
+    "contacts": "{company} executive team contact email phone",
+}
+
+
+# Heads each query's results in a batch result, so readers know which field they are for
+SECTION_HEADER = "### {field}: {query}"
+
+
+def build_field_queries(company: str, missing_fields: Sequence[str]) -> dict[str, str]:
+    """Deterministic search queries for a company's missing fields, by field."""
+    missing = set(missing_fields)
+    return {
+        field: template.format(company=company)
+        for field, template in FIELD_QUERIES.items()
+        if field in missing
+    }
+
+
 class WebSearchService:
-    """Service for searching the web."""
+    """Service for searching the web.
 
-    def __init__(self, api_key: str):
-        """Initialize the web search service."""
+    Results are cached by normalized query, and concurrent identical queries share a
+    single upstream Serper call. Upstream calls go through the outbound governor, and
+    batch searches run many lead queries concurrently.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        cache_ttl_seconds: float = 3600.0,
+        cache_max_size: int = 1024,
+        max_concurrency: int = 8,
+        governor: Optional[OutboundGovernor] = None,
+        coalesce_timeout_seconds: float = 60.0,
+    ):
+        """Initialize the web search service.
+
+        Args:
+            api_key: Serper API key
+            cache_ttl_seconds: How long a search result is reused. 0 disables expiry.
+            cache_max_size: Maximum number of cached queries
+            max_concurrency: Upstream queries a batch search runs at once
+            governor: Outbound call governor that rate limits and retries Serper calls
+            coalesce_timeout_seconds: Longest a caller waits on an identical in-flight query
+        """
         self.api_key = api_key
         self.search_engine = GoogleSerperAPIWrapper()
+        self.cache: LRUCache[str] = LRUCache(max_size=cache_max_size, ttl_seconds=cache_ttl_seconds)
+        self.max_concurrency = max(1, max_concurrency)
+        self.governor = governor
+        self.coalesce_timeout_seconds = coalesce_timeout_seconds
+        self.coalesced = 0
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize case and whitespace so equivalent queries share a cache entry."""
+        return " ".join(query.lower().split())
+
+    def _claim(self, key: str) -> tuple[Future, bool]:
+        """Return the in-flight future for key, and whether the caller must fulfil it."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def _resolve(
+        self, key: str, future: Future, result: str | None, error: BaseException | None
+    ) -> None:
+        """Publish the upstream outcome to waiters and cache successful results."""
+        with self._lock:
+            self._inflight.pop(key, None)
+        if error is not None:
+            if not isinstance(error, Exception):
+                # The owner was cancelled; waiters get an error, not a cancellation of their own
+                error = RuntimeError(f"Search for '{key}' was cancelled")
+            future.set_exception(error)
+            return
+        if result:
+            self.cache.set(key, result)
+        future.set_result(result)
 
     def search(self, query: str) -> str:
         """Search the web for the given query."""
-        return self.search_engine.run(query)
+        key = self.normalize_query(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future, owner = self._claim(key)
+        if not owner:
+            return future.result(timeout=self.coalesce_timeout_seconds)
+
+        try:
+            if self.governor is None:
+                result = self.search_engine.run(query)
+            else:
+                result = self.governor.call(SERPER, self.search_engine.run, query)
+        except BaseException as e:
+            self._resolve(key, future, None, e)
+            raise
+        self._resolve(key, future, result, None)
+        return result
+
+    async def asearch(self, query: str) -> str:
+        """Async variant of search."""
+        key = self.normalize_query(query)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        future, owner = self._claim(key)
+        if not owner:
+            # Shielded, so a waiter timing out or being cancelled leaves the shared future alone
+            return await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(future)), self.coalesce_timeout_seconds
+            )
+
+        try:
+            if self.governor is None:
+                result = await self.search_engine.arun(query)
+            else:
+                result = await self.governor.acall(SERPER, self.search_engine.arun, query)
+        except BaseException as e:
+            self._resolve(key, future, None, e)
+            raise
+        self._resolve(key, future, result, None)
+        return result
+
+    def _safe_search(self, query: str) -> str:
+        try:
+            return self.search(query)
+        except Exception as e:
+            return f"Error: {e}"
+
+    @staticmethod
+    def _batch_queries(
+        requests: Mapping[K, tuple[str, Sequence[str]]]
+    ) -> tuple[dict[K, dict[str, str]], list[str]]:
+        """Field -> query per lead, and the distinct queries across the batch."""
+        queries = {
+            key: build_field_queries(company, missing_fields)
+            for key, (company, missing_fields) in requests.items()
+        }
+        unique = list(
+            dict.fromkeys(q for lead_queries in queries.values() for q in lead_queries.values())
+        )
+        return queries, unique
+
+    @staticmethod
+    def _join(lead_queries: Mapping[str, str], results: Mapping[str, str]) -> str:
+        """One section per query, headed by its field and query text."""
+        return "\n\n".join(
+            f"{SECTION_HEADER.format(field=field, query=query)}\n{results[query]}"
+            for field, query in lead_queries.items()
+            if results[query]
+        )
+
+    def search_batch(self, requests: Mapping[K, tuple[str, Sequence[str]]]) -> dict[K, str]:
+        """Search the missing fields of many leads at once.
+
+        Args:
+            requests: Lead key -> (company, missing field names)
+
+        Returns:
+            dict: Lead key -> search results for all of its queries, one section per
+                query headed by SECTION_HEADER. A failed query contributes an
+                "Error: ..." section instead of failing the batch.
+        """
+        queries, unique = self._batch_queries(requests)
+        if not unique:
+            return {key: "" for key in queries}
+
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(unique))) as pool:
+            results = dict(zip(unique, pool.map(self._safe_search, unique)))
+
+        return {
+            key: self._join(lead_queries, results)
+            for key, lead_queries in queries.items()
+        }
+
+    async def asearch_batch(self, requests: Mapping[K, tuple[str, Sequence[str]]]) -> dict[K, str]:
+        """Async variant of search_batch, bounded by a semaphore."""
+        queries, unique = self._batch_queries(requests)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(query: str) -> str:
+            async with semaphore:
+                try:
+                    return await self.asearch(query)
+                except Exception as e:
+                    return f"Error: {e}"
+
+        results = dict(zip(unique, await asyncio.gather(*(run(q) for q in unique))))
+
+        return {
+            key: self._join(lead_queries, results)
+            for key, lead_queries in queries.items()
+        }
+
+    def stats(self) -> dict:
+        """Return cache hit/miss counters and the number of coalesced requests."""
+        return {**self.cache.stats.as_dict(), "coalesced": self.coalesced}
+
+    def report(self) -> str:
+        """One line with the hit rate and how many searches shared an in-flight request."""
+        stats = self.stats()
+        return (
+            f"{stats['hits']} hits / {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} hit rate), {stats['coalesced']} coalesced, "
+            f"{stats['evictions']} evicted"
+        )
@@ -2,14 +2,20 @@ from dataclasses import dataclass
 from typing import Optional
 
 from langchain_openai import ChatOpenAI
-from qdrant_client import QdrantClient
 import os
 
-from .knowledge_base.vectordb.config import VectorDBSettings
+from .cache.llm_cache import LLMCacheSettings, create_llm_cache
+from .clients.outbound_governor import OPENAI_CHAT, OutboundGovernor, get_outbound_governor
+from .knowledge_base.vectordb.async_lead_storage import AsyncQDrantLeadStorage
+from .knowledge_base.vectordb.client_provider import QdrantClientProvider
+from .knowledge_base.vectordb.config import EmbeddingCacheSettings, VectorDBSettings
+from .knowledge_base.vectordb.embedding_cache import create_embedding_cache
 from .knowledge_base.vectordb.embedding_service import LeadEmbeddingService
 from .knowledge_base.vectordb.lead_storage import QDrantLeadStorage
 from .clients.search_service import WebSearchService
+from .memory.long_term.mem0.local_mem0 import LocalMem0Service
 from .memory.long_term.mem0.mem0_client import Mem0Service
+from .memory.long_term.mem0.memory_cache import CachedMem0Service, MemoryCacheSettings
 
 
 @dataclass
@@ -17,12 +23,24 @@ class AppDependencies:
     llm: ChatOpenAI
     vector_db_settings: VectorDBSettings
     embedding_service: LeadEmbeddingService
-    qdrant_client: QdrantClient
+    qdrant_client_provider: QdrantClientProvider
     lead_storage: QDrantLeadStorage
+    async_lead_storage: AsyncQDrantLeadStorage
     web_search_service: WebSearchService
     mem0_service: Mem0Service
     memory_saver: Optional[any] = None
     user_id: Optional[str] = None
+    outbound_governor: Optional[OutboundGovernor] = None
+
+
+def create_mem0_service() -> Mem0Service:
+    """Create the long-term memory service.
+
+    MEM0_BACKEND=local selects an in-process stand-in that needs no API key.
+    """
+    if os.getenv("MEM0_BACKEND", "cloud").lower() == "local":
+        return LocalMem0Service()
+    return Mem0Service(governor=get_outbound_governor())
 
 
 def create_dependencies(
@@ -34,41 +52,71 @@ def create_dependencies(
     """Create all application dependencies with proper configuration.
     
     Args:
-        llm: Language model instance. Defaults to gpt-4o-mini.
+        llm: Language model instance. Defaults to gpt-4o-mini with the structured-output
+            response cache configured by LLM_CACHE_* variables, calling OpenAI through
+            the outbound governor.
         memory_saver: Checkpointer for conversation memory.
-        mem0_service: Long-term memory service.
+        mem0_service: Long-term memory service. Wrapped in a local search cache
+            unless MEM0_CACHE_ENABLED=false.
         user_id: User identifier for memory operations.
     
     Returns:
         AppDependencies with all configured services.
     """
-    if llm is None:
-        llm = ChatOpenAI(model="gpt-4o-mini")
-    
+    # Shared by every service that calls an external API
+    governor = get_outbound_governor()
+
     vector_db_settings = VectorDBSettings.from_env()
-    embedding_service = LeadEmbeddingService()
-    qdrant_client = QdrantClient(
-        url=vector_db_settings.url,
-        port=vector_db_settings.grpc_port if vector_db_settings.prefer_grpc else vector_db_settings.port,
-        prefer_grpc=vector_db_settings.prefer_grpc,
-        api_key=vector_db_settings.api_key,
-        timeout=vector_db_settings.timeout,
+    embedding_cache = create_embedding_cache(EmbeddingCacheSettings.from_env())
+    embedding_service = LeadEmbeddingService(cache=embedding_cache, governor=governor)
+
+    if llm is None:
+        llm_cache = create_llm_cache(LLMCacheSettings.from_env(), embedding_service)
+        if governor is None:
+            llm = ChatOpenAI(model="gpt-4o-mini", cache=llm_cache)
+        else:
+            # The governor retries; client retries on top would multiply attempts
+            llm = ChatOpenAI(
+                model="gpt-4o-mini",
+                cache=llm_cache,
+                max_retries=0,
+                http_client=governor.http_client(OPENAI_CHAT),
+                http_async_client=governor.http_async_client(OPENAI_CHAT),
+            )
+
+    qdrant_client_provider = QdrantClientProvider(vector_db_settings)
+    lead_storage = QDrantLeadStorage(
+        vector_db_settings, embedding_service, client_provider=qdrant_client_provider
+    )
+    async_lead_storage = AsyncQDrantLeadStorage(
+        vector_db_settings, embedding_service, client_provider=qdrant_client_provider
     )
-    lead_storage = QDrantLeadStorage(vector_db_settings, embedding_service)
     
-    web_search_service = WebSearchService(api_key=os.getenv("SERPER_API_KEY"))
+    web_search_service = WebSearchService(
+        api_key=os.getenv("SERPER_API_KEY"),
+        cache_ttl_seconds=float(os.getenv("SEARCH_CACHE_TTL", "3600")),
+        cache_max_size=int(os.getenv("SEARCH_CACHE_MAX_SIZE", "1024")),
+        max_concurrency=int(os.getenv("SEARCH_MAX_CONCURRENCY", "8")),
+        governor=governor,
+    )
     
     if mem0_service is None:
-        mem0_service = Mem0Service()
+        mem0_service = create_mem0_service()
+
+    memory_cache_settings = MemoryCacheSettings.from_env()
+    if memory_cache_settings.enabled and not isinstance(mem0_service, CachedMem0Service):
+        mem0_service = CachedMem0Service(mem0_service, embedding_service, memory_cache_settings)
     
     return AppDependencies(
         llm=llm,
         vector_db_settings=vector_db_settings,
         embedding_service=embedding_service,
-        qdrant_client=qdrant_client,
+        qdrant_client_provider=qdrant_client_provider,
         lead_storage=lead_storage,
+        async_lead_storage=async_lead_storage,
         web_search_service=web_search_service,
         mem0_service=mem0_service,
         memory_saver=memory_saver,
         user_id=user_id,
+        outbound_governor=governor,
     )
@@ -0,0 +1,214 @@
+"""
+Async QDrant implementation of lead storage.
+"""
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, TypeVar
+import asyncio
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http import models
+from qdrant_client.http.exceptions import UnexpectedResponse
+
+from src.application.schema.lead import Lead, LeadCompleted
+from .lead_storage import QDrantLeadStorage
+
+T = TypeVar("T")
+
+
+class AsyncQDrantLeadStorage(QDrantLeadStorage):
+    """QDrant lead storage that never blocks the event loop.
+
+    Every Qdrant round-trip goes through the shared AsyncQdrantClient and is bounded
+    by VectorDBSettings.timeout. Embedding requests are not: the embedding service and
+    the outbound governor own their timeouts and retries. Collection setup and payload
+    conversion are inherited from QDrantLeadStorage.
+    """
+
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Shared async client from the provider."""
+        return self.client_provider.async_client
+
+    async def _with_timeout(self, operation: Awaitable[T]) -> T:
+        """Await a Qdrant operation, cancelling it after settings.timeout seconds."""
+        return await asyncio.wait_for(operation, timeout=self.settings.timeout)
+
+    async def _embed(self, leads: List[Lead | LeadCompleted]) -> np.ndarray:
+        return await self.embedding_service.get_lead_embeddings(leads)
+
+    async def _upsert(
+        self, lead_ids: List[str], vectors: np.ndarray, leads: List[Lead | LeadCompleted]
+    ) -> None:
+        await self._with_timeout(
+            self.async_client.upsert(
+                collection_name=self.settings.collection_name,
+                points=self._build_points(lead_ids, vectors, leads),
+            )
+        )
+
+    async def _stored_payloads(self, lead_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch the payloads of already stored leads."""
+        payloads: Dict[str, Dict[str, Any]] = {}
+        for ids in self._chunks(lead_ids):
+            points = await self._with_timeout(
+                self.async_client.retrieve(
+                    collection_name=self.settings.collection_name,
+                    ids=ids,
+                    with_payload=True,
+                )
+            )
+            for point in points:
+                payloads[str(point.id)] = point.payload or {}
+        return payloads
+
+    async def upsert_leads(self, leads: Dict[str, Lead | LeadCompleted]) -> bool:
+        """Insert or replace many leads, embedding the next chunk while the current one is written."""
+        if not leads:
+            return True
+
+        chunks = list(self._chunks(list(leads.items())))
+
+        next_embedding = asyncio.create_task(self._embed([lead for _, lead in chunks[0]]))
+        try:
+            for index, chunk in enumerate(chunks):
+                vectors = await next_embedding
+                if index + 1 < len(chunks):
+                    next_embedding = asyncio.create_task(
+                        self._embed([lead for _, lead in chunks[index + 1]])
+                    )
+
+                await self._upsert(
+                    [lead_id for lead_id, _ in chunk], vectors, [lead for _, lead in chunk]
+                )
+            return True
+        except UnexpectedResponse:
+            return False
+        finally:
+            # Don't leave a prefetch running if a write failed or we were cancelled
+            if not next_embedding.done():
+                next_embedding.cancel()
+
+    async def get_leads(self, lead_ids: List[str]) -> Dict[str, Lead | LeadCompleted]:
+        """Retrieve many leads by ID, fetching all chunks concurrently."""
+
+        async def retrieve(ids: List[str]) -> list:
+            try:
+                return await self._with_timeout(
+                    self.async_client.retrieve(
+                        collection_name=self.settings.collection_name,
+                        ids=ids,
+                    )
+                )
+            except UnexpectedResponse:
+                return []
+
+        pages = await asyncio.gather(*(retrieve(ids) for ids in self._chunks(lead_ids)))
+        return {
+            str(point.id): self._payload_to_lead(point.payload)
+            for points in pages
+            for point in points
+        }
+
+    async def delete_leads(self, lead_ids: List[str]) -> bool:
+        """Delete many leads in chunked round-trips."""
+        try:
+            for ids in self._chunks(lead_ids):
+                await self._with_timeout(
+                    self.async_client.delete(
+                        collection_name=self.settings.collection_name,
+                        points_selector=models.PointIdsList(points=ids),
+                    )
+                )
+            return True
+        except UnexpectedResponse:
+            return False
+
+    async def iter_leads(
+        self, filter: Optional[Dict[str, Any]] = None, page_size: int = 100
+    ) -> AsyncIterator[tuple[str, Lead | LeadCompleted]]:
+        """Iterate over stored leads using QDrant scroll pagination."""
+        scroll_filter = self._build_filter(filter)
+        offset = None
+        while True:
+            points, offset = await self._with_timeout(
+                self.async_client.scroll(
+                    collection_name=self.settings.collection_name,
+                    scroll_filter=scroll_filter,
+                    limit=page_size,
+                    offset=offset,
+                    with_payload=True,
+                    with_vectors=False,
+                )
+            )
+            for point in points:
+                yield str(point.id), self._payload_to_lead(point.payload)
+            if offset is None:
+                break
+
+    async def get_neighbor_vectors(self, vectors: np.ndarray, limit: int = 1) -> np.ndarray:
+        """Fetch the stored vectors closest to each query vector, in batched requests."""
+        responses = []
+        for requests in self._chunks(self._neighbor_requests(vectors, limit)):
+            responses.extend(
+                await self._with_timeout(
+                    self.async_client.query_batch_points(
+                        collection_name=self.settings.collection_name,
+                        requests=requests,
+                    )
+                )
+            )
+        return self._stack_vectors(responses)
+
+    async def get_lead(self, lead_id: str) -> Optional[Lead | LeadCompleted]:
+        """Retrieve a lead by its ID."""
+        try:
+            points = await self._with_timeout(
+                self.async_client.retrieve(
+                    collection_name=self.settings.collection_name,
+                    ids=[lead_id],
+                )
+            )
+            if not points:
+                return None
+            return self._payload_to_lead(points[0].payload)
+        except UnexpectedResponse:
+            return None
+
+    async def find_similar_leads(
+        self, lead: Lead | LeadCompleted, limit: int = 5
+    ) -> List[Lead | LeadCompleted]:
+        """Find similar leads using vector similarity search."""
+        vector = await self.embedding_service.get_lead_embedding(lead)
+
+        search_result = await self._with_timeout(
+            self.async_client.query_points(
+                collection_name=self.settings.collection_name,
+                query=vector.tolist(),
+                with_payload=True,
+                limit=limit,
+            )
+        )
+
+        return [self._payload_to_lead(point.payload) for point in search_result.points]
+
+    async def update_lead(self, lead_id: str, lead: Lead | LeadCompleted) -> bool:
+        """Update an existing lead."""
+        try:
+            vectors = await self._embed([lead])
+            await self._upsert([lead_id], vectors, [lead])
+            return True
+        except UnexpectedResponse:
+            return False
+
+    async def delete_lead(self, lead_id: str) -> bool:
+        """Delete a lead from QDrant."""
+        try:
+            await self._with_timeout(
+                self.async_client.delete(
+                    collection_name=self.settings.collection_name,
+                    points_selector=models.PointIdsList(points=[lead_id]),
+                )
+            )
+            return True
+        except UnexpectedResponse:
+            return False
@@ -0,0 +1,92 @@
+"""
+Shared QDrant client provider.
+"""
+from threading import Lock
+from typing import Any, Dict, Optional
+
+import httpx
+from qdrant_client import AsyncQdrantClient, QdrantClient
+
+from .config import VectorDBSettings
+
+
+class QdrantClientProvider:
+    """Creates one sync and one async QDrant client per process and hands them out.
+
+    Both clients are built lazily from the same VectorDBSettings, so every consumer
+    shares the same connection pool (HTTP) or channel (gRPC).
+    """
+
+    def __init__(self, settings: VectorDBSettings):
+        """Initialize the provider.
+
+        Args:
+            settings: Vector database configuration
+        """
+        self.settings = settings
+        self._client: Optional[QdrantClient] = None
+        self._async_client: Optional[AsyncQdrantClient] = None
+        self._ready_collections: set[str] = set()
+        self._lock = Lock()
+
+    def _client_kwargs(self) -> Dict[str, Any]:
+        """Build the constructor arguments shared by both clients."""
+        settings = self.settings
+        return {
+            "url": settings.url,
+            "port": settings.grpc_port if settings.prefer_grpc else settings.port,
+            "prefer_grpc": settings.prefer_grpc,
+            "api_key": settings.api_key,
+            "timeout": settings.timeout,
+            "limits": httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            "grpc_options": {
+                "grpc.keepalive_time_ms": settings.grpc_keepalive_time_ms,
+                "grpc.keepalive_permit_without_calls": 1,
+            },
+        }
+
+    @property
+    def client(self) -> QdrantClient:
+        """Shared synchronous client."""
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = QdrantClient(**self._client_kwargs())
+        return self._client
+
+    @property
+    def async_client(self) -> AsyncQdrantClient:
+        """Shared asynchronous client.
+
+        Its connections bind to the event loop that first uses it, so only access it
+        from the application's serving loop.
+        """
+        if self._async_client is None:
+            with self._lock:
+                if self._async_client is None:
+                    self._async_client = AsyncQdrantClient(**self._client_kwargs())
+        return self._async_client
+
+    def is_collection_ready(self, collection_name: str) -> bool:
+        """Whether the collection was already checked/created through this provider."""
+        return collection_name in self._ready_collections
+
+    def mark_collection_ready(self, collection_name: str) -> None:
+        """Remember that the collection exists, so later consumers skip the lookup."""
+        self._ready_collections.add(collection_name)
+
+    def close(self) -> None:
+        """Close the synchronous client (the async one is closed with aclose)."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close the asynchronous client."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
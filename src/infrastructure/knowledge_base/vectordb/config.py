@@ -22,11 +22,23 @@ class VectorDBSettings:
     collection_name: str = os.getenv("QDRANT_COLLECTION", "leads-collection")
     vector_size: int = 64
     distance_metric: str = "Cosine"
+
+    # Search settings
+    search_limit: int = int(os.getenv("QDRANT_SEARCH_LIMIT", "10"))
+    score_threshold: Optional[float] = (
+        float(os.getenv("QDRANT_SCORE_THRESHOLD")) if os.getenv("QDRANT_SCORE_THRESHOLD") else None
+    )
     
     # Performance settings
     timeout: float = float(os.getenv("QDRANT_TIMEOUT", "10.0"))  # seconds
     batch_size: int = int(os.getenv("QDRANT_BATCH_SIZE", "100"))
 
+    # Connection pool settings (shared by the sync and async clients)
+    max_connections: int = int(os.getenv("QDRANT_MAX_CONNECTIONS", "100"))
+    max_keepalive_connections: int = int(os.getenv("QDRANT_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    keepalive_expiry: float = float(os.getenv("QDRANT_KEEPALIVE_EXPIRY", "30.0"))  # seconds
+    grpc_keepalive_time_ms: int = int(os.getenv("QDRANT_GRPC_KEEPALIVE_MS", "30000"))
+
     @property
     def url(self) -> str:
         """Get the QDrant server URL."""
@@ -36,4 +48,26 @@ class VectorDBSettings:
     @classmethod
     def from_env(cls) -> "VectorDBSettings":
         """Create settings from environment variables."""
-        return cls()
\ No newline at end of file
+        return cls()
+
+
+@dataclass
+class EmbeddingCacheSettings:
+    """Configuration settings for the embedding cache."""
+
+    enabled: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+
+    # In-process LRU tier
+    max_size: int = int(os.getenv("EMBEDDING_CACHE_MAX_SIZE", "10000"))
+    ttl_seconds: float = float(os.getenv("EMBEDDING_CACHE_TTL", "86400"))  # 0 disables expiry
+
+    # Optional shared tier: "none", "redis" or "disk"
+    shared_backend: str = os.getenv("EMBEDDING_CACHE_BACKEND", "none")
+    redis_uri: Optional[str] = os.getenv("EMBEDDING_CACHE_REDIS_URI", os.getenv("REDIS_URI"))
+    disk_path: str = os.getenv("EMBEDDING_CACHE_PATH", ".cache/embeddings.sqlite3")
+    disk_max_entries: int = int(os.getenv("EMBEDDING_CACHE_DISK_MAX_ENTRIES", "100000"))
+
+    @classmethod
+    def from_env(cls) -> "EmbeddingCacheSettings":
+        """Create settings from environment variables."""
+        return cls()
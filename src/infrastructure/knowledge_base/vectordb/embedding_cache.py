@@ -0,0 +1,245 @@
+"""
+Content-addressed cache for text embeddings.
+
+Entries are keyed by (model, dimensions, sha256(text)), so identical lead texts
+and search queries are only sent to the embedding API once.
+"""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+import hashlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from src.infrastructure.cache.lru_cache import CacheStats, LRUCache
+from .config import EmbeddingCacheSettings
+
+
+def embedding_cache_key(model: str, dimensions: int, text: str) -> str:
+    """Build the cache key for an embedding of text."""
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"emb:{model}:{dimensions}:{digest}"
+
+
+def _encode_vector(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype=np.float64).tobytes()
+
+
+def _decode_vector(raw: bytes) -> np.ndarray:
+    return np.frombuffer(raw, dtype=np.float64).copy()
+
+
+class EmbeddingCache(ABC):
+    """Abstract embedding cache tier."""
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        """Return the cached vectors for the keys that are present."""
+        pass
+
+    @abstractmethod
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        """Store vectors by key."""
+        pass
+
+
+class InMemoryEmbeddingCache(EmbeddingCache):
+    """Process-local LRU tier with size and TTL eviction."""
+
+    def __init__(self, max_size: int = 10_000, ttl_seconds: Optional[float] = None):
+        self._cache: LRUCache[np.ndarray] = LRUCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        for key in keys:
+            vector = self._cache.get(key)
+            if vector is not None:
+                found[key] = vector
+        return found
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        for key, vector in items.items():
+            self._cache.set(key, vector)
+
+
+class RedisEmbeddingCache(EmbeddingCache):
+    """Shared tier backed by Redis, so every worker benefits from each embedding."""
+
+    def __init__(self, redis_uri: str, ttl_seconds: Optional[float] = None):
+        import redis
+
+        self.client = redis.Redis.from_url(redis_uri)
+        self.ttl_seconds = int(ttl_seconds) if ttl_seconds and ttl_seconds > 0 else None
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        values = self.client.mget(keys)
+        return {key: _decode_vector(raw) for key, raw in zip(keys, values) if raw is not None}
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, vector in items.items():
+            pipe.set(key, _encode_vector(vector), ex=self.ttl_seconds)
+        pipe.execute()
+
+
+class DiskEmbeddingCache(EmbeddingCache):
+    """Shared tier backed by a local SQLite file.
+
+    Expired rows are purged when the file is opened and on every write, and the least
+    recently used rows are evicted above max_entries, so the file stays bounded.
+    """
+
+    def __init__(self, path: str, ttl_seconds: Optional[float] = None, max_entries: int = 100_000):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds if ttl_seconds and ttl_seconds > 0 else None
+        self.max_entries = max(1, max_entries)
+        self.evictions = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL, expires_at REAL, last_used REAL)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+            if "last_used" not in columns:
+                # Files written before eviction existed
+                self._conn.execute("ALTER TABLE embeddings ADD COLUMN last_used REAL")
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+            )
+            self._evict(time.time())
+
+    def _evict(self, now: float) -> None:
+        """Delete expired rows, then the least recently used rows above max_entries."""
+        expired = self._conn.execute(
+            "DELETE FROM embeddings WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = max(0, count - self.max_entries)
+        if overflow:
+            self._conn.execute(
+                "DELETE FROM embeddings WHERE key IN "
+                "(SELECT key FROM embeddings ORDER BY last_used LIMIT ?)",
+                (overflow,),
+            )
+        self.evictions += expired + overflow
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        if not keys:
+            return {}
+        placeholders = ",".join("?" for _ in keys)
+        now = time.time()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders}) "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                [*keys, now],
+            ).fetchall()
+            if rows:
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE key = ?",
+                    [(now, key) for key, _ in rows],
+                )
+        return {key: _decode_vector(raw) for key, raw in rows}
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        if not items:
+            return
+        now = time.time()
+        expires_at = now + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                [(key, _encode_vector(vector), expires_at, now) for key, vector in items.items()],
+            )
+            self._evict(now)
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return count
+
+
+class TieredEmbeddingCache(EmbeddingCache):
+    """Local LRU tier in front of an optional shared tier, with hit/miss counters."""
+
+    def __init__(self, local: EmbeddingCache, shared: Optional[EmbeddingCache] = None):
+        self.local = local
+        self.shared = shared
+        self.stats = CacheStats()
+        self.shared_hits = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        found = self.local.get_many(keys)
+
+        missing = [key for key in keys if key not in found]
+        if missing and self.shared is not None:
+            try:
+                from_shared = self.shared.get_many(missing)
+            except Exception as e:
+                print(f"⚠ Shared embedding cache unavailable: {e}")
+                from_shared = {}
+            if from_shared:
+                self.local.set_many(from_shared)
+                found.update(from_shared)
+                self.shared_hits += len(from_shared)
+
+        self.stats.hits += len(found)
+        self.stats.misses += len(keys) - len(found)
+        return found
+
+    def set_many(self, items: Dict[str, np.ndarray]) -> None:
+        self.local.set_many(items)
+        if self.shared is not None:
+            try:
+                self.shared.set_many(items)
+            except Exception as e:
+                print(f"⚠ Could not write to shared embedding cache: {e}")
+
+    def stats_dict(self) -> Dict[str, float]:
+        """Return hit/miss counters, including hits served by the shared tier."""
+        return {**self.stats.as_dict(), "shared_hits": self.shared_hits}
+
+    def report(self) -> str:
+        """One line with the hit rate and where hits were served from."""
+        stats = self.stats_dict()
+        line = (
+            f"{stats['hits']} hits / {stats['misses']} misses "
+            f"({stats['hit_rate']:.0%} hit rate), {stats['shared_hits']} from the shared tier"
+        )
+        if isinstance(self.shared, DiskEmbeddingCache):
+            line += f", {len(self.shared)} on disk, {self.shared.evictions} evicted"
+        return line
+
+
+def create_embedding_cache(settings: EmbeddingCacheSettings) -> Optional[TieredEmbeddingCache]:
+    """Build the embedding cache described by settings, or None when disabled."""
+    if not settings.enabled:
+        return None
+
+    local = InMemoryEmbeddingCache(max_size=settings.max_size, ttl_seconds=settings.ttl_seconds)
+
+    shared: Optional[EmbeddingCache] = None
+    backend = settings.shared_backend.lower()
+    try:
+        if backend == "redis" and settings.redis_uri:
+            shared = RedisEmbeddingCache(settings.redis_uri, ttl_seconds=settings.ttl_seconds)
+        elif backend == "disk":
+            shared = DiskEmbeddingCache(
+                settings.disk_path,
+                ttl_seconds=settings.ttl_seconds,
+                max_entries=settings.disk_max_entries,
+            )
+    except Exception as e:
+        print(f"⚠ Could not initialize shared embedding cache ({backend}): {e}")
+
+    return TieredEmbeddingCache(local, shared)
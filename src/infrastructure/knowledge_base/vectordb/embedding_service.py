@@ -1,26 +1,48 @@
 """
 Service for generating lead embeddings.
 """
-from typing import List
+from typing import List, Optional
 import numpy as np
 import openai
 from openai import AsyncClient
 
 from src.application.schema.lead import Lead, LeadCompleted
+from src.infrastructure.clients.outbound_governor import (
+    OPENAI_EMBEDDINGS,
+    OutboundGovernor,
+    estimate_text_tokens,
+)
+from .embedding_cache import EmbeddingCache, embedding_cache_key
 
 
 class LeadEmbeddingService:
     """Service for generating and managing lead embeddings."""
 
-    def __init__(self, api_key: str | None = None):
+    # Most inputs the OpenAI embeddings endpoint accepts in one request
+    max_inputs_per_request = 2048
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        cache: Optional[EmbeddingCache] = None,
+        governor: Optional[OutboundGovernor] = None,
+    ):
         """Initialize the embedding service.
 
         Args:
             api_key: Optional OpenAI API key. If not provided, uses environment variable.
+            cache: Optional embedding cache consulted before calling the API.
+            governor: Optional outbound call governor. It owns retries, so the client's
+                own retries are turned off.
         """
-        self.client = AsyncClient(api_key=api_key)
+        if governor is None:
+            self.client = AsyncClient(api_key=api_key)
+        else:
+            self.client = AsyncClient(api_key=api_key, max_retries=0)
+        self.governor = governor
         self.model = "text-embedding-3-small"
         self.dimensions = 64
+        self.cache = cache
 
     def _prepare_lead_text(self, lead: Lead | LeadCompleted) -> str:
         """Prepare lead data as text for embedding.
@@ -38,6 +60,9 @@ class LeadEmbeddingService:
             f"Revenue: ${lead.revenue_musd}M USD",
         ]
 
+        if lead.region:
+            text_parts.append(f"Region: {lead.region}")
+
         # Add enrichment fields if available
         if lead.website:
             text_parts.append(f"Website: {lead.website}")
@@ -55,6 +80,60 @@ class LeadEmbeddingService:
 
         return " | ".join(text_parts)
 
+    async def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings for texts, serving repeats from the cache.
+
+        Only texts missing from the cache are sent to the API, in as few requests as
+        max_inputs_per_request allows.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            np.ndarray: Array of embedding vectors, in input order
+        """
+        if not texts:
+            return np.empty((0, self.dimensions))
+
+        keys = [embedding_cache_key(self.model, self.dimensions, text) for text in texts]
+        vectors = self.cache.get_many(keys) if self.cache is not None else {}
+
+        # Deduplicate misses so repeated texts in one batch are embedded once
+        missing = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        missing_keys = list(missing.keys())
+        for start in range(0, len(missing_keys), self.max_inputs_per_request):
+            chunk = missing_keys[start:start + self.max_inputs_per_request]
+            response = await self._create_embeddings([missing[key] for key in chunk])
+            fresh = {key: np.array(item.embedding) for key, item in zip(chunk, response.data)}
+            if self.cache is not None:
+                self.cache.set_many(fresh)
+            vectors.update(fresh)
+
+        return np.array([vectors[key] for key in keys])
+
+    async def _create_embeddings(self, texts: List[str]):
+        request = dict(input=texts, model=self.model, dimensions=self.dimensions)
+        if self.governor is None:
+            return await self.client.embeddings.create(**request)
+        return await self.governor.acall(
+            OPENAI_EMBEDDINGS,
+            self.client.embeddings.create,
+            tokens=estimate_text_tokens(*texts),
+            usage=lambda response: response.usage.total_tokens,
+            **request,
+        )
+
+    async def get_text_embedding(self, text: str) -> np.ndarray:
+        """Generate embedding for free text, such as a search query.
+
+        Args:
+            text: The text to embed
+
+        Returns:
+            np.ndarray: The embedding vector
+        """
+        return (await self.embed_texts([text]))[0]
+
     async def get_lead_embedding(self, lead: Lead | LeadCompleted) -> np.ndarray:
         """Generate embedding for a lead.
 
@@ -64,15 +143,7 @@ class LeadEmbeddingService:
         Returns:
             np.ndarray: The embedding vector
         """
-        text = self._prepare_lead_text(lead)
-        
-        response = await self.client.embeddings.create(
-            input=[text],
-            model=self.model,
-            dimensions=self.dimensions,
-        )
-        
-        return np.array(response.data[0].embedding)
+        return await self.get_text_embedding(self._prepare_lead_text(lead))
 
     async def get_lead_embeddings(self, leads: List[Lead | LeadCompleted]) -> np.ndarray:
         """Generate embeddings for multiple leads in batch.
@@ -83,12 +154,4 @@ class LeadEmbeddingService:
         Returns:
             np.ndarray: Array of embedding vectors
         """
-        texts = [self._prepare_lead_text(lead) for lead in leads]
-        
-        response = await self.client.embeddings.create(
-            input=texts,
-            model=self.model,
-            dimensions=self.dimensions,
-        )
-        
-        return np.array([item.embedding for item in response.data])
\ No newline at end of file
+        return await self.embed_texts([self._prepare_lead_text(lead) for lead in leads])
@@ -1,16 +1,106 @@
-from typing import List, Optional, Dict, Any
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, TypeVar
+import hashlib
 import json
+import re
 import uuid
 
-from qdrant_client import QdrantClient
+import numpy as np
 from qdrant_client.http import models
 from qdrant_client.http.exceptions import UnexpectedResponse
+from pydantic import ValidationError
 
 from src.domain.interfaces.lead_repository import LeadRepository
 from src.application.schema.lead import Lead, LeadCompleted
+from .client_provider import QdrantClientProvider
 from .config import VectorDBSettings
 from .embedding_service import LeadEmbeddingService
 
+T = TypeVar("T")
+
+# Fixed namespace so the same company always maps to the same point ID
+LEAD_ID_NAMESPACE = uuid.UUID("6f1c2d7e-3b8a-5e4f-9a0d-2c7b1e5f8a34")
+CONTENT_HASH_FIELD = "content_hash"  # Hash of the lead content the vector was embedded from
+INDUSTRY_KEY_FIELD = "industry_key"  # Lowercased industry, for case-insensitive filtering
+DERIVED_PAYLOAD_FIELDS = {CONTENT_HASH_FIELD, INDUSTRY_KEY_FIELD}
+
+# Payload fields indexed for filtered search
+PAYLOAD_INDEXES = {
+    INDUSTRY_KEY_FIELD: models.PayloadSchemaType.KEYWORD,
+    "employee_count": models.PayloadSchemaType.INTEGER,
+    "revenue_musd": models.PayloadSchemaType.FLOAT,
+}
+
+_LEGAL_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "llc", "ltd", "limited",
+    "plc", "gmbh", "ag", "sa", "srl", "bv", "nv", "oy", "ab", "pty", "ltda",
+}
+
+
+def normalize_company_name(name: str) -> str:
+    """Lowercase, strip punctuation and trailing legal suffixes ("Acme, Inc." -> "acme")."""
+    tokens = re.sub(r"[^\w\s]", " ", name.lower()).split()
+    while len(tokens) > 1 and tokens[-1] in _LEGAL_SUFFIXES:
+        tokens.pop()
+    return " ".join(tokens)
+
+
+def lead_id_for_company(company: str) -> str:
+    """Content-addressed point ID for a company name."""
+    return str(uuid.uuid5(LEAD_ID_NAMESPACE, normalize_company_name(company)))
+
+
+def lead_id_for(lead: Lead | LeadCompleted) -> str:
+    """Content-addressed point ID for a lead.
+
+    Only the normalized company name is used: the website is usually unknown when a
+    lead is first stored, and including it would split one company across two IDs.
+    """
+    return lead_id_for_company(lead.company)
+
+
+def lead_fields(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """The lead fields of a payload, without derived fields (missing fields are None)."""
+    return {name: payload.get(name) for name in Lead.model_fields}
+
+
+def merge_lead_payloads(*payloads: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine lead payloads field by field, keeping the first non-null value of each."""
+    return {
+        name: next((p[name] for p in payloads if p.get(name) is not None), None)
+        for name in Lead.model_fields
+    }
+
+
+def build_lead_filter(
+    industries: Optional[List[str]] = None,
+    min_employees: Optional[int] = None,
+    max_employees: Optional[int] = None,
+    min_revenue_musd: Optional[float] = None,
+) -> Optional[models.Filter]:
+    """Build a QDrant filter over the indexed lead fields, or None when unconstrained."""
+    conditions: List[models.FieldCondition] = []
+
+    if industries:
+        conditions.append(
+            models.FieldCondition(
+                key=INDUSTRY_KEY_FIELD,
+                match=models.MatchAny(any=[industry.strip().lower() for industry in industries]),
+            )
+        )
+    if min_employees is not None or max_employees is not None:
+        conditions.append(
+            models.FieldCondition(
+                key="employee_count",
+                range=models.Range(gte=min_employees, lte=max_employees),
+            )
+        )
+    if min_revenue_musd is not None:
+        conditions.append(
+            models.FieldCondition(key="revenue_musd", range=models.Range(gte=min_revenue_musd))
+        )
+
+    return models.Filter(must=conditions) if conditions else None
+
 
 class QDrantLeadStorage(LeadRepository):
     """QDrant implementation of lead storage."""
@@ -19,46 +109,195 @@ class QDrantLeadStorage(LeadRepository):
         self,
         settings: VectorDBSettings,
         embedding_service: LeadEmbeddingService,
+        client_provider: Optional[QdrantClientProvider] = None,
     ):
         """Initialize QDrant lead storage.
 
         Args:
             settings: Vector database configuration
             embedding_service: Service for generating lead embeddings
+            client_provider: Shared client provider. A private one is created if omitted.
         """
         self.settings = settings
         self.embedding_service = embedding_service
-        self.client = QdrantClient(
-            url=settings.url,
-            port=settings.grpc_port if settings.prefer_grpc else settings.port,
-            prefer_grpc=settings.prefer_grpc,
-            api_key=settings.api_key,
-            timeout=settings.timeout,
-        )
+        self.client_provider = client_provider or QdrantClientProvider(settings)
+        self.client = self.client_provider.client
         self._ensure_collection_exists()
 
     def _ensure_collection_exists(self) -> None:
         """Ensure the leads collection exists with proper configuration."""
+        collection_name = self.settings.collection_name
+        if self.client_provider.is_collection_ready(collection_name):
+            return
+
+        created = False
         try:
-            self.client.get_collection(self.settings.collection_name)
+            collection = self.client.get_collection(collection_name)
+            existing_indexes = set((collection.payload_schema or {}).keys())
         except Exception as e:
-            print(f"Creating collection {self.settings.collection_name}")
+            print(f"Creating collection {collection_name}")
             self.client.create_collection(
-                collection_name=self.settings.collection_name,
+                collection_name=collection_name,
                 vectors_config=models.VectorParams(
                     size=self.settings.vector_size,
                     distance=self.settings.distance_metric,
                 ),
             )
+            existing_indexes = set()
+            created = True
+
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            if field_name not in existing_indexes:
+                self.client.create_payload_index(
+                    collection_name=collection_name,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                )
+        if not created:
+            self._rekey_legacy_points()
+            self._backfill_industry_keys()
+        self.client_provider.mark_collection_ready(collection_name)
+
+    def _backfill_industry_keys(self) -> None:
+        """Set industry_key on points stored before it existed, so filters see them."""
+        collection_name = self.settings.collection_name
+        missing_filter = models.Filter(
+            must=[models.IsEmptyCondition(is_empty=models.PayloadField(key=INDUSTRY_KEY_FIELD))]
+        )
+
+        backfilled = 0
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=missing_filter,
+                limit=max(1, self.settings.batch_size),
+                offset=offset,
+                with_payload=["industry"],
+                with_vectors=False,
+            )
+            operations = [
+                models.SetPayloadOperation(
+                    set_payload=models.SetPayload(
+                        payload={INDUSTRY_KEY_FIELD: point.payload["industry"].strip().lower()},
+                        points=[point.id],
+                    )
+                )
+                for point in points
+                if isinstance((point.payload or {}).get("industry"), str)
+            ]
+            if operations:
+                self.client.batch_update_points(
+                    collection_name=collection_name, update_operations=operations
+                )
+                backfilled += len(operations)
+            if offset is None:
+                break
+
+        if backfilled:
+            print(f"✓ Backfilled {INDUSTRY_KEY_FIELD} on {backfilled} lead points")
+
+    def _rekey_legacy_points(self) -> None:
+        """Move points stored under random IDs to their company's content-addressed ID.
+
+        Points written before IDs were content-addressed have no content hash, which
+        makes the migration one-time. Points of the same company, including one already
+        under the new ID, are merged field by field and the old IDs are deleted. The
+        vector of the most complete point is kept and the hash records the content it was
+        embedded from, so the next store of that company re-embeds if the merge changed it.
+        """
+        collection_name = self.settings.collection_name
+        legacy_filter = models.Filter(
+            must=[models.IsEmptyCondition(is_empty=models.PayloadField(key=CONTENT_HASH_FIELD))]
+        )
+
+        legacy: List[models.Record] = []
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=collection_name,
+                scroll_filter=legacy_filter,
+                limit=max(1, self.settings.batch_size),
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            legacy.extend(points)
+            if offset is None:
+                break
+        if not legacy:
+            return
+
+        groups: Dict[str, List[models.Record]] = {}
+        for point in legacy:
+            company = (point.payload or {}).get("company")
+            if company:
+                groups.setdefault(lead_id_for_company(company), []).append(point)
+
+        rekeyed = 0
+        for lead_ids in self._chunks(list(groups)):
+            existing = {
+                str(point.id): point
+                for point in self.client.retrieve(
+                    collection_name=collection_name,
+                    ids=lead_ids,
+                    with_payload=True,
+                    with_vectors=True,
+                )
+                if (point.payload or {}).get(CONTENT_HASH_FIELD)
+            }
+
+            points, stale_ids = [], []
+            for lead_id in lead_ids:
+                sources = ([existing[lead_id]] if lead_id in existing else []) + groups[lead_id]
+                try:
+                    lead = self._payload_to_lead(
+                        merge_lead_payloads(*(point.payload for point in sources))
+                    )
+                except ValidationError as e:
+                    print(f"⚠ Skipping malformed legacy lead point {sources[-1].id}: {e}")
+                    continue
+
+                source = max(
+                    sources,
+                    key=lambda point: sum(v is not None for v in lead_fields(point.payload).values()),
+                )
+                payload = self._lead_to_payload(lead)
+                payload[CONTENT_HASH_FIELD] = self._content_hash(lead_fields(source.payload))
+                points.append(models.PointStruct(id=lead_id, vector=source.vector, payload=payload))
+                stale_ids.extend(
+                    str(point.id) for point in groups[lead_id] if str(point.id) != lead_id
+                )
+
+            if points:
+                self.client.upsert(collection_name=collection_name, points=points)
+            if stale_ids:
+                self.client.delete(
+                    collection_name=collection_name,
+                    points_selector=models.PointIdsList(points=stale_ids),
+                )
+            rekeyed += len(points)
+
+        print(f"✓ Re-keyed {len(legacy)} legacy lead points into {rekeyed} company IDs")
 
     def _lead_to_payload(self, lead: Lead | LeadCompleted) -> Dict[str, Any]:
-        """Convert lead to QDrant payload."""
-        return json.loads(lead.model_dump_json())
+        """Convert lead to QDrant payload, tagged with a hash of its content."""
+        payload = json.loads(lead.model_dump_json())
+        payload[CONTENT_HASH_FIELD] = self._content_hash(payload)
+        payload[INDUSTRY_KEY_FIELD] = lead.industry.strip().lower()
+        return payload
+
+    @staticmethod
+    def _content_hash(payload: Dict[str, Any]) -> str:
+        """Stable hash of a lead payload (the embedding text is derived from it)."""
+        canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
 
     def _payload_to_lead(self, payload: Dict[str, Any]) -> Lead | LeadCompleted:
         """Convert QDrant payload back to lead."""
+        payload = {k: v for k, v in payload.items() if k not in DERIVED_PAYLOAD_FIELDS}
         if all(
-            field in payload
+            payload.get(field) is not None
             for field in [
                 "website",
                 "last_year_profit",
@@ -72,20 +311,201 @@ class QDrantLeadStorage(LeadRepository):
 
     async def store_lead(self, lead: Lead | LeadCompleted) -> str:
         """Store a lead in QDrant."""
-        lead_id = str(uuid.uuid4())
-        vector = await self.embedding_service.get_lead_embedding(lead)
-        
-        self.client.upsert(
-            collection_name=self.settings.collection_name,
-            points=[
-                models.PointStruct(
-                    id=lead_id,
-                    vector=vector.tolist(),
-                    payload=self._lead_to_payload(lead),
-                )
-            ],
+        return (await self.store_leads([lead]))[0]
+
+    def _build_points(
+        self, lead_ids: List[str], vectors: np.ndarray, leads: List[Lead | LeadCompleted]
+    ) -> List[models.PointStruct]:
+        """Build QDrant points from IDs, embedding vectors and leads."""
+        return [
+            models.PointStruct(
+                id=lead_id,
+                vector=vector.tolist(),
+                payload=self._lead_to_payload(lead),
+            )
+            for lead_id, vector, lead in zip(lead_ids, vectors, leads)
+        ]
+
+    def _chunks(self, items: List[T]) -> Iterator[List[T]]:
+        """Split items into chunks of settings.batch_size."""
+        batch_size = max(1, self.settings.batch_size)
+        for start in range(0, len(items), batch_size):
+            yield items[start : start + batch_size]
+
+    def _build_filter(self, filter: Optional[Dict[str, Any]]) -> Optional[models.Filter]:
+        """Translate exact-match field conditions into a QDrant filter."""
+        if not filter:
+            return None
+        return models.Filter(
+            must=[
+                models.FieldCondition(key=key, match=models.MatchValue(value=value))
+                for key, value in filter.items()
+            ]
         )
-        return lead_id
+
+    async def _stored_payloads(self, lead_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Fetch the payloads of already stored leads."""
+        payloads: Dict[str, Dict[str, Any]] = {}
+        for ids in self._chunks(lead_ids):
+            points = self.client.retrieve(
+                collection_name=self.settings.collection_name,
+                ids=ids,
+                with_payload=True,
+            )
+            for point in points:
+                payloads[str(point.id)] = point.payload or {}
+        return payloads
+
+    def _merge_with_stored(
+        self, lead: Lead | LeadCompleted, stored: Optional[Dict[str, Any]]
+    ) -> Lead | LeadCompleted:
+        """Fill the fields a lead leaves empty from its stored payload."""
+        if not stored:
+            return lead
+        return self._payload_to_lead(
+            merge_lead_payloads(json.loads(lead.model_dump_json()), stored)
+        )
+
+    async def store_leads(self, leads: List[Lead | LeadCompleted]) -> List[str]:
+        """Store many leads idempotently under content-addressed IDs.
+
+        Fields a lead leaves empty keep their stored values, so finding a company again
+        never erases its enrichment. Leads whose merged payload is unchanged are neither
+        re-embedded nor re-written.
+
+        Args:
+            leads: Leads to store
+
+        Returns:
+            List[str]: The IDs of the stored leads, in input order
+        """
+        if not leads:
+            return []
+
+        lead_ids = [lead_id_for(lead) for lead in leads]
+        # The same company twice in one batch: the last occurrence wins
+        by_id = dict(zip(lead_ids, leads))
+
+        stored = await self._stored_payloads(list(by_id.keys()))
+        merged = {
+            lead_id: self._merge_with_stored(lead, stored.get(lead_id))
+            for lead_id, lead in by_id.items()
+        }
+        changed = {
+            lead_id: lead
+            for lead_id, lead in merged.items()
+            if stored.get(lead_id, {}).get(CONTENT_HASH_FIELD)
+            != self._lead_to_payload(lead)[CONTENT_HASH_FIELD]
+        }
+
+        if changed:
+            await self.upsert_leads(changed)
+        print(f"Stored {len(changed)} new or changed leads ({len(by_id) - len(changed)} unchanged).")
+        return lead_ids
+
+    async def upsert_leads(self, leads: Dict[str, Lead | LeadCompleted]) -> bool:
+        """Insert or replace many leads, embedding and writing one chunk at a time."""
+        if not leads:
+            return True
+
+        try:
+            # Chunked so bulk imports stay under the embeddings API's inputs-per-request cap
+            for chunk in self._chunks(list(leads.items())):
+                lead_ids = [lead_id for lead_id, _ in chunk]
+                values = [lead for _, lead in chunk]
+                vectors = await self.embedding_service.get_lead_embeddings(values)
+                self.client.upsert(
+                    collection_name=self.settings.collection_name,
+                    points=self._build_points(lead_ids, vectors, values),
+                )
+            return True
+        except UnexpectedResponse:
+            return False
+
+    async def get_leads(self, lead_ids: List[str]) -> Dict[str, Lead | LeadCompleted]:
+        """Retrieve many leads by ID in chunked round-trips."""
+        found: Dict[str, Lead | LeadCompleted] = {}
+        for ids in self._chunks(lead_ids):
+            try:
+                points = self.client.retrieve(
+                    collection_name=self.settings.collection_name,
+                    ids=ids,
+                )
+            except UnexpectedResponse:
+                continue
+            for point in points:
+                found[str(point.id)] = self._payload_to_lead(point.payload)
+        return found
+
+    async def delete_leads(self, lead_ids: List[str]) -> bool:
+        """Delete many leads in chunked round-trips."""
+        try:
+            for ids in self._chunks(lead_ids):
+                self.client.delete(
+                    collection_name=self.settings.collection_name,
+                    points_selector=models.PointIdsList(points=ids),
+                )
+            return True
+        except UnexpectedResponse:
+            return False
+
+    async def iter_leads(
+        self, filter: Optional[Dict[str, Any]] = None, page_size: int = 100
+    ) -> AsyncIterator[tuple[str, Lead | LeadCompleted]]:
+        """Iterate over stored leads using QDrant scroll pagination."""
+        scroll_filter = self._build_filter(filter)
+        offset = None
+        while True:
+            points, offset = self.client.scroll(
+                collection_name=self.settings.collection_name,
+                scroll_filter=scroll_filter,
+                limit=page_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            for point in points:
+                yield str(point.id), self._payload_to_lead(point.payload)
+            if offset is None:
+                break
+
+    def _stack_vectors(self, responses: list) -> np.ndarray:
+        """Stack the vectors of batch query responses, once per point."""
+        by_id = {
+            str(point.id): point.vector
+            for response in responses
+            for point in response.points
+            if point.vector is not None
+        }
+        if not by_id:
+            return np.empty((0, self.settings.vector_size))
+        return np.array(list(by_id.values()))
+
+    def _neighbor_requests(self, vectors: np.ndarray, limit: int) -> List[models.QueryRequest]:
+        return [
+            models.QueryRequest(query=vector.tolist(), limit=limit, with_vector=True)
+            for vector in vectors
+        ]
+
+    async def get_neighbor_vectors(self, vectors: np.ndarray, limit: int = 1) -> np.ndarray:
+        """Fetch the stored vectors closest to each query vector, in batched requests.
+
+        Args:
+            vectors: (n, d) query vectors
+            limit: Neighbors fetched per query vector
+
+        Returns:
+            np.ndarray: (m, d) matrix of distinct stored vectors
+        """
+        responses = []
+        for requests in self._chunks(self._neighbor_requests(vectors, limit)):
+            responses.extend(
+                self.client.query_batch_points(
+                    collection_name=self.settings.collection_name,
+                    requests=requests,
+                )
+            )
+        return self._stack_vectors(responses)
 
     async def get_lead(self, lead_id: str) -> Optional[Lead | LeadCompleted]:
         """Retrieve a lead by its ID."""
@@ -0,0 +1,66 @@
+"""
+Vectorized similarity helpers for ranking and deduplicating lead embeddings.
+"""
+from typing import Optional
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (zero rows stay zero)."""
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float64))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def cosine_similarity_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarity between the rows of a and the rows of b."""
+    return normalize_rows(a) @ normalize_rows(b).T
+
+
+def rank_and_deduplicate(
+    candidates: np.ndarray,
+    reference: Optional[np.ndarray] = None,
+    existing: Optional[np.ndarray] = None,
+    threshold: float = 0.97,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Rank candidates by similarity to a reference vector and drop near-duplicates.
+
+    A candidate is dropped when its cosine similarity to any existing vector, or to any
+    higher-ranked candidate, is at or above threshold. Everything is computed with
+    matrix operations; there is no per-pair Python loop.
+
+    Args:
+        candidates: (n, d) candidate embeddings
+        reference: Optional (d,) vector to rank by (e.g. the ICP embedding).
+            Without it, candidates keep their input order.
+        existing: Optional (m, d) embeddings of already stored leads
+        threshold: Cosine similarity at or above which two leads are duplicates
+
+    Returns:
+        (indices, scores): indices of the kept candidates, best first, and their
+        similarity to the reference (zeros without a reference)
+    """
+    n = len(candidates)
+    if n == 0:
+        return np.empty(0, dtype=int), np.empty(0)
+
+    if reference is not None:
+        scores = cosine_similarity_matrix(candidates, reference)[:, 0]
+    else:
+        scores = np.zeros(n)
+
+    # Stable sort keeps input order among ties (and when there is no reference)
+    order = np.argsort(-scores, kind="stable")
+    ranked = candidates[order]
+
+    keep = np.ones(n, dtype=bool)
+    if existing is not None and len(existing):
+        keep &= cosine_similarity_matrix(ranked, existing).max(axis=1) < threshold
+
+    # Upper triangle: similarity of each candidate to the higher-ranked ones before it
+    within = np.triu(cosine_similarity_matrix(ranked, ranked), k=1)
+    keep &= ~(within >= threshold).any(axis=0)
+
+    kept = order[keep]
+    return kept, scores[kept]
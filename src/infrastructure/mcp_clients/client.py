@@ -2,13 +2,17 @@ import os
 
 from langchain_mcp_adapters.client import MultiServerMCPClient
 
-async def get_mcp_client():
-    client = MultiServerMCPClient(
-        {
-            "google_workspace": {
-                "transport": "streamable_http",
-                "url": f"{os.getenv('WORKSPACE_MCP_BASE_URI', 'http://localhost')}:{os.getenv('WORKSPACE_MCP_PORT', '8001')}/mcp",
-            }
+
+def get_mcp_connections() -> dict:
+    """Connection settings for the MCP servers the app talks to."""
+    return {
+        "google_workspace": {
+            "transport": "streamable_http",
+            "url": f"{os.getenv('WORKSPACE_MCP_BASE_URI', 'http://localhost')}:{os.getenv('WORKSPACE_MCP_PORT', '8001')}/mcp",
         }
-    )
-    return client
\ No newline at end of file
+    }
+
+
+async def get_mcp_client():
+    client = MultiServerMCPClient(get_mcp_connections())
+    return client
@@ -0,0 +1,264 @@
+"""
+Long-lived MCP sessions shared by every tool call.
+
+MultiServerMCPClient.get_tools() returns tools that open a new streamable HTTP
+session (connect + initialize handshake) on every call, and the sync wrappers used
+to spin up a new event loop per call on top of that. MCPSessionManager instead runs
+one event loop on a background thread and keeps one initialized session per server
+open on it. Sync and async callers submit their calls to that loop. A broken
+session is dropped and reconnected on the next call, and every call is bounded by a
+timeout.
+"""
+import asyncio
+import atexit
+import concurrent.futures
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from langchain_core.tools import StructuredTool, ToolException
+from langchain_mcp_adapters.client import MultiServerMCPClient
+from mcp import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.types import CallToolResult, TextContent, Tool
+
+from src.infrastructure.mcp_clients.client import get_mcp_connections
+
+
+@dataclass
+class MCPSettings:
+    """Timeouts for MCP sessions and calls."""
+
+    call_timeout_seconds: float = float(os.getenv("MCP_CALL_TIMEOUT", "30"))
+    connect_timeout_seconds: float = float(os.getenv("MCP_CONNECT_TIMEOUT", "10"))
+
+    @classmethod
+    def from_env(cls) -> "MCPSettings":
+        """Create settings from environment variables."""
+        return cls()
+
+
+def _result_text(result: CallToolResult) -> str:
+    """Flatten a tool result to text, raising ToolException for tool errors."""
+    text = "\n".join(
+        content.text for content in result.content if isinstance(content, TextContent)
+    )
+    if result.isError:
+        raise ToolException(text or "MCP tool call failed")
+    return text
+
+
+class MCPSessionManager:
+    """Keeps one MCP session per server open on a dedicated event loop thread."""
+
+    def __init__(self, connections: dict, settings: Optional[MCPSettings] = None):
+        self.client = MultiServerMCPClient(connections)
+        self.settings = settings or MCPSettings.from_env()
+
+        self._sessions: dict[str, ClientSession] = {}
+        self._server_versions: dict[str, str] = {}
+        self._stops: dict[str, asyncio.Event] = {}
+        self._holders: dict[str, asyncio.Task] = {}
+        self._connect_locks: dict[str, asyncio.Lock] = {}
+        self._closed = False
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mcp-sessions", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- session lifecycle (runs on the manager loop) -----------------------------
+
+    async def _hold(
+        self, server: str, ready: asyncio.Future, stop: asyncio.Event
+    ) -> None:
+        """Own a session for its whole life; the context must exit on the task that entered it."""
+        session = None
+        try:
+            async with self.client.session(server, auto_initialize=False) as session:
+                initialized = await session.initialize()
+                info = initialized.serverInfo
+                self._server_versions[server] = f"{info.name}/{info.version}"
+                ready.set_result(session)
+                await stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                print(f"⚠ MCP session to {server} closed: {e}")
+        finally:
+            if not ready.done():
+                ready.cancel()
+            if session is not None and self._sessions.get(server) is session:
+                del self._sessions[server]
+
+    async def _session(self, server: str) -> ClientSession:
+        session = self._sessions.get(server)
+        if session is not None:
+            return session
+
+        lock = self._connect_locks.setdefault(server, asyncio.Lock())
+        async with lock:
+            session = self._sessions.get(server)
+            if session is not None:
+                return session
+
+            ready = self._loop.create_future()
+            stop = asyncio.Event()
+            holder = self._loop.create_task(self._hold(server, ready, stop))
+            try:
+                session = await asyncio.wait_for(
+                    asyncio.shield(ready), self.settings.connect_timeout_seconds
+                )
+            except BaseException:
+                stop.set()
+                holder.cancel()
+                raise
+
+            self._sessions[server] = session
+            self._stops[server] = stop
+            self._holders[server] = holder
+            return session
+
+    async def _reset(self, server: str) -> None:
+        """Close a server's session so the next call reconnects."""
+        self._sessions.pop(server, None)
+        stop = self._stops.pop(server, None)
+        holder = self._holders.pop(server, None)
+        if stop is not None:
+            stop.set()
+        if holder is not None:
+            try:
+                await asyncio.wait_for(holder, self.settings.connect_timeout_seconds)
+            except BaseException:
+                holder.cancel()
+
+    async def _call_tool(
+        self, server: str, name: str, arguments: dict, timeout: Optional[float]
+    ) -> CallToolResult:
+        timeout = timeout or self.settings.call_timeout_seconds
+        # One reconnect attempt: a stale session fails fast, a fresh one should not
+        for attempt in range(2):
+            session = await self._session(server)
+            try:
+                return await asyncio.wait_for(session.call_tool(name, arguments), timeout)
+            except McpError:
+                # The server answered with an error; the session itself is fine
+                raise
+            except asyncio.TimeoutError:
+                await self._reset(server)
+                raise TimeoutError(f"MCP tool {name} timed out after {timeout}s")
+            except Exception:
+                await self._reset(server)
+                if attempt == 1:
+                    raise
+        raise RuntimeError("unreachable")
+
+    async def _list_tools(self, server: str) -> list[Tool]:
+        tools: list[Tool] = []
+        cursor = None
+        while True:
+            session = await self._session(server)
+            try:
+                page = await asyncio.wait_for(
+                    session.list_tools(cursor=cursor), self.settings.call_timeout_seconds
+                )
+            except Exception:
+                await self._reset(server)
+                raise
+            tools.extend(page.tools)
+            cursor = page.nextCursor
+            if not cursor:
+                return tools
+
+    # ---- public API (any thread, any loop) ----------------------------------------
+
+    def server_version(self, server: str) -> Optional[str]:
+        """Name/version the server reported on its last connect, if it has connected."""
+        return self._server_versions.get(server)
+
+    def _submit(self, coro) -> concurrent.futures.Future:
+        if self._closed:
+            coro.close()
+            raise RuntimeError("MCP session manager is closed")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def _outer_timeout(self, timeout: Optional[float]) -> float:
+        # Connect + one retry + call, so a wedged loop can't block callers forever
+        call_timeout = timeout or self.settings.call_timeout_seconds
+        return 2 * (self.settings.connect_timeout_seconds + call_timeout)
+
+    def call_tool(
+        self, server: str, name: str, arguments: dict, timeout: Optional[float] = None
+    ) -> CallToolResult:
+        """Call an MCP tool from sync code."""
+        future = self._submit(self._call_tool(server, name, arguments, timeout))
+        return future.result(self._outer_timeout(timeout))
+
+    async def acall_tool(
+        self, server: str, name: str, arguments: dict, timeout: Optional[float] = None
+    ) -> CallToolResult:
+        """Call an MCP tool from any event loop."""
+        future = self._submit(self._call_tool(server, name, arguments, timeout))
+        return await asyncio.wait_for(asyncio.wrap_future(future), self._outer_timeout(timeout))
+
+    def list_tools(self, server: str) -> list[Tool]:
+        """List a server's tool definitions from sync code."""
+        return self._submit(self._list_tools(server)).result(self._outer_timeout(None))
+
+    async def alist_tools(self, server: str) -> list[Tool]:
+        """List a server's tool definitions from any event loop."""
+        return await asyncio.wrap_future(self._submit(self._list_tools(server)))
+
+    def as_langchain_tool(self, server: str, tool: Tool) -> StructuredTool:
+        """Wrap an MCP tool definition as a sync+async LangChain tool using this manager."""
+
+        def call(**kwargs: Any) -> str:
+            return _result_text(self.call_tool(server, tool.name, kwargs))
+
+        async def acall(**kwargs: Any) -> str:
+            return _result_text(await self.acall_tool(server, tool.name, kwargs))
+
+        return StructuredTool(
+            name=tool.name,
+            description=tool.description or "",
+            args_schema=tool.inputSchema,
+            func=call,
+            coroutine=acall,
+        )
+
+    def close(self) -> None:
+        """Close every session and stop the loop thread."""
+        if self._closed:
+            return
+
+        async def close_all() -> None:
+            for server in list(self._holders):
+                await self._reset(server)
+
+        try:
+            asyncio.run_coroutine_threadsafe(close_all(), self._loop).result(
+                self.settings.connect_timeout_seconds
+            )
+        except Exception as e:
+            print(f"⚠ Could not close MCP sessions cleanly: {e}")
+        finally:
+            self._closed = True
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=1.0)
+
+
+_manager: Optional[MCPSessionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_mcp_session_manager() -> MCPSessionManager:
+    """Return the process-wide MCP session manager, creating it on first use."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = MCPSessionManager(get_mcp_connections())
+        return _manager
@@ -0,0 +1,89 @@
+import itertools
+import re
+import threading
+import uuid
+from typing import Optional
+
+from .mem0_client import Mem0Service
+
+
+class LocalMem0Service(Mem0Service):
+    """In-process stand-in for Mem0Service, for tests and running without MEM0_API_KEY.
+
+    Every user/assistant message is stored verbatim as one memory (no fact extraction),
+    and search ranks memories by word overlap with the query.
+    """
+
+    def __init__(self):
+        self.client = None
+        self._memories: dict[str, list[dict]] = {}
+        self._lock = threading.Lock()
+        self.add_calls = 0
+
+    @staticmethod
+    def _words(text: str) -> set[str]:
+        return set(re.findall(r"\w+", text.lower()))
+
+    def add_memory(
+        self,
+        messages: list[dict],
+        user_id: str,
+        metadata: Optional[dict] = None
+    ) -> dict:
+        """Store each non-empty message as a memory."""
+        added = []
+        with self._lock:
+            self.add_calls += 1
+            for message in messages:
+                content = message.get("content")
+                if not content:
+                    continue
+                memory = {
+                    "id": str(uuid.uuid4()),
+                    "memory": content,
+                    "user_id": user_id,
+                    "metadata": metadata or {},
+                }
+                self._memories.setdefault(user_id, []).append(memory)
+                added.append({"id": memory["id"], "memory": content, "event": "ADD"})
+        return {"results": added}
+
+    def search_memories(
+        self,
+        query: str,
+        user_id: str,
+        limit: int = 5
+    ) -> list[dict]:
+        """Rank the user's memories by the fraction of query words they contain."""
+        query_words = self._words(query)
+        if not query_words:
+            return []
+
+        with self._lock:
+            memories = list(self._memories.get(user_id, []))
+
+        scored = []
+        for memory in memories:
+            overlap = len(query_words & self._words(memory["memory"]))
+            if overlap:
+                scored.append({**memory, "score": overlap / len(query_words)})
+        scored.sort(key=lambda m: m["score"], reverse=True)
+        return scored[:limit]
+
+    def update_memories(
+        self,
+        memory_id: str,
+        new_memory: str
+    ) -> list[dict]:
+        """Replace the text of a memory."""
+        with self._lock:
+            for memory in itertools.chain.from_iterable(self._memories.values()):
+                if memory["id"] == memory_id:
+                    memory["memory"] = new_memory
+                    return [memory]
+        return []
+
+    def get_all_memories(self, user_id: str) -> list[dict]:
+        """Get all memories for a user."""
+        with self._lock:
+            return list(self._memories.get(user_id, []))
@@ -1,12 +1,25 @@
 from mem0 import MemoryClient
-from typing import Optional
+from typing import Any, Callable, Optional
+import asyncio
 import os
 
+from src.infrastructure.clients.outbound_governor import MEM0, OutboundGovernor
+
 class Mem0Service:
     """Long-term memory service using mem0."""
     
-    def __init__(self):
+    def __init__(self, governor: Optional[OutboundGovernor] = None):
+        """
+        Args:
+            governor: Outbound call governor the mem0 API calls go through
+        """
         self.client = MemoryClient(api_key=os.getenv("MEM0_API_KEY"))
+        self.governor = governor
+
+    def _call(self, func: Callable[..., Any], **kwargs: Any) -> Any:
+        if self.governor is None:
+            return func(**kwargs)
+        return self.governor.call(MEM0, func, **kwargs)
     
     def add_memory(
         self, 
@@ -18,7 +31,8 @@ class Mem0Service:
         Add memories from a conversation.
         mem0 automatically extracts relevant facts.
         """
-        return self.client.add(
+        return self._call(
+            self.client.add,
             messages=messages,
             user_id=user_id,
             metadata=metadata or {}
@@ -31,12 +45,23 @@ class Mem0Service:
         limit: int = 5
     ) -> list[dict]:
         """Search for relevant memories."""
-        results = self.client.search(
+        results = self._call(
+            self.client.search,
             query=query,
             filters={"user_id": user_id},
             limit=limit
         )
         return results.get("results", [])
+
+    async def asearch_memories(
+        self,
+        query: str,
+        user_id: str,
+        limit: int = 5
+    ) -> list[dict]:
+        """Async variant of search_memories."""
+        # mem0's client is sync, so keep it off the event loop
+        return await asyncio.to_thread(self.search_memories, query, user_id, limit)
     
     def update_memories(
         self,
@@ -44,14 +69,15 @@ class Mem0Service:
        new_memory: str
     ) -> list[dict]:
         """Update memories for a user."""
-        return self.client.update(
+        return self._call(
+            self.client.update,
             memory_id=memory_id,
             text=new_memory
         )
         
     def get_all_memories(self, user_id: str) -> list[dict]:
         """Get all memories for a user."""
-        return self.client.get_all(user_id=user_id)
+        return self._call(self.client.get_all, user_id=user_id)
     
     def format_memories_for_context(self, memories: list[dict]) -> str:
         """Format memories as context for prompts."""
@@ -0,0 +1,307 @@
+"""
+Per-user local cache for mem0 memory lookups.
+
+A user's memories are fetched once with get_all_memories, embedded in one batched
+request and kept in a small in-memory index. Searches are answered by a cosine
+similarity scan over that index; only when nothing local is close enough does the
+query go to mem0's remote search. Adds are applied to a loaded index from the
+ADD/UPDATE/DELETE events mem0 returns, embedding only the new texts; other writes, and
+adds whose outcome is unknown, invalidate it.
+"""
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from src.infrastructure.knowledge_base.vectordb.embedding_service import LeadEmbeddingService
+from src.infrastructure.knowledge_base.vectordb.similarity import normalize_rows
+from .mem0_client import Mem0Service
+
+
+@dataclass
+class MemoryCacheSettings:
+    """Configuration for the local memory cache."""
+
+    enabled: bool = os.getenv("MEM0_CACHE_ENABLED", "true").lower() == "true"
+    ttl_seconds: float = float(os.getenv("MEM0_CACHE_TTL", "900"))
+    min_score: float = float(os.getenv("MEM0_CACHE_MIN_SCORE", "0.4"))
+
+    @classmethod
+    def from_env(cls) -> "MemoryCacheSettings":
+        """Create settings from environment variables."""
+        return cls()
+
+
+# Events in mem0's add response that can be applied to a loaded index
+_MEMORY_EVENTS = {"ADD", "UPDATE", "DELETE", "NONE"}
+
+
+@dataclass
+class _MemoryIndex:
+    memories: list[dict]
+    vectors: np.ndarray  # (n, d) unit rows
+    loaded_at: float
+
+
+def _as_memory_list(response) -> list[dict]:
+    """mem0 returns either a list or {"results": [...]} depending on the API version."""
+    if isinstance(response, dict):
+        return response.get("results", [])
+    return list(response or [])
+
+
+class CachedMem0Service(Mem0Service):
+    """Mem0Service decorator answering search_memories from a local embedding index."""
+
+    def __init__(
+        self,
+        inner: Mem0Service,
+        embedding_service: LeadEmbeddingService,
+        settings: Optional[MemoryCacheSettings] = None,
+    ):
+        self.inner = inner
+        self.client = inner.client
+        self.embedding_service = embedding_service
+        self.settings = settings or MemoryCacheSettings.from_env()
+
+        self._indexes: dict[str, _MemoryIndex] = {}
+        self._generations: dict[str, int] = {}
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.remote_searches = 0
+
+    # ---- index management ---------------------------------------------------------
+
+    def _fresh_index(self, user_id: str) -> Optional[_MemoryIndex]:
+        with self._lock:
+            index = self._indexes.get(user_id)
+        if index is None or time.monotonic() - index.loaded_at > self.settings.ttl_seconds:
+            return None
+        return index
+
+    def invalidate(self, user_id: Optional[str] = None) -> None:
+        """Drop the index of one user, or of every user."""
+        with self._lock:
+            users = [user_id] if user_id is not None else list(self._indexes)
+            for user in users:
+                self._indexes.pop(user, None)
+                self._generations[user] = self._generations.get(user, 0) + 1
+
+    async def _refresh(self, user_id: str) -> None:
+        """Fetch and embed all memories of a user."""
+        with self._lock:
+            generation = self._generations.get(user_id, 0)
+
+        memories = _as_memory_list(
+            await asyncio.to_thread(self.inner.get_all_memories, user_id)
+        )
+        memories = [m for m in memories if m.get("memory")]
+        if memories:
+            vectors = normalize_rows(
+                await self.embedding_service.embed_texts([m["memory"] for m in memories])
+            )
+        else:
+            vectors = np.empty((0, self.embedding_service.dimensions))
+
+        with self._lock:
+            # A write during the fetch makes this snapshot stale; don't keep it
+            if self._generations.get(user_id, 0) == generation:
+                self._indexes[user_id] = _MemoryIndex(memories, vectors, time.monotonic())
+
+    async def _safe_refresh(self, user_id: str) -> None:
+        try:
+            await self._refresh(user_id)
+        except Exception as e:
+            print(f"⚠ Could not prefetch memories for user {user_id}: {e}")
+        finally:
+            self._refreshing.pop(user_id, None)
+
+    def schedule_prefetch(self, user_id: str) -> None:
+        """Start loading a user's index on the running event loop, if not loaded yet."""
+        if self._fresh_index(user_id) is not None or user_id in self._refreshing:
+            return
+        self._refreshing[user_id] = asyncio.get_running_loop().create_task(
+            self._safe_refresh(user_id)
+        )
+
+    def prefetch(self, user_id: str) -> None:
+        """Load a user's index, blocking until it is ready (sync callers)."""
+        if self._fresh_index(user_id) is None:
+            asyncio.run(self._safe_refresh(user_id))
+
+    def _embed_now(self, texts: list[str]) -> Optional[np.ndarray]:
+        """Embed texts from a sync caller; None when a loop runs on this thread or it fails."""
+        try:
+            asyncio.get_running_loop()
+            return None
+        except RuntimeError:
+            pass
+        try:
+            return normalize_rows(asyncio.run(self.embedding_service.embed_texts(texts)))
+        except Exception as e:
+            print(f"⚠ Could not embed new memories: {e}")
+            return None
+
+    def _apply_add(self, user_id: str, response, metadata: Optional[dict]) -> bool:
+        """Apply the events of an add to the user's loaded index.
+
+        Returns:
+            bool: False when the index must be invalidated instead
+        """
+        events = response.get("results") if isinstance(response, dict) else None
+        if not isinstance(events, list) or self._fresh_index(user_id) is None:
+            return False
+        if any(event.get("event") not in _MEMORY_EVENTS for event in events):
+            return False
+
+        changed = [e for e in events if e["event"] in ("ADD", "UPDATE") and e.get("memory")]
+        vectors = self._embed_now([e["memory"] for e in changed]) if changed else None
+        if changed and vectors is None:
+            return False
+
+        with self._lock:
+            index = self._indexes.get(user_id)
+            if index is None:
+                return False
+            memories = list(index.memories)
+            rows = list(index.vectors)
+            position = {m.get("id"): i for i, m in enumerate(memories)}
+
+            for event, vector in zip(changed, vectors if vectors is not None else []):
+                i = position.get(event.get("id"))
+                if i is not None:
+                    memories[i] = {**memories[i], "memory": event["memory"]}
+                    rows[i] = vector
+                else:
+                    position[event.get("id")] = len(memories)
+                    memories.append(
+                        {
+                            "id": event.get("id"),
+                            "memory": event["memory"],
+                            "user_id": user_id,
+                            "metadata": metadata or {},
+                        }
+                    )
+                    rows.append(vector)
+
+            deleted = {e.get("id") for e in events if e["event"] == "DELETE"}
+            keep = [i for i, m in enumerate(memories) if m.get("id") not in deleted]
+            self._indexes[user_id] = _MemoryIndex(
+                [memories[i] for i in keep],
+                np.array([rows[i] for i in keep]).reshape(len(keep), index.vectors.shape[1]),
+                index.loaded_at,
+            )
+            # A refresh that started before this add would load a snapshot without it
+            self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        return True
+
+    # ---- search -------------------------------------------------------------------
+
+    def _search_index(
+        self, index: _MemoryIndex, query_vector: np.ndarray, limit: int
+    ) -> list[dict]:
+        if not len(index.memories):
+            return []
+        scores = index.vectors @ normalize_rows(query_vector)[0]
+        order = np.argsort(-scores)[:limit]
+        return [
+            {**index.memories[i], "score": float(scores[i])}
+            for i in order
+            if scores[i] >= self.settings.min_score
+        ]
+
+    async def _alocal_search(self, query: str, user_id: str, limit: int) -> list[dict]:
+        index = self._fresh_index(user_id)
+        if index is None:
+            return []
+        try:
+            query_vector = await self.embedding_service.get_text_embedding(query)
+        except Exception as e:
+            print(f"⚠ Could not embed memory query, searching remotely: {e}")
+            return []
+        return self._search_index(index, query_vector, limit)
+
+    async def asearch_memories(
+        self,
+        query: str,
+        user_id: str,
+        limit: int = 5
+    ) -> list[dict]:
+        """Search the local index; fall back to mem0 when nothing is close enough."""
+        self.schedule_prefetch(user_id)
+
+        results = await self._alocal_search(query, user_id, limit)
+        if results:
+            self.local_hits += 1
+            return results
+
+        self.remote_searches += 1
+        return await asyncio.to_thread(self.inner.search_memories, query, user_id, limit)
+
+    def search_memories(
+        self,
+        query: str,
+        user_id: str,
+        limit: int = 5
+    ) -> list[dict]:
+        """Sync variant of asearch_memories; loads the index inline on first use."""
+        self.prefetch(user_id)
+
+        results = asyncio.run(self._alocal_search(query, user_id, limit))
+        if results:
+            self.local_hits += 1
+            return results
+
+        self.remote_searches += 1
+        return self.inner.search_memories(query, user_id, limit)
+
+    # ---- writes and pass-throughs -------------------------------------------------
+
+    def add_memory(
+        self,
+        messages: list[dict],
+        user_id: str,
+        metadata: Optional[dict] = None
+    ) -> dict:
+        """Add memories and apply them to the user's index, invalidating it if that fails."""
+        try:
+            response = self.inner.add_memory(messages=messages, user_id=user_id, metadata=metadata)
+        except Exception:
+            self.invalidate(user_id)
+            raise
+        if not self._apply_add(user_id, response, metadata):
+            self.invalidate(user_id)
+        return response
+
+    def update_memories(
+        self,
+        memory_id: str,
+        new_memory: str
+    ) -> list[dict]:
+        """Update a memory and invalidate the index holding it."""
+        with self._lock:
+            owner = next(
+                (
+                    user
+                    for user, index in self._indexes.items()
+                    if any(m.get("id") == memory_id for m in index.memories)
+                ),
+                None,
+            )
+        try:
+            return self.inner.update_memories(memory_id=memory_id, new_memory=new_memory)
+        finally:
+            # Unknown owner: the memory may belong to an index that's being loaded
+            self.invalidate(owner)
+
+    def get_all_memories(self, user_id: str) -> list[dict]:
+        """Get all memories for a user, from the index when it is loaded."""
+        index = self._fresh_index(user_id)
+        if index is not None:
+            return list(index.memories)
+        return self.inner.get_all_memories(user_id)
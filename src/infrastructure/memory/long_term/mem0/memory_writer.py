@@ -0,0 +1,180 @@
+"""
+Background pipeline for long-term memory writes.
+
+mem0 extracts facts from every added conversation with an LLM on its side, so a
+synchronous add_memory call puts a full remote round-trip on every response.
+BackgroundMemoryWriter queues turns instead and a worker thread writes them, folding
+several queued turns of the same user into a single add call and retrying failures
+with exponential backoff.
+"""
+import os
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .mem0_client import Mem0Service
+
+
+@dataclass
+class MemoryWriterSettings:
+    """Configuration for the background memory writer."""
+
+    queue_size: int = int(os.getenv("MEM0_WRITE_QUEUE_SIZE", "256"))
+    batch_size: int = int(os.getenv("MEM0_WRITE_BATCH_SIZE", "5"))
+    batch_wait_seconds: float = float(os.getenv("MEM0_WRITE_BATCH_WAIT", "1.0"))
+    max_retries: int = int(os.getenv("MEM0_WRITE_MAX_RETRIES", "3"))
+    backoff_seconds: float = float(os.getenv("MEM0_WRITE_BACKOFF", "1.0"))
+    shutdown_timeout_seconds: float = float(os.getenv("MEM0_WRITE_SHUTDOWN_TIMEOUT", "30"))
+
+    @classmethod
+    def from_env(cls) -> "MemoryWriterSettings":
+        """Create settings from environment variables."""
+        return cls()
+
+
+@dataclass
+class _MemoryWrite:
+    messages: list[dict]
+    user_id: str
+    metadata: Optional[dict] = None
+
+
+_STOP = object()
+
+
+class BackgroundMemoryWriter:
+    """Writes conversation turns to mem0 from a bounded queue on a worker thread."""
+
+    def __init__(
+        self, mem0_service: Mem0Service, settings: Optional[MemoryWriterSettings] = None
+    ):
+        self.mem0_service = mem0_service
+        self.settings = settings or MemoryWriterSettings.from_env()
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, self.settings.queue_size))
+        self._closed = False
+        self.dropped = 0
+        self.failed = 0
+
+        self._worker = threading.Thread(
+            target=self._run, name="mem0-writer", daemon=True
+        )
+        self._worker.start()
+
+    def submit(
+        self, messages: list[dict], user_id: str, metadata: Optional[dict] = None
+    ) -> bool:
+        """Queue a memory write without waiting for it.
+
+        Args:
+            messages: Conversation messages to remember
+            user_id: Owner of the memories
+            metadata: Optional metadata stored with the memories
+
+        Returns:
+            bool: False if the writer is closed or the queue is full and the write was dropped
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(_MemoryWrite(messages, user_id, metadata))
+            return True
+        except queue.Full:
+            # Never block the response on memory; losing a turn is the lesser evil
+            self.dropped += 1
+            print(f"⚠ Memory write queue is full, dropping a turn for user {user_id}")
+            return False
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued write has been attempted.
+
+        Returns:
+            bool: True if the queue drained before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting writes, flush the queue and stop the worker."""
+        if self._closed:
+            return
+        self._closed = True
+        timeout = self.settings.shutdown_timeout_seconds if timeout is None else timeout
+
+        if not self.flush(timeout):
+            print(f"⚠ Memory writer stopped with {self._queue.qsize()} writes still queued")
+        self._queue.put(_STOP)
+        self._worker.join(timeout=1.0)
+
+    def _next_batch(self) -> Optional[list[_MemoryWrite]]:
+        """Block for one write, then collect more for up to batch_wait_seconds."""
+        first = self._queue.get()
+        if first is _STOP:
+            self._queue.task_done()
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.settings.batch_wait_seconds
+        while len(batch) < self.settings.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP:
+                # Put the sentinel back so the loop exits after this batch
+                self._queue.task_done()
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+        return batch
+
+    @staticmethod
+    def _group(batch: list[_MemoryWrite]) -> list[_MemoryWrite]:
+        """Fold the turns of the same user and metadata into one write, keeping order."""
+        groups: dict[tuple, _MemoryWrite] = {}
+        for write in batch:
+            key = (write.user_id, repr(sorted((write.metadata or {}).items())))
+            if key in groups:
+                groups[key].messages.extend(write.messages)
+            else:
+                groups[key] = _MemoryWrite(list(write.messages), write.user_id, write.metadata)
+        return list(groups.values())
+
+    def _write(self, write: _MemoryWrite) -> None:
+        """Write to mem0, retrying with exponential backoff and jitter."""
+        for attempt in range(self.settings.max_retries + 1):
+            try:
+                self.mem0_service.add_memory(
+                    messages=write.messages, user_id=write.user_id, metadata=write.metadata
+                )
+                return
+            except Exception as e:
+                if attempt == self.settings.max_retries:
+                    self.failed += 1
+                    print(f"⚠ Could not save memories for user {write.user_id}: {e}")
+                    return
+                delay = self.settings.backoff_seconds * (2 ** attempt)
+                time.sleep(delay * random.uniform(0.5, 1.5))
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                for write in self._group(batch):
+                    self._write(write)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
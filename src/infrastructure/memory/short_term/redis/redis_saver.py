@@ -1,4 +1,4 @@
-from langgraph.checkpoint.redis import RedisSaver
+from langgraph.checkpoint.redis import AsyncRedisSaver, RedisSaver
 
 
 def get_redis_checkpointer(redis_uri: str) -> RedisSaver:
@@ -12,3 +12,20 @@ def get_redis_checkpointer(redis_uri: str) -> RedisSaver:
         RedisSaver context manager for LangGraph state persistence
     """
     return RedisSaver.from_conn_string(redis_uri)
+
+
+def get_async_redis_checkpointer(redis_uri: str) -> AsyncRedisSaver:
+    """
+    Factory function to create an async Redis checkpointer for graph.ainvoke/astream.
+
+    The saver opens its connections lazily on the event loop that first uses it, so it
+    can be built at startup and served from the UI's loop. Run RedisSaver.setup() first
+    so the search indices exist.
+
+    Args:
+        redis_uri: Redis connection string
+
+    Returns:
+        AsyncRedisSaver for LangGraph state persistence
+    """
+    return AsyncRedisSaver(redis_url=redis_uri)
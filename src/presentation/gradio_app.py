@@ -1,4 +1,6 @@
 import uuid
+from typing import AsyncIterator
+
 import gradio as gr
 from src.application.services.chat_service import ChatService
 
@@ -6,14 +8,16 @@ from src.application.services.chat_service import ChatService
 class GradioApp:
     """Gradio-based chat interface for the B2B agent."""
 
-    def __init__(self, chat_service: ChatService) -> None:
+    def __init__(self, chat_service: ChatService, async_mode: bool = False) -> None:
         """
         Initialize the Gradio application.
 
         Args:
             chat_service: Service for handling chat interactions
+            async_mode: Stream responses with ChatService.stream on Gradio's event loop
         """
         self.chat_service = chat_service
+        self.async_mode = async_mode
 
     def _chat_handler(
         self, message: str, history: list, thread_id: str
@@ -31,6 +35,38 @@ class GradioApp:
         """
         return self.chat_service.chat(message, thread_id)
 
+    async def _stream_handler(
+        self, message: str, history: list, thread_id: str
+    ) -> AsyncIterator[str]:
+        """
+        Stream progress and the answer as it is generated.
+
+        Gradio replaces the displayed message with each yielded value, so this yields
+        the progress lines followed by the answer accumulated so far.
+
+        Args:
+            message: User message
+            history: Conversation history (managed by Gradio)
+            thread_id: Thread ID for conversation tracking
+
+        Yields:
+            The assistant message rendered so far
+        """
+        progress: list[str] = []
+        answer, answer_node = "", None
+        async for event in self.chat_service.stream(message, thread_id):
+            if event.kind == "progress":
+                progress.append(f"_{event.content}…_")
+            elif event.kind == "token":
+                # Tokens from a later node (e.g. summary after chatbot) start a new answer
+                if event.node != answer_node:
+                    answer, answer_node = "", event.node
+                answer += event.content
+            else:
+                yield event.content
+                return
+            yield "\n\n".join(part for part in ("\n".join(progress), answer) if part)
+
     def launch(self, host: str, port: int) -> None:
         """
         Launch the Gradio chat interface.
@@ -40,7 +76,7 @@ class GradioApp:
             port: Port number to listen on
         """
         gr.ChatInterface(
-            fn=self._chat_handler,
+            fn=self._stream_handler if self.async_mode else self._chat_handler,
             title="B2B Lead Generation Assistant",
             description="Ask me to find and qualify B2B leads!",
             additional_inputs=[
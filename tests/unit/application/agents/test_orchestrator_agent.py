@@ -0,0 +1,36 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from langchain_core.messages import HumanMessage, ToolMessage
+
+from src.application.agents.orchestrator_agent import aorchestrator_node
+from src.application.schema.icp import IdealCustomerProfile
+from src.application.schema.state import State
+
+
+@pytest.mark.asyncio
+async def test_should_store_sheet_icp_without_blocking_when_sheet_is_malformed():
+    # Given
+    loader = MagicMock()
+    loader.afrom_sheet_text = AsyncMock(return_value=IdealCustomerProfile(employee_min=50))
+    llm = MagicMock()
+    state = State(
+        messages=[
+            HumanMessage(content="Find me new leads"),
+            ToolMessage(
+                content="Row 1: ['employee_min', 'fifty']",
+                name="read_sheet_values",
+                tool_call_id="call-1",
+            ),
+        ]
+    )
+
+    # When
+    update = await aorchestrator_node(state, llm, tools=[], icp_loader=loader)
+
+    # Then
+    assert update["icp"].employee_min == 50
+    assert update["next_action"] == "lead_finder"
+    loader.afrom_sheet_text.assert_awaited_once()
+    loader.from_sheet_text.assert_not_called()
+    llm.bind_tools.assert_not_called()
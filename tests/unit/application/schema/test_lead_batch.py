@@ -0,0 +1,95 @@
+import numpy as np
+
+from src.application.schema.contact import Contact
+from src.application.schema.lead_batch import (
+    COMPACT_FORMAT,
+    LeadBatch,
+    lead_updates,
+    merge_leads,
+)
+
+
+def _contact(company: str) -> Contact:
+    return Contact(
+        name="Jane Doe", email=f"jane@{company.lower()}.com", phone="+1 555 0100", position="CEO"
+    )
+
+
+def _enriched(make_lead, company: str, **fields):
+    defaults = {
+        "website": f"https://{company.lower()}.com",
+        "last_year_profit": 1.0,
+        "last_quarter_ebitda": 0.5,
+        "stock_variation_3m": 2.0,
+        "contacts": [_contact(company)],
+    }
+    return make_lead(company, **{**defaults, **fields})
+
+
+def test_should_replace_only_updated_positions_when_applying_updates(make_lead):
+    # Given
+    batch = LeadBatch.from_leads([make_lead("Acme"), make_lead("Beta"), make_lead("Gamma")])
+
+    # When
+    updated = batch.with_updates({1: _enriched(make_lead, "Beta", region="EU")})
+
+    # Then
+    assert [lead.company for lead in updated] == ["Acme", "Beta", "Gamma"]
+    assert updated[1].website == "https://beta.com"
+    assert updated[1].region == "EU"
+    assert updated[0].website is None
+    assert batch[1].website is None
+    assert updated.needs_enrichment_mask().tolist() == [True, False, True]
+
+
+def test_should_reuse_string_codes_when_update_repeats_known_values(make_lead):
+    # Given
+    batch = LeadBatch.from_leads([make_lead("Acme"), make_lead("Beta")])
+    _, table_before = batch.categories("industry")
+
+    # When
+    updated = batch.with_updates({0: make_lead("Beta")})
+
+    # Then
+    codes, table = updated.categories("company")
+    assert len(table) == len(table_before)
+    assert codes[0] == codes[1]
+
+
+def test_should_apply_lead_updates_to_current_batch_when_merging(make_lead):
+    # Given
+    current = LeadBatch.from_leads([make_lead("Acme"), make_lead("Beta")]).to_compact()
+    update = lead_updates({0: _enriched(make_lead, "Acme")})
+
+    # When
+    merged = merge_leads(current, update)
+
+    # Then
+    assert merged["format"] == COMPACT_FORMAT
+    batch = LeadBatch.from_compact(merged)
+    assert batch[0].contacts == [_contact("Acme")]
+    assert batch[1].to_lead() == make_lead("Beta")
+    assert batch.needs_enrichment_mask().tolist() == [False, True]
+
+
+def test_should_replace_batch_when_merging_full_lead_list(make_lead):
+    # Given
+    current = LeadBatch.from_leads([make_lead("Acme")]).to_compact()
+
+    # When
+    merged = merge_leads(current, [make_lead("Beta"), make_lead("Gamma")])
+
+    # Then
+    assert [lead.company for lead in LeadBatch.from_compact(merged)] == ["Beta", "Gamma"]
+
+
+def test_should_round_trip_missing_values_through_compact_form(make_lead):
+    # Given
+    batch = LeadBatch.from_leads([make_lead("Acme"), _enriched(make_lead, "Beta")])
+
+    # When
+    restored = LeadBatch.from_compact(batch.to_compact())
+
+    # Then
+    assert restored.to_leads() == batch.to_leads()
+    assert np.isnan(restored.column("last_year_profit")[0])
@@ -0,0 +1,75 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.application.schema.icp import IdealCustomerProfile
+from src.application.services.icp_loader import ICPLoader
+
+WELL_FORMED_SHEET = (
+    "Row 1: ['Parameter', 'Value']\n"
+    "Row 2: ['industries_allowed', 'SaaS B2B; Fintech']\n"
+    "Row 3: ['employee_min', '50']"
+)
+MALFORMED_SHEET = (
+    "Row 1: ['Parameter', 'Value']\n"
+    "Row 2: ['industries_allowed', 'SaaS B2B; Fintech']\n"
+    "Row 3: ['employee_min', 'fifty']"
+)
+
+
+@pytest.fixture
+def parser():
+    parser = MagicMock()
+    parser.ainvoke = AsyncMock(return_value=IdealCustomerProfile(employee_min=50))
+    return parser
+
+
+@pytest.fixture
+def loader(parser):
+    llm = MagicMock()
+    llm.with_structured_output.return_value = parser
+    return ICPLoader(llm)
+
+
+def test_should_parse_well_formed_sheet_without_llm(loader, parser):
+    # When
+    icp = loader.from_sheet_text(WELL_FORMED_SHEET)
+
+    # Then
+    assert icp.industries_allowed == ["SaaS B2B", "Fintech"]
+    assert icp.employee_min == 50
+    parser.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_await_llm_when_async_sheet_parse_falls_back(loader, parser):
+    # When
+    icp = await loader.afrom_sheet_text(MALFORMED_SHEET)
+
+    # Then
+    assert icp.employee_min == 50
+    parser.ainvoke.assert_awaited_once()
+    parser.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_serve_repeated_sheet_from_cache(loader, parser):
+    # Given
+    await loader.afrom_sheet_text(MALFORMED_SHEET)
+
+    # When
+    icp = loader.from_sheet_text(MALFORMED_SHEET)
+
+    # Then
+    assert icp.employee_min == 50
+    assert parser.ainvoke.await_count == 1
+    parser.invoke.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_should_return_none_when_sheet_is_not_an_icp(loader):
+    # When
+    icp = await loader.afrom_sheet_text("Row 1: ['Name', 'Email']\nRow 2: ['Jane', 'j@x.com']")
+
+    # Then
+    assert icp is None
@@ -0,0 +1,143 @@
+import pytest
+
+from src.application.services.lead_field_extractor import extract_lead_fields
+
+MIN_CONFIDENCE = 0.7
+
+
+def test_should_extract_plainly_stated_fields_confidently():
+    # Given
+    text = (
+        "Acme Corp official site: https://www.acme.com/about. "
+        "Acme reported full-year net income of $1.2 billion. "
+        "Acme adjusted EBITDA for Q3 was $310 million. "
+        "Acme stock rose 12.5% over the past 3 months."
+    )
+
+    # When
+    fields = extract_lead_fields("Acme Corp", text).confident(MIN_CONFIDENCE)
+
+    # Then
+    assert fields == {
+        "website": "https://acme.com",
+        "last_year_profit": 1200.0,
+        "last_quarter_ebitda": 310.0,
+        "stock_variation_3m": 12.5,
+    }
+
+
+def test_should_not_trust_quarterly_profit_as_last_year_profit():
+    # Given
+    text = "Acme reported Q3 2024 net income of $250 million."
+
+    # When
+    extraction = extract_lead_fields("Acme", text)
+
+    # Then
+    assert extraction.fields["last_year_profit"].confidence < MIN_CONFIDENCE
+    assert "last_year_profit" not in extraction.confident(MIN_CONFIDENCE)
+
+
+def test_should_not_trust_figures_when_sentence_names_another_company():
+    # Given
+    text = (
+        "Rival Beta Inc reported net income of $50 million. "
+        "Beta shares rose 20% over three months."
+    )
+
+    # When
+    extraction = extract_lead_fields("Acme Corp", text)
+
+    # Then
+    assert extraction.fields["last_year_profit"].confidence < MIN_CONFIDENCE
+    assert extraction.fields["stock_variation_3m"].confidence < MIN_CONFIDENCE
+    assert extraction.confident(MIN_CONFIDENCE) == {}
+
+
+@pytest.mark.parametrize(
+    "text, trusted",
+    [
+        ("Acme reported net income of $50 million for fiscal 2018.", False),
+        ("Acme reported net income of $50 million for fiscal 2025.", True),
+        ("Acme reported FY2026 net income of $50 million.", True),
+    ],
+)
+def test_should_not_trust_profit_when_year_is_before_last_fiscal_year(text, trusted):
+    # When
+    fields = extract_lead_fields("Acme", text, current_year=2026).confident(MIN_CONFIDENCE)
+
+    # Then
+    assert ("last_year_profit" in fields) is trusted
+
+
+def test_should_not_trust_other_company_figures_from_old_years():
+    # Given
+    text = (
+        "Rival Beta Inc reported net income of $50 million for fiscal 2018. "
+        "Beta shares rose 20% over three months."
+    )
+
+    # When
+    extraction = extract_lead_fields("Acme Corp", text, current_year=2026)
+
+    # Then
+    assert extraction.fields["last_year_profit"].confidence < 0.3
+    assert extraction.confident(MIN_CONFIDENCE) == {}
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Acme shares fell 8% in the last three months.", -8.0),
+        ("Acme stock is -4.2% over 90 days.", -4.2),
+    ],
+)
+def test_should_sign_stock_variation_from_direction(text, expected):
+    # When
+    fields = extract_lead_fields("Acme", text).confident(MIN_CONFIDENCE)
+
+    # Then
+    assert fields["stock_variation_3m"] == expected
+
+
+def test_should_ignore_third_party_hosts_for_website():
+    # Given
+    text = "Acme on LinkedIn: https://www.linkedin.com/company/acme. See crunchbase.com/acme."
+
+    # When
+    extraction = extract_lead_fields("Acme", text)
+
+    # Then
+    assert "website" not in extraction.fields
+
+
+def test_should_keep_contact_only_with_name_title_email_and_phone():
+    # Given
+    text = (
+        "Contact Jane Miller, CFO at jane.miller@acme.com or +1 415 555 0100. "
+        "General inbox: info@acme.com."
+    )
+
+    # When
+    contacts = extract_lead_fields("Acme", text).contacts
+
+    # Then
+    assert len(contacts) == 1
+    assert contacts[0].name == "Jane Miller"
+    assert contacts[0].email == "jane.miller@acme.com"
+
+
+def test_should_read_each_field_only_from_its_own_section():
+    # Given
+    text = (
+        "### contacts: Acme executive team contact email phone\n"
+        "Acme net income of $40 million was cited by Jane Miller, CFO.\n\n"
+        "### last_year_profit: Acme net income last fiscal year\n"
+        "Acme posted full-year net income of $55 million."
+    )
+
+    # When
+    fields = extract_lead_fields("Acme", text).confident(MIN_CONFIDENCE)
+
+    # Then
+    assert fields["last_year_profit"] == 55.0
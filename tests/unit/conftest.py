@@ -0,0 +1,12 @@
+import pytest
+
+from src.application.schema.lead import Lead
+
+
+@pytest.fixture
+def make_lead():
+    def factory(company: str = "Acme", **fields) -> Lead:
+        defaults = {"industry": "software", "employee_count": 100, "revenue_musd": 10.0}
+        return Lead(company=company, **{**defaults, **fields})
+
+    return factory
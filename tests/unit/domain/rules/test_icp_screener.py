@@ -0,0 +1,143 @@
+from pathlib import Path
+
+import pytest
+
+from src.application.schema.icp import IdealCustomerProfile
+from src.application.schema.lead_batch import LeadBatch
+from src.application.services.icp_loader import ICPLoader
+from src.domain.rules.icp_screener import ICPScreener
+
+ICP_CSV = Path(__file__).parents[4] / "src" / "application" / "tools" / "ICP.csv"
+
+
+def _screen(icp, leads):
+    return ICPScreener.from_icp(icp).evaluate(LeadBatch.from_leads(leads))
+
+
+def test_should_not_block_short_values_contained_in_blocked_terms(make_lead):
+    # Given
+    icp = IdealCustomerProfile(industries_blocked=["Retail"], regions_blocked=["Russia"])
+    lead = make_lead(industry="AI", region="US")
+
+    # When
+    result = _screen(icp, [lead])
+
+    # Then
+    assert result.passed.tolist() == [True], result.reasons
+
+
+@pytest.mark.parametrize(
+    "industry, passed",
+    [
+        ("Enterprise Software", True),
+        ("software", True),
+        ("SaaS", True),
+        ("Soft drinks", False),
+        ("Softwarehouse", False),
+    ],
+)
+def test_should_match_allowed_industries_on_shared_tokens(make_lead, industry, passed):
+    # Given
+    icp = IdealCustomerProfile(industries_allowed=["software"])
+
+    # When
+    result = _screen(icp, [make_lead(industry=industry)])
+
+    # Then
+    assert result.passed.tolist() == [passed]
+
+
+def test_should_report_reasons_when_lead_breaks_several_rules(make_lead):
+    # Given
+    icp = IdealCustomerProfile(
+        industries_blocked=["logistics"], employee_min=50, regions_allowed=["Brazil"]
+    )
+    leads = [
+        make_lead("Fast Freight", industry="Logistics", employee_count=10, region="Germany"),
+        make_lead("Good Co", region="Brazil"),
+    ]
+
+    # When
+    result = _screen(icp, leads)
+
+    # Then
+    assert result.passed.tolist() == [False, True]
+    assert set(result.reasons[0]) == {
+        "industry blocked by ICP",
+        "fewer than 50 employees",
+        "region not in ICP",
+    }
+    assert result.reasons[1] == []
+
+
+def test_should_not_reject_on_region_when_region_is_unknown(make_lead):
+    # Given
+    icp = IdealCustomerProfile(regions_allowed=["Brazil"], regions_blocked=["Russia"])
+
+    # When
+    result = _screen(icp, [make_lead(region=None)])
+
+    # Then
+    assert result.passed.tolist() == [True]
+
+
+def test_should_only_apply_sanity_checks_when_no_icp(make_lead):
+    # Given
+    leads = [make_lead(employee_count=-1), make_lead("Beta")]
+
+    # When
+    result = _screen(None, leads)
+
+    # Then
+    assert result.passed.tolist() == [False, True]
+    assert result.reasons[0] == ["negative employee count"]
+
+
+@pytest.mark.parametrize(
+    "industry, region",
+    [
+        ("SaaS", "United States"),
+        ("B2B SaaS", "USA"),
+        ("Software", "Canada"),
+        ("Healthcare", "Brazil"),
+        ("Healthcare Technology", "U.S."),
+        ("Logistics", "Mexico"),
+        ("Logistics and Supply Chain", "São Paulo, Brazil"),
+        ("Energy", "US"),
+        ("Financial Services", "Toronto, Canada"),
+        ("Fintech", None),
+    ],
+)
+def test_should_pass_typical_leads_when_screened_against_repo_icp(make_lead, industry, region):
+    # Given
+    icp = ICPLoader().from_file(ICP_CSV)
+
+    # When
+    result = _screen(icp, [make_lead(industry=industry, region=region)])
+
+    # Then
+    assert result.passed.tolist() == [True], result.reasons
+
+
+@pytest.mark.parametrize(
+    "industry, region, reason",
+    [
+        ("Retail", "United States", "industry blocked by ICP"),
+        ("B2C Ecommerce", "Canada", "industry blocked by ICP"),
+        ("Agriculture", "Brazil", "industry blocked by ICP"),
+        ("Mining", "Canada", "industry not in ICP"),
+        ("IT Services", "Canada", "industry not in ICP"),
+        ("Software", "United Kingdom", "region not in ICP"),
+        ("Software", "Russia", "region blocked by ICP"),
+    ],
+)
+def test_should_reject_leads_outside_repo_icp(make_lead, industry, region, reason):
+    # Given
+    icp = ICPLoader().from_file(ICP_CSV)
+
+    # When
+    result = _screen(icp, [make_lead(industry=industry, region=region)])
+
+    # Then
+    assert result.passed.tolist() == [False]
+    assert reason in result.reasons[0]
@@ -0,0 +1,96 @@
+import pytest
+from langchain_core.caches import BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+from langchain_openai import ChatOpenAI
+
+from src.application.schema.lead import LeadCompleted
+from src.infrastructure.cache.llm_cache import (
+    InMemoryLLMCacheStore,
+    LLMCacheStore,
+    LLMResponseCache,
+)
+
+
+class _Captured(Exception):
+    pass
+
+
+class CapturingCache(BaseCache):
+    """Records the llm_string LangChain looks up, then stops the call before any request."""
+
+    def __init__(self):
+        self.llm_string = None
+
+    def lookup(self, prompt, llm_string):
+        self.llm_string = llm_string
+        raise _Captured
+
+    def update(self, prompt, llm_string, return_val):
+        pass
+
+    def clear(self, **kwargs):
+        pass
+
+
+@pytest.fixture
+def llm():
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0, api_key="test", cache=CapturingCache())
+
+
+@pytest.fixture
+def cache():
+    return LLMResponseCache(InMemoryLLMCacheStore(max_entries=10))
+
+
+def _llm_string(llm, runnable) -> str:
+    with pytest.raises(_Captured):
+        runnable.invoke("Find Acme")
+    return llm.cache.llm_string
+
+
+def test_should_cache_structured_output_calls(llm):
+    # Given
+    structured = llm.with_structured_output(LeadCompleted)
+
+    # When
+    llm_string = _llm_string(llm, structured)
+
+    # Then
+    assert LLMResponseCache.is_cacheable(llm_string)
+
+
+def test_should_not_cache_free_form_or_tool_calling_turns(llm):
+    # Given
+    def lookup_company(name: str) -> str:
+        """Look up a company."""
+        return name
+
+    # When
+    plain = _llm_string(llm, llm)
+    with_tools = _llm_string(llm, llm.bind_tools([lookup_company]))
+
+    # Then
+    assert not LLMResponseCache.is_cacheable(plain)
+    assert not LLMResponseCache.is_cacheable(with_tools)
+
+
+def test_should_serve_structured_response_when_prompt_repeats(llm, cache):
+    # Given
+    llm_string = _llm_string(llm, llm.with_structured_output(LeadCompleted))
+    generations = [ChatGeneration(message=AIMessage(content="{}"))]
+
+    # When
+    cache.update("prompt", llm_string, generations)
+    hit = cache.lookup("prompt", llm_string)
+    miss = cache.lookup("other prompt", llm_string)
+
+    # Then
+    assert hit[0].message.content == "{}"
+    assert miss is None
+    assert cache.stats_dict()["hits"] == 1
+
+
+def test_store_interface_should_not_be_instantiable():
+    with pytest.raises(TypeError):
+        LLMCacheStore()
@@ -0,0 +1,136 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.infrastructure.clients.outbound_governor import (
+    GovernorSettings,
+    OutboundGovernor,
+    ProviderLimits,
+    RetryableResponse,
+    TokenBucket,
+)
+
+
+@pytest.fixture
+def governor():
+    settings = GovernorSettings(
+        max_retries=2,
+        backoff_base_seconds=0.001,
+        backoff_max_seconds=0.01,
+        acquire_timeout_seconds=0.2,
+        providers={"api": ProviderLimits(max_concurrency=2)},
+    )
+    return OutboundGovernor(settings)
+
+
+def _rate_limited() -> RetryableResponse:
+    return RetryableResponse(httpx.Response(429, request=httpx.Request("GET", "http://api")))
+
+
+@pytest.mark.asyncio
+async def test_should_free_slot_when_async_call_is_cancelled(governor):
+    # Given
+    provider = governor.provider("api")
+
+    async def slow():
+        await asyncio.sleep(5)
+
+    # When
+    for _ in range(4):
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(provider.acall(slow), 0.01)
+
+    # Then
+    assert provider.concurrency.in_flight == 0
+    assert provider.stats()["cancelled"] == 4
+
+    async def fast():
+        return "ok"
+
+    assert await provider.acall(fast) == "ok"
+
+
+def test_should_retry_when_rate_limited(governor):
+    # Given
+    provider = governor.provider("api")
+    outcomes = iter([_rate_limited(), "ok"])
+
+    def flaky():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    # When
+    result = provider.call(flaky)
+
+    # Then
+    assert result == "ok"
+    stats = provider.stats()
+    assert stats["rate_limited"] == 1
+    assert stats["retries"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_should_raise_after_last_retry_when_rate_limit_persists(governor):
+    # Given
+    provider = governor.provider("api")
+
+    def always_limited():
+        raise _rate_limited()
+
+    # When
+    with pytest.raises(RetryableResponse):
+        provider.call(always_limited)
+
+    # Then
+    stats = provider.stats()
+    assert stats["attempts"] == 3
+    assert stats["concurrency_limit"] == 1
+    assert stats["in_flight"] == 0
+
+
+def test_should_not_retry_when_error_is_not_transient(governor):
+    # Given
+    provider = governor.provider("api")
+    calls = []
+
+    def invalid():
+        calls.append(1)
+        raise ValueError("bad request")
+
+    # When
+    with pytest.raises(ValueError):
+        provider.call(invalid)
+
+    # Then
+    assert len(calls) == 1
+    assert provider.stats()["failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_should_raise_timeout_when_no_slot_frees_up(governor):
+    # Given
+    limit = governor.provider("api").concurrency
+    limit.acquire()
+    limit.acquire()
+
+    # When / Then
+    with pytest.raises(TimeoutError):
+        await limit.aacquire(timeout=0.05)
+    with pytest.raises(TimeoutError):
+        limit.acquire(timeout=0.05)
+
+
+def test_token_bucket_should_delay_reservations_when_in_debt():
+    # Given
+    bucket = TokenBucket(rate_per_second=10, capacity=10)
+
+    # When
+    first = bucket.reserve(10)
+    second = bucket.reserve(5)
+
+    # Then
+    assert first == 0
+    assert second == pytest.approx(0.5, abs=0.05)
@@ -0,0 +1,112 @@
+import asyncio
+
+import pytest
+
+from src.infrastructure.clients import search_service
+from src.infrastructure.clients.search_service import WebSearchService
+
+
+class FakeSerper:
+    def __init__(self):
+        self.calls = []
+        self.delay = 0.0
+
+    def run(self, query):
+        self.calls.append(query)
+        return f"results for {query}"
+
+    async def arun(self, query):
+        self.calls.append(query)
+        await asyncio.sleep(self.delay)
+        return f"results for {query}"
+
+
+@pytest.fixture
+def engine():
+    return FakeSerper()
+
+
+@pytest.fixture
+def service(engine, monkeypatch):
+    monkeypatch.setattr(search_service, "GoogleSerperAPIWrapper", lambda: engine)
+    return WebSearchService(api_key="test", coalesce_timeout_seconds=0.5)
+
+
+@pytest.mark.asyncio
+async def test_should_share_one_upstream_call_when_identical_queries_overlap(service, engine):
+    # Given
+    engine.delay = 0.05
+
+    # When
+    results = await asyncio.gather(service.asearch("Acme"), service.asearch("  acme "))
+
+    # Then
+    assert results == ["results for Acme", "results for Acme"]
+    assert len(engine.calls) == 1
+    assert service.stats()["coalesced"] == 1
+
+
+def test_should_serve_repeated_query_from_cache(service, engine):
+    # Given
+    service.search("Acme revenue")
+
+    # When
+    result = service.search("ACME   revenue")
+
+    # Then
+    assert result == "results for Acme revenue"
+    assert len(engine.calls) == 1
+    assert service.report() == "1 hits / 1 misses (50% hit rate), 0 coalesced, 0 evicted"
+
+
+@pytest.mark.asyncio
+async def test_should_clear_inflight_query_when_owner_is_cancelled(service, engine):
+    # Given
+    engine.delay = 5
+    owner = asyncio.create_task(service.asearch("acme"))
+    await asyncio.sleep(0.01)
+    waiter = asyncio.create_task(service.asearch("ACME "))
+    await asyncio.sleep(0.01)
+
+    # When
+    owner.cancel()
+    await asyncio.gather(owner, return_exceptions=True)
+
+    # Then
+    with pytest.raises(RuntimeError, match="cancelled"):
+        await waiter
+    assert service._inflight == {}
+    engine.delay = 0
+    assert await service.asearch("acme") == "results for acme"
+
+
+@pytest.mark.asyncio
+async def test_should_time_out_waiter_when_inflight_query_stalls(service, engine):
+    # Given
+    engine.delay = 5
+    owner = asyncio.create_task(service.asearch("acme"))
+    await asyncio.sleep(0.01)
+
+    # When / Then
+    with pytest.raises(asyncio.TimeoutError):
+        await service.asearch("acme")
+    assert not owner.done()
+    owner.cancel()
+    await asyncio.gather(owner, return_exceptions=True)
+
+
+def test_should_head_each_batch_result_with_its_field_and_query(service):
+    # Given
+    requests = {0: ("Acme", ["website", "contacts"]), 1: ("Beta", [])}
+
+    # When
+    results = service.search_batch(requests)
+
+    # Then
+    assert results[0] == (
+        "### website: Acme official website\n"
+        "results for Acme official website\n\n"
+        "### contacts: Acme executive team contact email phone\n"
+        "results for Acme executive team contact email phone"
+    )
+    assert results[1] == ""
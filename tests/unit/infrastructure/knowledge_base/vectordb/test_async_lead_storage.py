@@ -0,0 +1,48 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from src.infrastructure.knowledge_base.vectordb.async_lead_storage import AsyncQDrantLeadStorage
+from src.infrastructure.knowledge_base.vectordb.config import VectorDBSettings
+
+
+class SlowEmbeddings:
+    async def get_lead_embeddings(self, leads):
+        await asyncio.sleep(0.05)
+        return np.ones((len(leads), 4))
+
+
+@pytest.fixture
+def storage():
+    provider = MagicMock()
+    provider.async_client = AsyncMock()
+    settings = VectorDBSettings(timeout=0.01, batch_size=2)
+    return AsyncQDrantLeadStorage(settings, SlowEmbeddings(), client_provider=provider)
+
+
+@pytest.mark.asyncio
+async def test_should_not_apply_qdrant_timeout_to_embedding_requests(storage, make_lead):
+    # Given
+    leads = {f"id-{i}": make_lead(f"Company {i}") for i in range(3)}
+
+    # When
+    stored = await storage.upsert_leads(leads)
+
+    # Then
+    assert stored is True
+    assert storage.async_client.upsert.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_should_time_out_slow_qdrant_calls(storage):
+    # Given
+    async def slow_retrieve(**kwargs):
+        await asyncio.sleep(1)
+
+    storage.async_client.retrieve = slow_retrieve
+
+    # When / Then
+    with pytest.raises(asyncio.TimeoutError):
+        await storage.get_lead("id-1")
@@ -0,0 +1,83 @@
+import sqlite3
+import time
+
+import numpy as np
+import pytest
+
+from src.infrastructure.knowledge_base.vectordb.embedding_cache import (
+    DiskEmbeddingCache,
+    InMemoryEmbeddingCache,
+    TieredEmbeddingCache,
+)
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "embeddings.sqlite3")
+
+
+def _vectors(*keys):
+    return {key: np.full(4, float(index)) for index, key in enumerate(keys)}
+
+
+def test_should_evict_least_recently_used_rows_above_max_entries(path):
+    # Given
+    cache = DiskEmbeddingCache(path, max_entries=2)
+    cache.set_many(_vectors("a"))
+    time.sleep(0.01)
+    cache.set_many(_vectors("b"))
+    time.sleep(0.01)
+    cache.get_many(["a"])
+
+    # When
+    cache.set_many(_vectors("c"))
+
+    # Then
+    assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_should_purge_expired_rows_when_file_is_opened(path):
+    # Given
+    DiskEmbeddingCache(path, ttl_seconds=0.01).set_many(_vectors("a", "b"))
+    time.sleep(0.02)
+
+    # When
+    reopened = DiskEmbeddingCache(path)
+
+    # Then
+    assert len(reopened) == 0
+    assert reopened.evictions == 2
+
+
+def test_should_upgrade_cache_files_without_last_used_column(path):
+    # Given
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL, expires_at REAL)"
+        )
+
+    # When
+    cache = DiskEmbeddingCache(path)
+    cache.set_many(_vectors("a"))
+
+    # Then
+    assert list(cache.get_many(["a"])) == ["a"]
+
+
+def test_should_report_hits_from_each_tier(path):
+    # Given
+    shared = DiskEmbeddingCache(path)
+    shared.set_many(_vectors("a"))
+    cache = TieredEmbeddingCache(InMemoryEmbeddingCache(), shared)
+
+    # When
+    cache.get_many(["a", "b"])
+    cache.get_many(["a"])
+
+    # Then
+    assert cache.stats_dict()["shared_hits"] == 1
+    assert cache.report() == (
+        "2 hits / 1 misses (67% hit rate), 1 from the shared tier, 1 on disk, 0 evicted"
+    )
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.infrastructure.knowledge_base.vectordb.embedding_cache import InMemoryEmbeddingCache
+from src.infrastructure.knowledge_base.vectordb.embedding_service import LeadEmbeddingService
+
+
+def _fake_create(**request):
+    data = [SimpleNamespace(embedding=[float(len(text))] * 4) for text in request["input"]]
+    return SimpleNamespace(data=data, usage=SimpleNamespace(total_tokens=len(data)))
+
+
+@pytest.fixture
+def service():
+    service = LeadEmbeddingService(api_key="test", cache=InMemoryEmbeddingCache())
+    service.client.embeddings.create = AsyncMock(side_effect=_fake_create)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_should_split_requests_when_misses_exceed_input_cap(service):
+    # Given
+    service.max_inputs_per_request = 3
+    texts = [f"lead {i:02d}" for i in range(7)]
+
+    # When
+    vectors = await service.embed_texts(texts)
+
+    # Then
+    sizes = [len(call.kwargs["input"]) for call in service.client.embeddings.create.await_args_list]
+    assert sizes == [3, 3, 1]
+    assert vectors.shape == (7, 4)
+
+
+@pytest.mark.asyncio
+async def test_should_embed_only_uncached_and_distinct_texts(service):
+    # Given
+    await service.embed_texts(["a"])
+
+    # When
+    vectors = await service.embed_texts(["a", "bb", "bb"])
+
+    # Then
+    last_call = service.client.embeddings.create.await_args_list[-1]
+    assert last_call.kwargs["input"] == ["bb"]
+    assert vectors[:, 0].tolist() == [1.0, 2.0, 2.0]
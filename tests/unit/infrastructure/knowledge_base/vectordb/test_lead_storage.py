@@ -0,0 +1,178 @@
+import uuid
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models
+
+from src.application.schema.contact import Contact
+from src.infrastructure.knowledge_base.vectordb.config import VectorDBSettings
+from src.infrastructure.knowledge_base.vectordb.lead_storage import (
+    CONTENT_HASH_FIELD,
+    INDUSTRY_KEY_FIELD,
+    QDrantLeadStorage,
+    build_lead_filter,
+    lead_id_for_company,
+)
+
+VECTOR_SIZE = 4
+
+# Local mode ignores payload indexes and says so
+pytestmark = pytest.mark.filterwarnings("ignore:Payload indexes:UserWarning")
+
+
+class FakeEmbeddings:
+    def __init__(self):
+        self.embedded = []
+
+    async def get_lead_embeddings(self, leads):
+        self.embedded.extend(lead.company for lead in leads)
+        return np.ones((len(leads), VECTOR_SIZE))
+
+
+@pytest.fixture
+def settings():
+    return VectorDBSettings(collection_name="leads", vector_size=VECTOR_SIZE, batch_size=2)
+
+
+@pytest.fixture
+def client(settings):
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        collection_name=settings.collection_name,
+        vectors_config=models.VectorParams(size=VECTOR_SIZE, distance=models.Distance.COSINE),
+    )
+    return client
+
+
+@pytest.fixture
+def embeddings():
+    return FakeEmbeddings()
+
+
+@pytest.fixture
+def make_storage(settings, client, embeddings):
+    def factory() -> QDrantLeadStorage:
+        provider = MagicMock()
+        provider.client = client
+        provider.is_collection_ready.return_value = False
+        return QDrantLeadStorage(settings, embeddings, client_provider=provider)
+
+    return factory
+
+
+def _enriched(make_lead, company: str):
+    return make_lead(
+        company,
+        website=f"https://{company.lower()}.com",
+        last_year_profit=1.0,
+        last_quarter_ebitda=0.5,
+        stock_variation_3m=2.0,
+        contacts=[Contact(name="Jane Doe", email="jane@acme.com", phone="+1 555", position="CTO")],
+    )
+
+
+def _legacy_point(lead, vector=None) -> models.PointStruct:
+    return models.PointStruct(
+        id=str(uuid.uuid4()),
+        vector=vector or [1.0, 0.0, 0.0, 0.0],
+        payload={k: v for k, v in lead.model_dump(mode="json").items() if k != "region"},
+    )
+
+
+@pytest.mark.asyncio
+async def test_should_keep_stored_enrichment_when_company_is_found_again(make_storage, make_lead):
+    # Given
+    storage = make_storage()
+    [lead_id] = await storage.store_leads([_enriched(make_lead, "Acme")])
+
+    # When
+    await storage.store_leads([make_lead("Acme Inc.", employee_count=120)])
+
+    # Then
+    stored = await storage.get_lead(lead_id)
+    assert stored.website == "https://acme.com"
+    assert stored.contacts[0].name == "Jane Doe"
+    assert stored.employee_count == 120
+
+
+@pytest.mark.asyncio
+async def test_should_skip_write_when_found_lead_adds_nothing(make_storage, make_lead, embeddings):
+    # Given
+    storage = make_storage()
+    await storage.store_leads([_enriched(make_lead, "Acme")])
+
+    # When
+    await storage.store_leads([make_lead("Acme")])
+
+    # Then
+    assert embeddings.embedded == ["Acme"]
+
+
+@pytest.mark.asyncio
+async def test_should_rekey_legacy_points_by_company_when_collection_is_ensured(
+    make_storage, make_lead, client, settings
+):
+    # Given
+    client.upsert(
+        collection_name=settings.collection_name,
+        points=[
+            _legacy_point(make_lead("Acme")),
+            _legacy_point(
+                _enriched(make_lead, "Acme").model_copy(update={"company": "Acme, Inc."}),
+                vector=[0.0, 1.0, 0.0, 0.0],
+            ),
+            _legacy_point(make_lead("Beta")),
+        ],
+    )
+
+    # When
+    storage = make_storage()
+
+    # Then
+    records, _ = client.scroll(settings.collection_name, with_payload=True, with_vectors=True)
+    assert sorted(str(r.id) for r in records) == sorted(
+        [lead_id_for_company("Acme"), lead_id_for_company("Beta")]
+    )
+    acme = await storage.get_lead(lead_id_for_company("Acme"))
+    assert acme.website == "https://acme.com"
+    assert all(r.payload[CONTENT_HASH_FIELD] for r in records)
+
+
+@pytest.mark.asyncio
+async def test_should_reembed_rekeyed_lead_when_merge_changed_its_content(
+    make_storage, make_lead, client, settings, embeddings
+):
+    # Given
+    partial = make_lead("Acme", website="https://acme.com")
+    client.upsert(
+        collection_name=settings.collection_name,
+        points=[_legacy_point(partial), _legacy_point(make_lead("Acme", region="Canada"))],
+    )
+    storage = make_storage()
+
+    # When
+    await storage.store_leads([make_lead("Acme", website="https://acme.com", region="Canada")])
+
+    # Then
+    assert embeddings.embedded == ["Acme"]
+
+
+def test_should_backfill_industry_key_when_points_predate_it(make_storage, make_lead, client, settings):
+    # Given
+    lead = make_lead("Acme", industry="Software")
+    payload = {**lead.model_dump(mode="json"), CONTENT_HASH_FIELD: "stale"}
+    client.upsert(
+        collection_name=settings.collection_name,
+        points=[models.PointStruct(id=lead_id_for_company("Acme"), vector=[1.0, 0, 0, 0], payload=payload)],
+    )
+
+    # When
+    make_storage()
+
+    # Then
+    records, _ = client.scroll(
+        settings.collection_name, scroll_filter=build_lead_filter(industries=["SOFTWARE"])
+    )
+    assert [r.payload[INDUSTRY_KEY_FIELD] for r in records] == ["software"]
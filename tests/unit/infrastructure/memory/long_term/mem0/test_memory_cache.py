@@ -0,0 +1,120 @@
+import zlib
+
+import numpy as np
+import pytest
+
+from src.infrastructure.memory.long_term.mem0.local_mem0 import LocalMem0Service
+from src.infrastructure.memory.long_term.mem0.memory_cache import (
+    CachedMem0Service,
+    MemoryCacheSettings,
+)
+
+DIMENSIONS = 32
+
+
+class WordEmbeddings:
+    """Bag-of-words vectors, so texts sharing words are similar."""
+
+    dimensions = DIMENSIONS
+
+    def __init__(self):
+        self.embedded = []
+
+    def _vector(self, text):
+        vector = np.zeros(DIMENSIONS)
+        for word in text.lower().split():
+            vector[zlib.crc32(word.encode()) % DIMENSIONS] += 1
+        return vector
+
+    async def embed_texts(self, texts):
+        self.embedded.extend(texts)
+        return np.array([self._vector(t) for t in texts]).reshape(len(texts), DIMENSIONS)
+
+    async def get_text_embedding(self, text):
+        return self._vector(text)
+
+
+class CountingMem0Service(LocalMem0Service):
+    def __init__(self):
+        super().__init__()
+        self.get_all_calls = 0
+        self.next_response = None
+
+    def get_all_memories(self, user_id):
+        self.get_all_calls += 1
+        return super().get_all_memories(user_id)
+
+    def add_memory(self, messages, user_id, metadata=None):
+        response = super().add_memory(messages, user_id, metadata)
+        return self.next_response if self.next_response is not None else response
+
+
+@pytest.fixture
+def inner():
+    inner = CountingMem0Service()
+    inner.add_memory([{"role": "user", "content": "prefers fintech leads"}], user_id="alice")
+    return inner
+
+
+@pytest.fixture
+def embeddings():
+    return WordEmbeddings()
+
+
+@pytest.fixture
+def cache(inner, embeddings):
+    cache = CachedMem0Service(inner, embeddings, MemoryCacheSettings(min_score=0.5))
+    cache.prefetch("alice")
+    return cache
+
+
+def test_should_add_new_memories_to_loaded_index_without_reloading(cache, inner, embeddings):
+    # When
+    cache.add_memory([{"role": "user", "content": "works in Toronto Canada"}], user_id="alice")
+    results = cache.search_memories("Toronto Canada", user_id="alice")
+
+    # Then
+    assert inner.get_all_calls == 1
+    assert embeddings.embedded == ["prefers fintech leads", "works in Toronto Canada"]
+    assert results[0]["memory"] == "works in Toronto Canada"
+    assert cache.local_hits == 1
+
+
+def test_should_apply_update_and_delete_events_to_index(cache, inner):
+    # Given
+    [memory] = cache.get_all_memories("alice")
+    inner.next_response = {
+        "results": [
+            {"id": memory["id"], "memory": "prefers healthcare leads", "event": "UPDATE"},
+            {"id": "new", "memory": "ignore this one", "event": "ADD"},
+            {"id": "new", "event": "DELETE"},
+        ]
+    }
+
+    # When
+    cache.add_memory([{"role": "user", "content": "actually healthcare"}], user_id="alice")
+
+    # Then
+    assert [m["memory"] for m in cache.get_all_memories("alice")] == ["prefers healthcare leads"]
+    assert inner.get_all_calls == 1
+
+
+def test_should_invalidate_index_when_add_outcome_is_unknown(cache, inner):
+    # Given
+    inner.next_response = {"message": "queued for processing"}
+
+    # When
+    cache.add_memory([{"role": "user", "content": "likes Brazil"}], user_id="alice")
+    cache.get_all_memories("alice")
+
+    # Then
+    assert inner.get_all_calls == 2
+
+
+def test_should_leave_unloaded_users_to_lazy_loading(cache, inner, embeddings):
+    # When
+    cache.add_memory([{"role": "user", "content": "hello"}], user_id="bob")
+
+    # Then
+    assert "hello" not in embeddings.embedded
+    assert [m["memory"] for m in cache.get_all_memories("bob")] == ["hello"]
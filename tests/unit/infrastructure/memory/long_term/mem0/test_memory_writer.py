@@ -0,0 +1,111 @@
+import pytest
+
+from src.infrastructure.memory.long_term.mem0.local_mem0 import LocalMem0Service
+from src.infrastructure.memory.long_term.mem0.memory_writer import (
+    BackgroundMemoryWriter,
+    MemoryWriterSettings,
+)
+
+
+class FlakyMem0Service(LocalMem0Service):
+    def __init__(self, failures: int):
+        super().__init__()
+        self.failures = failures
+
+    def add_memory(self, messages, user_id, metadata=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("mem0 unavailable")
+        return super().add_memory(messages, user_id, metadata)
+
+
+@pytest.fixture
+def settings():
+    return MemoryWriterSettings(
+        queue_size=16,
+        batch_size=5,
+        batch_wait_seconds=0.2,
+        max_retries=2,
+        backoff_seconds=0.001,
+        shutdown_timeout_seconds=1.0,
+    )
+
+
+def _turn(text: str) -> list[dict]:
+    return [{"role": "user", "content": text}]
+
+
+def test_should_fold_queued_turns_of_same_user_into_one_write(settings):
+    # Given
+    mem0 = LocalMem0Service()
+    writer = BackgroundMemoryWriter(mem0, settings)
+
+    # When
+    for text in ("first", "second", "third"):
+        writer.submit(_turn(text), user_id="alice")
+    assert writer.flush(timeout=2)
+    writer.close()
+
+    # Then
+    assert mem0.add_calls == 1
+    assert [m["memory"] for m in mem0.get_all_memories("alice")] == ["first", "second", "third"]
+
+
+def test_should_keep_writes_apart_when_users_or_metadata_differ(settings):
+    # Given
+    mem0 = LocalMem0Service()
+    writer = BackgroundMemoryWriter(mem0, settings)
+
+    # When
+    writer.submit(_turn("a1"), user_id="alice")
+    writer.submit(_turn("b1"), user_id="bob")
+    writer.submit(_turn("a2"), user_id="alice", metadata={"topic": "leads"})
+    writer.submit(_turn("a3"), user_id="alice")
+    writer.close()
+
+    # Then
+    assert mem0.add_calls == 3
+    assert [m["memory"] for m in mem0.get_all_memories("alice")] == ["a1", "a3", "a2"]
+    assert [m["memory"] for m in mem0.get_all_memories("bob")] == ["b1"]
+
+
+def test_should_retry_when_add_fails_transiently(settings):
+    # Given
+    mem0 = FlakyMem0Service(failures=2)
+    writer = BackgroundMemoryWriter(mem0, settings)
+
+    # When
+    writer.submit(_turn("remember me"), user_id="alice")
+    writer.close()
+
+    # Then
+    assert writer.failed == 0
+    assert [m["memory"] for m in mem0.get_all_memories("alice")] == ["remember me"]
+
+
+def test_should_count_failure_when_retries_are_exhausted(settings):
+    # Given
+    mem0 = FlakyMem0Service(failures=settings.max_retries + 1)
+    writer = BackgroundMemoryWriter(mem0, settings)
+
+    # When
+    writer.submit(_turn("lost"), user_id="alice")
+    writer.close()
+
+    # Then
+    assert writer.failed == 1
+    assert mem0.get_all_memories("alice") == []
+
+
+def test_should_reject_writes_when_closed(settings):
+    # Given
+    mem0 = LocalMem0Service()
+    writer = BackgroundMemoryWriter(mem0, settings)
+    writer.close()
+
+    # When
+    accepted = writer.submit(_turn("too late"), user_id="alice")
+
+    # Then
+    assert accepted is False
+    assert mem0.add_calls == 0